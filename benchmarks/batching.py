@@ -0,0 +1,111 @@
+""" Compares batched remote inference with one client per seat
+
+A numpy MLP plays every seat of many
+tables, either through one
+`PokerGameClient` per seat, which runs
+the model once per decision, or through
+a single `PokerBatchClient`, which runs
+it once per batch. The server runs in
+its own process.
+
+Usage
+-----
+
+```console
+agent@pokerl:~$ PYTHONPATH=. python benchmarks/batching.py [--num-tables <N=64>] [--num-games <N=4>]
+```
+"""
+
+import time
+import socket
+import itertools
+import numpy as np
+import multiprocessing as mp
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from pokerl.game import Game
+from pokerl.agents import PokerAgent, PokerBatchAgent
+from pokerl.envs import ObservationSpec
+from pokerl.network import AsyncPokerGameServer, PokerGameClient, PokerBatchClient
+
+class MLPAgent(PokerBatchAgent):
+	""" Random MLP, samples a valid action from its outputs
+
+	Sampling keeps mirrored agents from
+	trading blinds forever.
+	"""
+
+	def __init__(self, spec: ObservationSpec, hidden: int=512, depth: int=3):
+		"""  """
+
+		super().__init__(spec)
+		rng = np.random.default_rng(0)
+		self.rng = rng
+		sizes = [spec.size] + [hidden] * depth + [7]
+		self.weights = [rng.normal(0, 1 / np.sqrt(n), (n, m)).astype(np.float32) for n, m in zip(sizes[:-1], sizes[1:])]
+
+	def predict(self, obs: np.ndarray, valid_actions: np.ndarray) -> np.ndarray:
+		"""  """
+
+		for weights in self.weights[:-1]: obs = np.maximum(obs @ weights, 0)
+		logits = obs @ self.weights[-1] + self.rng.gumbel(size=valid_actions.shape)
+		return np.argmax(np.where(valid_actions > 0, logits, -np.inf), axis=1)
+
+class SingleAgent(PokerAgent):
+	""" Runs the MLP on one state at a time """
+
+	def __init__(self, agent: MLPAgent):
+		"""  """
+
+		self.agent = agent
+		self.num_decisions = itertools.count()
+
+	def __call__(self, state: Game.StateView) -> int:
+		"""  """
+
+		next(self.num_decisions)
+		return int(self.agent([state])[0])
+
+def play(clients: list, num_games: int, num_players: int) -> float:
+	""" Runs a server and the clients, returns decisions per second """
+
+	with socket.socket() as sock:
+		sock.bind(('localhost', 0))
+		port = sock.getsockname()[1]
+
+	server = AsyncPokerGameServer(num_games=num_games, num_players=num_players)
+	process = mp.Process(target=server.run, args=('localhost', port), daemon=True)
+	process.start()
+	time.sleep(1.)
+
+	start = time.perf_counter()
+	with ThreadPoolExecutor(len(clients)) as executor:
+		for future in [executor.submit(client.connect, 'localhost', port) for client in clients]: future.result()
+
+	elapsed = time.perf_counter() - start
+	process.terminate()
+	return elapsed
+
+if __name__ == '__main__':
+	parser = ArgumentParser('batching')
+	parser.add_argument('--num-tables', '-T', default=32, type=int)
+	parser.add_argument('--num-players', '-N', default=2, type=int)
+	parser.add_argument('--num-games', '-G', default=1, type=int)
+	parser.add_argument('--batch-size', '-B', default=32, type=int)
+	args = parser.parse_args()
+
+	agent = MLPAgent(ObservationSpec(num_players=args.num_players))
+	num_seats = args.num_tables * args.num_players
+
+	single_agent = SingleAgent(agent)
+	elapsed = play([PokerGameClient(single_agent) for _ in range(num_seats)], args.num_games, args.num_players)
+	single = next(single_agent.num_decisions) / elapsed
+
+	client = PokerBatchClient(agent, num_seats, args.batch_size)
+	elapsed = play([client], args.num_games, args.num_players)
+	batched = client.num_decisions / elapsed
+
+	print('%-10s %14s' % ('client', 'decisions/s'))
+	print('%-10s %14.0f' % ('per seat', single))
+	print('%-10s %14.0f' % ('batched', batched))
+	print('speedup %.1fx' % (batched / single))
@@ -0,0 +1,61 @@
+""" Compares the binary protocol with the former pickle messages
+
+Usage
+-----
+
+```console
+agent@pokerl:~$ PYTHONPATH=. python benchmarks/protocol.py [--num-players <N=4>] [--number <N=2000>]
+```
+"""
+
+import pickle
+import timeit
+import numpy as np
+from argparse import ArgumentParser
+from pokerl.game import Game
+from pokerl.network.protocol import encode_state, decode
+
+def collect_states(num_players: int, num_states: int=100, integer_chips: bool=False) -> list:
+	""" Plays random actions and returns detached state views """
+
+	rng = np.random.default_rng(0)
+	game = Game(num_players=num_players, integer_chips=integer_chips)
+	game.reset()
+
+	states = []
+	while len(states) < num_states:
+		state = game.active_state
+		state.valid_actions
+		states.append(state)
+
+		valid_actions, _ = game.get_valid_actions()
+		game_over, _, _ = game.step(int(rng.choice(np.flatnonzero(valid_actions))))
+		if game_over: game.reset()
+
+	return states
+
+def bench(states: list, number: int) -> dict:
+	""" Returns the mean message size and encode and decode time of both paths """
+
+	pickled = [pickle.dumps(dict(status='playing', player=state.player, active_state=state)) for state in states]
+	encoded = [encode_state(0, state) for state in states]
+
+	def time(fn, data) -> float:
+		return min(timeit.repeat(lambda: [fn(item) for item in data], number=max(number // len(data), 1), repeat=3)) / max(number // len(data), 1) / len(data)
+
+	return {
+		'pickle': (np.mean([len(data) for data in pickled]), time(lambda state: pickle.dumps(dict(status='playing', player=state.player, active_state=state)), states), time(pickle.loads, pickled)),
+		'binary': (np.mean([len(data) for data in encoded]), time(lambda state: encode_state(0, state), states), time(decode, encoded))
+	}
+
+if __name__ == '__main__':
+	parser = ArgumentParser('protocol')
+	parser.add_argument('--num-players', '-N', default=4, type=int)
+	parser.add_argument('--number', '-n', default=2000, type=int)
+	args = parser.parse_args()
+
+	print('%-8s %-8s %10s %12s %12s' % ('money', 'path', 'bytes', 'encode (us)', 'decode (us)'))
+	for integer_chips in (False, True):
+		results = bench(collect_states(args.num_players, integer_chips=integer_chips), args.number)
+		for path, (size, encode, decode_time) in results.items():
+			print('%-8s %-8s %10.1f %12.2f %12.2f' % ('int' if integer_chips else 'float', path, size, encode * 1e6, decode_time * 1e6))
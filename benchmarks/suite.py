@@ -0,0 +1,322 @@
+""" Benchmark suite with regression tracking
+
+Measures the throughput of the judger,
+of `Game` and of `PokerGameEnv`, and the
+round-trip latency of a decision between
+a server and its clients over loopback.
+Results are saved to a JSON file, keyed
+by commit; a `+dirty` suffix marks a
+tree with uncommitted changes.
+
+Metrics ending in `_per_s` are better
+when higher, metrics ending in `_us` are
+better when lower. `compare` flags the
+metrics that got worse by more than the
+threshold, and exits with status 1 if
+there is any.
+
+Usage
+-----
+
+```console
+agent@pokerl:~$ PYTHONPATH=. python benchmarks/suite.py run [--only <judger,game,env,network>] [--min-time <seconds=1>] [--output <benchmarks/results.json>]
+agent@pokerl:~$ PYTHONPATH=. python benchmarks/suite.py compare [<base> [<head>]] [--threshold <0.1>]
+```
+
+Without arguments, `compare` compares the
+last two runs in the file.
+"""
+
+import sys
+import json
+import time
+import socket
+import platform
+import subprocess
+import numpy as np
+import multiprocessing as mp
+from datetime import datetime, timezone
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+from pokerl.game import Game
+from pokerl.cards import Card
+from pokerl.judger import eval_hand, compare_hands
+from pokerl.agents import PokerAgent, RandomAgent
+from pokerl.envs import PokerGameEnv
+from pokerl.network import AsyncPokerGameServer, PokerGameClient
+
+# Benchmarks by name, each one returns a
+# dict of metrics
+BENCHMARKS: Dict[str, Callable[[float], Dict[str, float]]] = {}
+
+def benchmark(fn: Callable) -> Callable:
+	""" Registers a benchmark """
+
+	BENCHMARKS[fn.__name__[len('bench_'):]] = fn
+	return fn
+
+def measure(fn: Callable[[], int], min_time: float, repeat: int=3) -> float:
+	""" Returns the best rate of `fn` over `repeat` runs
+
+	`fn` runs a batch of work and returns
+	its size; it is called until each run
+	lasts at least `min_time / repeat`
+	seconds.
+	"""
+
+	rates = []
+	for _ in range(repeat):
+		count = 0
+		start = time.perf_counter()
+		while True:
+			count += fn()
+			elapsed = time.perf_counter() - start
+			if elapsed >= min_time / repeat: break
+
+		rates.append(count / elapsed)
+
+	return max(rates)
+
+def random_hands(rng: np.random.Generator, num_hands: int, num_cards: int=7) -> List[List[Card]]:
+	""" Samples hands without repeated cards """
+
+	return [[Card((int(card) % 13, int(card) // 13)) for card in rng.permutation(52)[:num_cards]] for _ in range(num_hands)]
+
+@benchmark
+def bench_judger(min_time: float) -> Dict[str, float]:
+	""" Hands evaluated and showdowns compared per second """
+
+	rng = np.random.default_rng(0)
+	hands = random_hands(rng, 1000)
+	showdowns = []
+	for _ in range(200):
+		cards = [Card((int(card) % 13, int(card) // 13)) for card in rng.permutation(52)[:5 + 2 * 6]]
+		showdowns.append([cards[:5] + cards[5 + 2 * player:7 + 2 * player] for player in range(6)])
+
+	def eval_all() -> int:
+		for hand in hands: eval_hand(hand)
+		return len(hands)
+
+	def compare_all() -> int:
+		for showdown in showdowns: compare_hands(showdown)
+		return len(showdowns)
+
+	return {
+		'judger.eval_hand_per_s': measure(eval_all, min_time),
+		'judger.compare_hands_6p_per_s': measure(compare_all, min_time)
+	}
+
+@benchmark
+def bench_game(min_time: float) -> Dict[str, float]:
+	""" Decisions and full games per second, with random actions """
+
+	metrics = {}
+	for num_players in (2, 6, 10):
+		rng = np.random.default_rng(num_players)
+		game = Game(num_players=num_players, rng=num_players)
+		noise = rng.random((4096, 7))
+
+		def play_game() -> int:
+			game.reset()
+			num_steps = 0
+			game_over = False
+			while not game_over:
+				valid_actions, _ = game.get_valid_actions()
+				game_over, _, _ = game.step(int(np.argmax(valid_actions * noise[num_steps % len(noise)])))
+				num_steps += 1
+
+			steps.append(num_steps)
+			return 1
+
+		steps = []
+		games_per_s = measure(play_game, min_time)
+		metrics['game.games_%dp_per_s' % num_players] = games_per_s
+		metrics['game.steps_%dp_per_s' % num_players] = games_per_s * np.mean(steps)
+
+	return metrics
+
+@benchmark
+def bench_env(min_time: float) -> Dict[str, float]:
+	""" Episodes of `PokerGameEnv` per second, with random opponents """
+
+	agent = RandomAgent()
+	np.random.seed(0)
+	env = PokerGameEnv([agent] * 3, num_players=4, rng=0)
+
+	def play_episode() -> int:
+		state = env.reset()
+		done = False
+		while not done: state, _, done, _ = env.step(agent(state))
+		return 1
+
+	return {'env.episodes_4p_per_s': measure(play_episode, min_time)}
+
+class TimedAgent(PokerAgent):
+	""" Records when each decision starts and ends """
+
+	def __init__(self, agent: PokerAgent, times: list):
+		"""  """
+
+		self.agent = agent
+		self.times = times
+
+	def __call__(self, state: Game.StateView) -> int:
+		"""  """
+
+		start = time.perf_counter()
+		action = self.agent(state)
+		self.times.append((start, time.perf_counter()))
+		return action
+
+def serve(port: int, num_players: int):
+	""" Runs a server that plays one game per table """
+
+	with redirect_stdout(sys.stderr): AsyncPokerGameServer(num_games=1, num_players=num_players, rng=0).run('localhost', port)
+
+@benchmark
+def bench_network(min_time: float) -> Dict[str, float]:
+	""" Round-trip latency of a decision over loopback
+
+	An `AsyncPokerGameServer` runs in its own
+	process, and six `PokerGameClient` play
+	one game at a time at one of its tables.
+	The latency of a decision is the time
+	from the action of a client to the next
+	state received by any client of the
+	table: the server decodes the action,
+	steps the game and sends the state,
+	which is then decoded by the client.
+	The time spent by the agents is not
+	counted.
+	"""
+
+	with socket.socket() as sock:
+		sock.bind(('localhost', 0))
+		port = sock.getsockname()[1]
+
+	num_players = 6
+	process = mp.Process(target=serve, args=(port, num_players), daemon=True)
+	process.start()
+
+	# Wait for the server to listen
+	while True:
+		try:
+			with socket.create_connection(('localhost', port)): break
+		except ConnectionError: time.sleep(.01)
+
+	np.random.seed(0)
+	agent = RandomAgent()
+	latencies = []
+	try:
+		with redirect_stdout(sys.stderr), ThreadPoolExecutor(num_players) as executor:
+			deadline = time.perf_counter() + min_time
+			while time.perf_counter() < deadline or len(latencies) < 100:
+				times = []
+				clients = [PokerGameClient(TimedAgent(agent, times)) for _ in range(num_players)]
+				for future in [executor.submit(client.connect, 'localhost', port) for client in clients]: future.result()
+
+				# The table plays one decision at
+				# a time, in order
+				times = np.array(times)
+				latencies.extend(times[1:, 0] - times[:-1, 1])
+	finally: process.terminate()
+
+	latencies = np.array(latencies) * 1e6
+	return {
+		'network.round_trip_median_us': float(np.median(latencies)),
+		'network.round_trip_p99_us': float(np.percentile(latencies, 99))
+	}
+
+def get_commit() -> str:
+	""" Returns the current commit, with `+dirty` if the tree has changes """
+
+	try:
+		commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, check=True).stdout.strip()
+		dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, check=True).stdout.strip()
+		return commit + ('+dirty' if dirty else '')
+	except (OSError, subprocess.CalledProcessError): return 'unknown'
+
+def load_results(path: str) -> dict:
+	""" Loads the saved runs, by commit """
+
+	try:
+		with open(path) as f: return json.load(f)
+	except FileNotFoundError: return {}
+
+def run(names: List[str], min_time: float, path: str) -> dict:
+	""" Runs the benchmarks and saves their metrics under the current commit """
+
+	metrics = {}
+	for name in names:
+		print('running %s...' % name, file=sys.stderr)
+		metrics.update(BENCHMARKS[name](min_time))
+
+	results = load_results(path)
+	commit = get_commit()
+
+	# Update the metrics of a partial run,
+	# and move the commit to the end
+	record = results.pop(commit, {'metrics': {}})
+	record['metrics'].update(metrics)
+	record['date'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+	record['python'] = platform.python_version()
+	record['numpy'] = np.__version__
+	results[commit] = record
+
+	with open(path, 'w') as f: json.dump(results, f, indent='\t')
+
+	for metric, value in metrics.items(): print('%-36s %14.2f' % (metric, value))
+	return metrics
+
+def compare(base: dict, head: dict, threshold: float) -> List[str]:
+	""" Prints the change of each metric, returns the regressions """
+
+	regressions = []
+	print('%-36s %14s %14s %9s' % ('metric', 'base', 'head', 'change'))
+	for metric in sorted(set(base) & set(head)):
+		change = head[metric] / base[metric] - 1 if base[metric] else .0
+
+		# Latencies get worse when they grow
+		worse = -change if metric.endswith('_per_s') else change
+		flag = ''
+		if worse > threshold:
+			regressions.append(metric)
+			flag = '  REGRESSION'
+
+		print('%-36s %14.2f %14.2f %+8.1f%%%s' % (metric, base[metric], head[metric], 100 * change, flag))
+
+	return regressions
+
+if __name__ == '__main__':
+	parser = ArgumentParser('suite')
+	parser.add_argument('--output', '-o', default='benchmarks/results.json', help='Path of the results file')
+	commands = parser.add_subparsers(dest='command')
+
+	run_parser = commands.add_parser('run', help='Run the benchmarks')
+	run_parser.add_argument('--only', default=','.join(BENCHMARKS), help='Comma separated benchmarks, any of %s' % ', '.join(BENCHMARKS))
+	run_parser.add_argument('--min-time', '-t', default=1., type=float, help='Seconds spent on each measure')
+
+	compare_parser = commands.add_parser('compare', help='Compare two runs')
+	compare_parser.add_argument('base', nargs='?', help='Commit of the base run; defaults to the second to last run')
+	compare_parser.add_argument('head', nargs='?', help='Commit of the new run; defaults to the last run')
+	compare_parser.add_argument('--threshold', default=.1, type=float, help='Relative change flagged as regression')
+	args = parser.parse_args()
+	if args.command is None: parser.error('a command is required, one of run, compare')
+
+	if args.command == 'run':
+		names = args.only.split(',')
+		for name in names:
+			if name not in BENCHMARKS: parser.error('unknown benchmark %s' % name)
+
+		run(names, args.min_time, args.output)
+	else:
+		results = load_results(args.output)
+		commits = list(results)
+		head = args.head or (commits[-1] if commits else None)
+		base = args.base or (commits[-2] if len(commits) > 1 else None)
+		if base not in results or head not in results: parser.error('need two runs to compare, found %s' % ', '.join(commits or ['none']))
+
+		print('%s -> %s' % (base, head))
+		sys.exit(1 if compare(results[base]['metrics'], results[head]['metrics'], args.threshold) else 0)
@@ -1,7 +1,7 @@
 import sys
 import logging
 from argparse import ArgumentParser
-from pokerl.network import PokerGameServer, PokerGameClient
+from pokerl.network import PokerGameServer, AsyncPokerGameServer, PokerGameClient
 from pokerl.agents import RandomAgent
 
 logging.basicConfig(stream=sys.stdout, level=logging.INFO)
@@ -11,6 +11,7 @@ parser.add_argument('host', nargs='?')
 parser.add_argument('--bind', '-B', default='localhost')
 parser.add_argument('--num-players', '-N', default=4, type=int)
 parser.add_argument('--agent', '-A')
+parser.add_argument('--num-games', '-G', type=int, help='host many tables, each playing this number of games')
 args = parser.parse_args()
 
 def import_class(path: str):
@@ -30,5 +31,6 @@ if args.host:
 	client.connect(*args.host.split(':'))
 else:
 	# Create server
-	server = PokerGameServer(num_players=args.num_players)
+	if args.num_games is not None: server = AsyncPokerGameServer(num_games=args.num_games, num_players=args.num_players)
+	else: server = PokerGameServer(num_players=args.num_players, logger=logging.getLogger())
 	server.run(*args.bind.split(':'))
\ No newline at end of file
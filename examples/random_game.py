@@ -6,7 +6,7 @@ from pokerl import Game
 logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
 random_agent = lambda s: np.random.choice(list(s.valid_action_indices))
-game = Game(num_players=4, start_credits=1000, big_blind=40, small_blind=20)
+game = Game(num_players=4, start_credits=1000, big_blind=40, small_blind=20, logger=logging.getLogger())
 game.reset()
 
 done = False
@@ -1,4 +1,5 @@
 from .game import Game
-from .judger import eval_hand
+from .vector_game import VectorGame
+from .judger import eval_hand, eval_strength
 from .cards import Card, create_default_deck
 from .enums import PokerMoves, HandRanking
\ No newline at end of file
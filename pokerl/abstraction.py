@@ -0,0 +1,276 @@
+import os
+import numpy as np
+from typing import List, Union
+from .cards import Card, get_card_ids
+from .judger import eval_hands_batch
+from .isomorphism import get_index_size, index_hand, unindex_hand, index_hands_batch
+
+# Number of community cards at each turn
+NUM_COMMUNITY_CARDS = (0, 3, 4, 5)
+
+def compute_histograms(hands: np.ndarray, rng: np.random.Generator=None, **config) -> np.ndarray:
+	""" Computes the equity histograms of many hands
+
+	For each hand, the remaining community
+	cards are sampled many times; for each
+	sampled board the equity against a
+	random opponent hand is estimated, and
+	the histogram of these equities is
+	returned.
+
+	Params
+	------
+	hands : numpy array
+		Card ids with shape `(N, K)`; the
+		first two cards are the hole cards
+		and the others are the community
+		cards.
+	rng : numpy generator
+		Random generator used to sample
+		the cards.
+	num_bins : int
+		Number of bins of the histograms;
+		defaults to 8.
+	num_futures : int
+		Number of sampled boards; defaults
+		to 32. Only one board is used on
+		the river.
+	num_samples : int
+		Number of opponent hands sampled
+		for each board; defaults to 16.
+
+	Returns
+	-------
+	numpy array
+		Normalized histograms with shape
+		`(N, num_bins)`.
+	"""
+
+	num_bins: int = config.get('num_bins', 8)
+	num_samples: int = config.get('num_samples', 16)
+	rng = np.random.default_rng(rng)
+
+	hands = np.asarray(hands, dtype=np.int64)
+	size, num_known = hands.shape
+	num_board = 7 - num_known
+	num_futures: int = config.get('num_futures', 32) if num_board > 0 else 1
+	num_drawn = num_board + 2 * num_samples
+
+	# Sample unknown cards, known cards are
+	# sorted last
+	keys = rng.random((size, num_futures, 52))
+	keys[np.arange(size)[:, None, None], np.arange(num_futures)[None, :, None], hands[:, None, :]] = 2.
+	drawn = np.argsort(keys, axis=2)[..., :num_drawn]
+
+	board = np.concatenate((np.broadcast_to(hands[:, None, 2:], (size, num_futures, num_known - 2)), drawn[..., :num_board]), axis=2)
+	player_hands = np.concatenate((np.broadcast_to(hands[:, None, :2], (size, num_futures, 2)), board), axis=2)
+	opponent_hands = np.concatenate((drawn[..., num_board:].reshape(size, num_futures, num_samples, 2), np.broadcast_to(board[:, :, None], (size, num_futures, num_samples, 5))), axis=3)
+
+	player_strengths = eval_hands_batch(player_hands)[..., None]
+	opponent_strengths = eval_hands_batch(opponent_hands)
+	equities = np.mean((player_strengths > opponent_strengths) + .5 * (player_strengths == opponent_strengths), axis=2)
+
+	bins = np.minimum((equities * num_bins).astype(np.int64), num_bins - 1)
+	histograms = np.zeros((size, num_bins))
+	np.add.at(histograms, (np.arange(size)[:, None], bins), 1. / num_futures)
+	return histograms
+
+def kmeans(features: np.ndarray, num_clusters: int, rng: np.random.Generator=None, iterations: int=25) -> np.ndarray:
+	""" Clusters features with k-means
+
+	Centroids are initialized with
+	k-means++.
+
+	Returns
+	-------
+	numpy array
+		The centroids, with shape
+		`(num_clusters, num_features)`.
+	"""
+
+	rng = np.random.default_rng(rng)
+	assert len(features) >= num_clusters, 'Not enough samples'
+
+	# K-means++ initialization
+	centroids = [features[rng.integers(len(features))]]
+	distances = np.sum((features - centroids[0]) ** 2, axis=1)
+	for _ in range(1, num_clusters):
+		total = np.sum(distances)
+		idx = rng.choice(len(features), p=distances / total) if total > 0 else rng.integers(len(features))
+		centroids.append(features[idx])
+		distances = np.minimum(distances, np.sum((features - features[idx]) ** 2, axis=1))
+
+	centroids = np.array(centroids)
+	for _ in range(iterations):
+		labels = get_nearest(features, centroids)
+		counts = np.bincount(labels, minlength=num_clusters)
+		sums = np.zeros_like(centroids)
+		np.add.at(sums, labels, features)
+
+		# Empty clusters keep their centroid
+		updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+		if np.allclose(updated, centroids): break
+		centroids = updated
+
+	return centroids
+
+def get_nearest(features: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+	""" Returns the index of the nearest centroid of each feature vector """
+
+	distances = np.sum(features ** 2, axis=1)[:, None] - 2 * features @ centroids.T + np.sum(centroids ** 2, axis=1)[None, :]
+	return np.argmin(distances, axis=1)
+
+def get_situations(indices: np.ndarray, turn: int) -> np.ndarray:
+	""" Returns the card ids of the canonical hands with the given indices """
+
+	hands = np.zeros((len(indices), 2 + NUM_COMMUNITY_CARDS[turn]), dtype=np.int64)
+	for row, index in enumerate(indices):
+		player_cards, community_cards = unindex_hand(int(index), turn)
+		hands[row] = get_card_ids(player_cards + community_cards)
+
+	return hands
+
+def build_buckets(turn: int, num_buckets: int, path: str=None, rng: Union[np.random.Generator, int, None]=None, **config) -> np.ndarray:
+	""" Builds the bucket table of a turn
+
+	The equity histograms of a sample of
+	situations are clustered with k-means
+	on their cumulative histograms, so
+	that the distance approximates the
+	earth mover's distance. Then, every
+	canonical situation of the turn is
+	assigned to the nearest cluster.
+	Buckets are sorted by mean equity,
+	so that higher buckets are stronger.
+
+	Building the river table requires
+	evaluating billions of situations;
+	the preflop and flop tables are
+	practical to build on a single
+	machine.
+
+	Params
+	------
+	turn : int
+		The turn, from 0 (preflop) to 3
+		(river).
+	num_buckets : int
+		Number of buckets.
+	path : str
+		If given, the table is written to
+		this `.npy` file in chunks and a
+		memory-mapped array is returned.
+	rng : numpy generator or seed
+		Random generator used to sample
+		cards and situations.
+	fit_samples : int
+		Number of situations used to fit
+		the clusters; defaults to 100000.
+	iterations : int
+		Number of k-means iterations;
+		defaults to 25.
+	batch_size : int
+		Number of situations evaluated at
+		once; defaults to 4096.
+
+	Other parameters are passed to
+	`compute_histograms`.
+
+	Returns
+	-------
+	numpy array
+		The bucket of each canonical
+		situation, indexed as in
+		`pokerl.isomorphism`.
+	"""
+
+	fit_samples: int = config.pop('fit_samples', 100000)
+	iterations: int = config.pop('iterations', 25)
+	batch_size: int = config.pop('batch_size', 4096)
+	rng = np.random.default_rng(rng)
+
+	size = get_index_size(turn)
+	dtype = np.uint8 if num_buckets <= 256 else np.uint16
+
+	# Fit clusters on a sample of situations
+	if size <= fit_samples: sample = np.arange(size)
+	else: sample = np.sort(rng.choice(size, fit_samples, replace=False))
+
+	histograms = np.concatenate([compute_histograms(get_situations(sample[start:start + batch_size], turn), rng, **config) for start in range(0, len(sample), batch_size)])
+	centroids = kmeans(np.cumsum(histograms, axis=1), num_buckets, rng, iterations)
+
+	# Sort clusters by mean equity, which is
+	# decreasing with the sum of the
+	# cumulative histogram
+	centroids = centroids[np.argsort(-np.sum(centroids, axis=1))]
+
+	if path is not None: buckets = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(size,))
+	else: buckets = np.zeros((size,), dtype=dtype)
+
+	if size <= fit_samples: buckets[:] = get_nearest(np.cumsum(histograms, axis=1), centroids)
+	else:
+		for start in range(0, size, batch_size):
+			indices = np.arange(start, min(start + batch_size, size))
+			histograms = compute_histograms(get_situations(indices, turn), rng, **config)
+			buckets[indices] = get_nearest(np.cumsum(histograms, axis=1), centroids)
+
+	if path is not None: buckets.flush()
+	return buckets
+
+class CardAbstraction:
+	""" Maps hands to buckets with precomputed tables
+
+	Usage
+	-----
+
+	```python
+	for turn in range(3): build_buckets(turn, 50, 'buckets_%d.npy' % turn)
+
+	abstraction = CardAbstraction(['buckets_0.npy', 'buckets_1.npy', 'buckets_2.npy'])
+	game = Game(num_players=4, abstraction=abstraction)
+	bucket = game.active_state.bucket
+	```
+	"""
+
+	def __init__(self, tables: List[Union[str, np.ndarray, None]]):
+		""" Loads the bucket tables
+
+		Params
+		------
+		tables : list
+			The table of each turn, either as
+			an array or as the path of a
+			`.npy` file, which is memory
+			mapped; turns without a table can
+			be omitted or set to `None`.
+		"""
+
+		tables = list(tables) + [None] * (len(NUM_COMMUNITY_CARDS) - len(tables))
+		self.paths = [table if isinstance(table, (str, os.PathLike)) else None for table in tables]
+		self.tables = [np.load(table, mmap_mode='r') if path is not None else table for table, path in zip(tables, self.paths)]
+
+		for turn, table in enumerate(self.tables):
+			assert table is None or len(table) == get_index_size(turn), 'Invalid table for turn %d' % turn
+
+	def __getstate__(self) -> list:
+		""" Returns the tables; memory-mapped tables are replaced by their path """
+
+		return [path if path is not None else table for table, path in zip(self.tables, self.paths)]
+
+	def __setstate__(self, tables: list):
+		"""  """
+
+		self.__init__(tables)
+
+	def get_bucket(self, player_cards: List[Union[Card, int]], community_cards: List[Union[Card, int]]=()) -> int:
+		""" Returns the bucket of a hand, `None` if its turn has no table """
+
+		table = self.tables[NUM_COMMUNITY_CARDS.index(len(community_cards))]
+		return int(table[index_hand(player_cards, community_cards)]) if table is not None else None
+
+	def get_buckets_batch(self, cards: np.ndarray) -> np.ndarray:
+		""" Returns the buckets of many hands, as in `index_hands_batch` """
+
+		table = self.tables[NUM_COMMUNITY_CARDS.index(np.shape(cards)[-1] - 2)]
+		assert table is not None, 'No table for this turn'
+		return table[index_hands_batch(cards)]
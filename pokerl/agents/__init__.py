@@ -1,3 +1,3 @@
-from .agent import PokerAgent
+from .agent import PokerAgent, PokerBatchAgent
 from .human import CLIAgent
-from .random import RandomAgent
\ No newline at end of file
+from .random import RandomAgent, RandomBatchAgent
\ No newline at end of file
@@ -1,4 +1,7 @@
+import numpy as np
+from typing import List
 from ..game import Game
+from ..envs.observation import ObservationSpec
 
 class PokerAgent:
 	""" Interface for poker agents
@@ -11,4 +14,43 @@ class PokerAgent:
 	def __call__(self, state: Game.StateView) -> int:
 		""" Takes state view """
 
+		raise NotImplementedError
+
+class PokerBatchAgent:
+	""" Interface for agents that decide many states at once
+
+	States are encoded with an
+	`ObservationSpec` and `predict` is
+	called once for the whole batch, so
+	that a model can be evaluated on a
+	batch of observations
+	"""
+
+	def __init__(self, spec: ObservationSpec=None):
+		""" Creates an agent that encodes states with `spec`
+
+		If not given, the spec is created
+		from the first batch, for its number
+		of players and with money divided by
+		the credits of the table.
+		"""
+
+		self.spec = spec
+
+	def __call__(self, states: List[Game.StateView]) -> np.ndarray:
+		""" Takes a list of state views and returns an array of actions """
+
+		if self.spec is None:
+			state = states[0]
+			self.spec = ObservationSpec(state.num_players, scale=float(np.sum(state.credits) + np.sum(state.bets)))
+
+		obs = self.spec.zeros(len(states))
+		for idx, state in enumerate(states): self.spec.encode(state, obs[idx])
+		valid_actions = np.array([state.valid_actions for state in states])
+
+		return self.predict(obs, valid_actions)
+
+	def predict(self, obs: np.ndarray, valid_actions: np.ndarray) -> np.ndarray:
+		""" Takes encoded observations and the one-hot valid actions of each one """
+
 		raise NotImplementedError
\ No newline at end of file
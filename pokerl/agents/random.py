@@ -1,5 +1,6 @@
 import numpy as np
-from .agent import PokerAgent, Game
+from typing import List
+from .agent import PokerAgent, PokerBatchAgent, Game
 
 class RandomAgent(PokerAgent):
 	""" Totally randomized agent
@@ -14,4 +15,20 @@ class RandomAgent(PokerAgent):
 		
 		# Return random valid action
 		vu = state.valid_actions
-		return np.random.choice(len(vu), p=vu / np.sum(vu))
\ No newline at end of file
+		return np.random.choice(len(vu), p=vu / np.sum(vu))
+
+class RandomBatchAgent(PokerBatchAgent):
+	""" Batch version of `RandomAgent` """
+
+	def __call__(self, states: List[Game.StateView]) -> np.ndarray:
+		""" Samples a valid action for each state, without encoding them """
+
+		valid_actions = np.array([state.valid_actions for state in states])
+		return self.predict(None, valid_actions)
+
+	def predict(self, obs: np.ndarray, valid_actions: np.ndarray) -> np.ndarray:
+		"""  """
+
+		# Sample uniformly among valid actions
+		keys = np.random.random(valid_actions.shape) * valid_actions
+		return np.argmax(keys, axis=1)
\ No newline at end of file
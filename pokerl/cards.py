@@ -71,6 +71,11 @@ class Card:
 			return chr(0x1f0a2 + self.value)
 		else: return chr(0x1f0a1 + self.value)
 
+def get_card_ids(cards: List[Union[Card, int]]) -> List[int]:
+	""" Returns the ids of a list of cards; integers are assumed to be ids already """
+
+	return [card.id if isinstance(card, Card) else int(card) for card in cards]
+
 def create_default_deck() -> List[Card]:
 	"""  """
 
@@ -135,4 +135,59 @@ class PlayerState:
 
 	NUM_STATES = 5
 
-	as_string = ['Folded', 'Active', 'Called', 'All-in', 'Broken']
\ No newline at end of file
+	as_string = ['Folded', 'Active', 'Called', 'All-in', 'Broken']
+
+class GameEvent:
+	""" Enum with the types of game events
+	
+	See `pokerl.events` for the
+	corresponding event classes
+	"""
+
+	DEAL = 0
+	BLINDS = 1
+	ACTION = 2
+	STREET = 3
+	SHOWDOWN = 4
+	PAYOFF = 5
+
+	NUM_EVENTS = 6
+
+	as_string = ['Deal', 'Blinds', 'Action', 'Street', 'Showdown', 'Payoff']
+
+class ChipRounding:
+	""" Enum with the rounding policies of raises in integer chips
+	
+	See `Game`; raises are a fraction of
+	the remaining credits and are rounded
+	to whole chips:
+	- down, never more than the fraction;
+	- nearest, with halves rounded up;
+	- up, never less than the fraction.
+	"""
+
+	DOWN = 0
+	NEAREST = 1
+	UP = 2
+
+	NUM_POLICIES = 3
+
+	as_string = ['Down', 'Nearest', 'Up']
+
+class MessageType:
+	""" Enum with the types of network messages
+	
+	See `pokerl.network.protocol`
+	"""
+
+	READY = 0
+	STATE = 1
+	ACTION = 2
+	OVER = 3
+	JOIN = 4
+	STATE_BATCH = 5
+	ACTION_BATCH = 6
+
+	NUM_TYPES = 7
+
+	as_string = ['Ready', 'State', 'Action', 'Over', 'Join', 'State batch', 'Action batch']
\ No newline at end of file
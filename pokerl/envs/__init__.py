@@ -1,2 +1,4 @@
 from .env import PokerEnv
-from .game_env import PokerGameEnv
\ No newline at end of file
+from .game_env import PokerGameEnv
+from .vector_env import PokerVectorEnv
+from .observation import ObservationSpec
\ No newline at end of file
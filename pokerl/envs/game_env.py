@@ -1,6 +1,7 @@
 import numpy as np
-from typing import Tuple, List
+from typing import Union, Tuple, List
 from .env import PokerEnv, Game
+from .observation import ObservationSpec
 from ..enums import PlayerState
 
 class PokerGameEnv(PokerEnv):
@@ -11,13 +12,55 @@ class PokerGameEnv(PokerEnv):
 	"""
 
 	def __init__(self, agents: list=None, **game_config):
-		"""  """
+		""" Creates a new environment
+
+		Params
+		------
+		agents : list of callables
+			The opponents of the agent.
+		observation_spec : ObservationSpec
+			If given, the environment returns
+			observations encoded with this
+			spec rather than state views. The
+			observation is written to the
+			same array at every step.
+		
+		Other parameters are passed to
+		`Game`.
+		"""
 
+		self.observation_spec: ObservationSpec = game_config.pop('observation_spec', None)
 		self.game = Game(**game_config)
 		self.agents = [None, *agents]
 		self.player_agent = 0
+		self.observation = self.observation_spec.zeros() if self.observation_spec is not None else None
+
+	def enable_profiling(self, profiler: 'Profiler'=None) -> 'Profiler':
+		""" Starts timing the environment, its game and the opponents
+
+		See `Game.enable_profiling`.
+		"""
+
+		from ..profiling import Profiler
+
+		if self.game.profiler is None:
+			self.game.profiler = profiler if profiler is not None else Profiler()
+			self.game.profiler.attach_env(self)
+
+		return self.game.profiler
+
+	def disable_profiling(self):
+		""" Stops timing the environment """
+
+		self.game.disable_profiling()
+
+	def get_observation(self) -> Union[Game.StateView, np.ndarray]:
+		""" Returns the active state, encoded if an observation spec was given """
+
+		if self.observation_spec is None: return self.game.active_state
+		else: return self.observation_spec.encode(self.game.active_state, self.observation)
 
-	def reset(self) -> Game.StateView:
+	def reset(self) -> Union[Game.StateView, np.ndarray]:
 		"""  """
 		
 		self.game.reset()
@@ -26,9 +69,9 @@ class PokerGameEnv(PokerEnv):
 			done, *_ = self.game.step(action)
 			if done: self.game.reset()
 		
-		return self.game.active_state
+		return self.get_observation()
 
-	def step(self, action: int) -> Tuple[Game.StateView, float, bool]:
+	def step(self, action: int) -> Tuple[Union[Game.StateView, np.ndarray], float, bool, bool]:
 		"""  """
 		
 		reward = .0
@@ -36,7 +79,7 @@ class PokerGameEnv(PokerEnv):
 
 		if done or self.game.player_states[self.player_agent] == PlayerState.BROKEN:
 			# Game has ended or we are broken anyway
-			return self.game.active_state, self.game.payoffs[self.player_agent], True, True
+			return self.get_observation(), self.game.payoffs[self.player_agent], True, True
 		else:
 			while not hand and self.game.active_player != self.player_agent:
 				# Step over opponents
@@ -51,4 +94,4 @@ class PokerGameEnv(PokerEnv):
 				action = self.agents[self.game.active_player](self.game.active_state)
 				done, *_ = self.game.step(action)
 		
-			return self.game.active_state, reward, done, hand
\ No newline at end of file
+			return self.get_observation(), reward, done, hand
\ No newline at end of file
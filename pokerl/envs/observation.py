@@ -0,0 +1,198 @@
+import numpy as np
+from typing import Tuple, Dict
+from ..game import Game
+from ..vector_game import VectorGame
+from ..enums import PokerMoves
+
+class ObservationSpec:
+	""" Fixed layout of a numeric observation
+
+	Encodes a game state as a flat vector,
+	where each feature occupies a fixed
+	slice. Available features are:
+	- `player_cards`, one-hot encoded
+		card ids (52 values);
+	- `community_cards`, one-hot encoded
+		card ids (52 values);
+	- `credits`, `bets` and `pending_bets`,
+		one value for each player, divided
+		by `scale`, by default the credits
+		of the whole table;
+	- `minimum_raise_value`, divided by
+		`scale`;
+	- `turn`, one-hot encoded (4 values);
+	- `valid_actions`, the one-hot encoded
+		valid actions (7 values).
+
+	Usage
+	-----
+
+	```python
+	spec = ObservationSpec(num_players=4, scale=400)
+	obs = np.zeros((batch_size, spec.size), dtype=spec.dtype)
+	for idx, state in enumerate(states):
+		spec.encode(state, obs[idx])
+	```
+	"""
+
+	# Features that hold amounts of credits
+	money_features = ('credits', 'bets', 'pending_bets', 'minimum_raise_value')
+
+	# Default features, in order
+	default_features = ('player_cards', 'community_cards', 'credits', 'bets', 'pending_bets', 'turn', 'valid_actions')
+
+	def __init__(self, num_players: int=4, features: Tuple[str]=default_features, **config):
+		""" Creates a new observation layout
+
+		Params
+		------
+		num_players : int
+			Number of players of the game.
+		features : tuple of str
+			The features to encode, in order.
+		dtype : numpy dtype
+			Type of the observation; defaults
+			to `np.float32`. Integer types can
+			only be used without money
+			features.
+		start_credits : int or list
+			The start credits of the game, as
+			in `Game`; defaults to 100.
+		scale : float
+			Money features are divided by
+			this value; defaults to the sum of
+			the start credits of all players.
+		rotate : bool
+			If true (default), per-player
+			features are rotated so that the
+			observing player comes first.
+		"""
+
+		self.num_players = num_players
+		self.features = tuple(features)
+		self.dtype = np.dtype(config.get('dtype', np.float32))
+		start_credits = config.get('start_credits', 100)
+		self.scale: float = config.get('scale', np.sum(start_credits) if np.ndim(start_credits) else start_credits * num_players)
+		self.rotate: bool = config.get('rotate', True)
+
+		# Order of the players as seen by each
+		# player, and buffers of each type of
+		# money to rotate, so that encoding a
+		# state allocates no array
+		seats = np.arange(num_players)
+		self.rotations = (seats[None] + seats[:, None]) % num_players if self.rotate else np.broadcast_to(seats, (num_players, num_players))
+		self.buffers: Dict[np.dtype, np.ndarray] = {}
+
+		assert np.issubdtype(self.dtype, np.floating) or not set(self.features) & set(self.money_features), 'Money features require a floating point dtype'
+
+		sizes = {
+			'player_cards': 52,
+			'community_cards': 52,
+			'credits': num_players,
+			'bets': num_players,
+			'pending_bets': num_players,
+			'minimum_raise_value': 1,
+			'turn': 4,
+			'valid_actions': PokerMoves.NUM_MOVES
+		}
+
+		# Compute slice of each feature
+		self.slices: Dict[str, slice] = {}
+		idx = 0
+		for feature in self.features:
+			assert feature in sizes, 'Invalid feature `%s`' % feature
+			self.slices[feature] = slice(idx, idx + sizes[feature])
+			idx += sizes[feature]
+
+		self.size = idx
+
+	def zeros(self, *shape: int) -> np.ndarray:
+		""" Allocates zeroed observations with shape `(*shape, size)` """
+
+		return np.zeros((*shape, self.size), dtype=self.dtype)
+
+	def encode(self, state: Game.StateView, out: np.ndarray=None) -> np.ndarray:
+		""" Encodes a state view
+
+		Params
+		------
+		state : Game.StateView
+			The state to encode.
+		out : numpy array
+			Where to write the observation,
+			for instance a row of a batch
+			array; a new array is allocated if
+			not given.
+
+		Returns
+		-------
+		numpy array
+			The observation, i.e. `out`.
+		"""
+
+		if out is None: out = self.zeros()
+		else: out.fill(0)
+
+		for feature, where in self.slices.items():
+			if feature == 'player_cards':
+				for card in state.player_cards: out[where.start + card.id] = 1
+			elif feature == 'community_cards':
+				for card in state.community_cards: out[where.start + card.id] = 1
+			elif feature == 'credits': self.encode_money(state.credits, state.player, out[where])
+			elif feature == 'bets': self.encode_money(state.bets, state.player, out[where])
+			elif feature == 'pending_bets': self.encode_money(state.pending_bets, state.player, out[where])
+			elif feature == 'minimum_raise_value': out[where.start] = state.minimum_raise_value / self.scale
+			elif feature == 'turn': out[where.start + state.turn] = 1
+			elif feature == 'valid_actions': out[where] = state.valid_actions
+
+		return out
+
+	def encode_money(self, values: np.ndarray, player: int, out: np.ndarray):
+		""" Writes the amounts of each player to `out`, rotated so that `player` comes first and scaled """
+
+		buffer = self.buffers.get(values.dtype)
+		if buffer is None: buffer = self.buffers[values.dtype] = np.empty((self.num_players,), dtype=values.dtype)
+
+		np.take(values, self.rotations[player], out=buffer, mode='wrap')
+		np.divide(buffer, self.scale, out=out)
+
+	def encode_tables(self, game: VectorGame, out: np.ndarray=None) -> np.ndarray:
+		""" Encodes the states of the active players of all the tables of a vector game
+
+		Params
+		------
+		game : VectorGame
+			The tables to encode.
+		out : numpy array
+			Where to write the observations,
+			with shape `(num_tables, size)`;
+			a new array is allocated if not
+			given.
+
+		Returns
+		-------
+		numpy array
+			The observations, i.e. `out`.
+		"""
+
+		if out is None: out = self.zeros(game.num_tables)
+		else: out[:] = 0
+
+		tables = game.tables
+		players = game.active_player
+		seats = self.rotations[players]
+
+		for feature, where in self.slices.items():
+			if feature == 'player_cards': out[tables[:, None], where.start + game.get_cards_of(players)] = 1
+			elif feature == 'community_cards':
+				visible = np.arange(5) < game.num_community_cards[:, None]
+				rows, cols = np.nonzero(visible)
+				out[rows, where.start + game.community_cards[rows, cols]] = 1
+			elif feature == 'credits': out[:, where] = game.credits[tables[:, None], seats] / self.scale
+			elif feature == 'bets': out[:, where] = game.bets[tables[:, None], seats] / self.scale
+			elif feature == 'pending_bets': out[:, where] = game.pending_bets[tables[:, None], seats] / self.scale
+			elif feature == 'minimum_raise_value': out[:, where.start] = game.minimum_raise_value / self.scale
+			elif feature == 'turn': out[tables, where.start + game.turn] = 1
+			elif feature == 'valid_actions': out[:, where] = game.get_valid_actions()
+
+		return out
\ No newline at end of file
@@ -0,0 +1,234 @@
+import ctypes
+import traceback
+import numpy as np
+import multiprocessing as mp
+from typing import Tuple
+from .env import Game
+from .game_env import PokerGameEnv
+from .observation import ObservationSpec
+from ..enums import PokerMoves
+
+def _create_buffer(shape: tuple, dtype) -> Tuple[mp.RawArray, np.ndarray]:
+	""" Creates a shared buffer and a numpy view of it """
+
+	buffer = mp.RawArray(ctypes.c_byte, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+	return buffer, np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+def _worker(conn, envs: slice, buffers: tuple, agents: list, game_config: dict, spec: ObservationSpec, seed: int, game_seeds: list):
+	""" Runs a shard of environments in a subprocess """
+
+	# Seed the global generator used by the
+	# agents; each game has its own stream
+	np.random.seed(seed)
+
+	obs, valid_actions, rewards, dones, hands, actions = [np.frombuffer(buffer, dtype=dtype).reshape(shape) for buffer, dtype, shape in buffers]
+	shard = [PokerGameEnv(agents, rng=game_seed, **game_config) for game_seed in game_seeds]
+
+	def write_state(idx: int, state: Game.StateView):
+		spec.encode(state, obs[idx])
+		valid_actions[idx] = state.valid_actions
+
+	try:
+		while True:
+			cmd = conn.recv()
+			if cmd == 'close': break
+
+			idx = envs.start
+			try:
+				if cmd == 'reset':
+					for idx, env in enumerate(shard, envs.start):
+						write_state(idx, env.reset())
+				elif cmd == 'step':
+					for idx, env in enumerate(shard, envs.start):
+						state, rewards[idx], done, hands[idx] = env.step(int(actions[idx]))
+						dones[idx] = done
+
+						# Auto-reset finished episodes
+						if done: state = env.reset()
+						write_state(idx, state)
+			except Exception:
+				# Report the error to the parent
+				# and keep serving commands
+				conn.send((False, idx, traceback.format_exc()))
+			else: conn.send((True, None, None))
+	except KeyboardInterrupt: pass
+	finally: conn.close()
+
+class PokerVectorEnv:
+	""" Runs many `PokerGameEnv` in parallel subprocesses
+
+	Environments are split in shards, one
+	for each worker process. Observations,
+	valid actions, rewards and done flags
+	are written by the workers directly to
+	shared memory buffers, so that no
+	state is ever pickled. Episodes that
+	are done are reset automatically, and
+	the returned observation is the first
+	observation of the new episode.
+
+	Usage
+	-----
+
+	```python
+	from pokerl.agents import RandomAgent
+	from pokerl.envs import PokerVectorEnv
+
+	with PokerVectorEnv([RandomAgent()] * 3, num_envs=64, num_workers=4, seed=0, num_players=4) as env:
+		obs, valids = env.reset()
+		for step in range(1000):
+			actions = predict(obs, valids)
+			obs, valids, rewards, dones, hands = env.step(actions)
+	```
+
+	The returned arrays are views of the
+	shared buffers, and are overwritten by
+	the next call to `step`.
+	"""
+
+	def __init__(self, agents: list, num_envs: int=1, num_workers: int=None, seed: int=None, **config):
+		""" Starts the worker processes
+
+		Params
+		------
+		agents : list of callables
+			The opponents of each environment,
+			as in `PokerGameEnv`; they are
+			copied to every worker.
+		num_envs : int
+			Number of environments.
+		num_workers : int
+			Number of worker processes;
+			defaults to the number of cores,
+			but no more than `num_envs`.
+		seed : int
+			Seed used to derive an independent
+			stream for the game of each
+			environment; the decks dealt do
+			not depend on the number of
+			workers.
+		observation_spec : ObservationSpec
+			Layout of the observations; by
+			default, all features are encoded
+			as `np.float32` and money is
+			divided by the total credits.
+		start_method : str
+			Multiprocessing start method.
+
+		Other parameters are passed to
+		`PokerGameEnv`.
+		"""
+
+		num_players = config.get('num_players', 4)
+		self.observation_spec: ObservationSpec = config.pop('observation_spec', None) or ObservationSpec(num_players, start_credits=config.get('start_credits', 100))
+		self.num_envs = num_envs
+		self.num_workers = min(num_workers or mp.cpu_count(), num_envs)
+		ctx = mp.get_context(config.pop('start_method', None))
+
+		# Allocate shared buffers
+		specs = [
+			((num_envs, self.observation_spec.size), self.observation_spec.dtype),
+			((num_envs, PokerMoves.NUM_MOVES), np.bool_),
+			((num_envs,), np.float64),
+			((num_envs,), np.bool_),
+			((num_envs,), np.bool_),
+			((num_envs,), np.int64)
+		]
+		buffers = [_create_buffer(shape, dtype) for shape, dtype in specs]
+		self.obs, self.valid_actions, self.rewards, self.dones, self.hands, self.actions = [view for _, view in buffers]
+		shared = tuple((buffer, dtype, shape) for (buffer, _), (shape, dtype) in zip(buffers, specs))
+
+		# Split environments and start workers
+		bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+		seeds = np.random.SeedSequence(seed)
+		game_seeds = seeds.spawn(num_envs)
+		worker_seeds = seeds.generate_state(self.num_workers)
+		self.conns = []
+		self.processes = []
+		for worker in range(self.num_workers):
+			conn, worker_conn = ctx.Pipe()
+			args = (worker_conn, slice(bounds[worker], bounds[worker + 1]), shared, agents, config, self.observation_spec, int(worker_seeds[worker]), game_seeds[bounds[worker]:bounds[worker + 1]])
+			process = ctx.Process(target=_worker, args=args, daemon=True)
+			process.start()
+			worker_conn.close()
+
+			self.conns.append(conn)
+			self.processes.append(process)
+
+		self.closed = False
+
+	def _broadcast(self, cmd: str):
+		""" Sends a command to all workers and waits for them """
+
+		for conn in self.conns: conn.send(cmd)
+
+		# Wait for all workers before raising
+		replies = [conn.recv() for conn in self.conns]
+		for ok, idx, error in replies:
+			if not ok: raise RuntimeError('Environment %d failed:\n%s' % (idx, error))
+
+	def reset(self) -> Tuple[np.ndarray, np.ndarray]:
+		""" Resets all environments
+
+		Returns
+		-------
+		tuple
+			A tuple with the observations,
+			with shape `(num_envs, spec.size)`,
+			and the one-hot valid actions,
+			with shape `(num_envs, PokerMoves.NUM_MOVES)`.
+		"""
+
+		self._broadcast('reset')
+		return self.obs, self.valid_actions
+
+	def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+		""" Performs one action in each environment
+
+		Params
+		------
+		actions : numpy array
+			An array with shape `(num_envs,)`
+			with a valid action for each
+			environment.
+
+		Returns
+		-------
+		tuple
+			A tuple with the observations, the
+			valid actions, the rewards, the
+			done flags and the hand-over flags
+			of each environment.
+		"""
+
+		self.actions[:] = actions
+		self._broadcast('step')
+		return self.obs, self.valid_actions, self.rewards, self.dones, self.hands
+
+	def close(self):
+		""" Stops the worker processes """
+
+		if self.closed: return
+
+		for conn in self.conns:
+			try: conn.send('close')
+			except (BrokenPipeError, EOFError): pass
+			conn.close()
+
+		for process in self.processes: process.join()
+		self.closed = True
+
+	def __enter__(self) -> 'PokerVectorEnv':
+		"""  """
+
+		return self
+
+	def __exit__(self, *args):
+		"""  """
+
+		self.close()
+
+	def __del__(self):
+		"""  """
+
+		if hasattr(self, 'closed'): self.close()
\ No newline at end of file
@@ -0,0 +1,166 @@
+import numpy as np
+from typing import Union, List, Tuple, NamedTuple
+from .cards import Card, get_card_ids
+from .judger import eval_hands_batch
+
+class Equity(NamedTuple):
+	""" Result of an equity estimation
+
+	Attributes
+	----------
+	win : float
+		Probability of winning the pot
+		alone.
+	tie : float
+		Probability of splitting the pot.
+	loss : float
+		Probability of losing the pot.
+	equity : float
+		Expected share of the pot.
+	interval : tuple of floats
+		Lower and upper bound of the
+		confidence interval of `equity`.
+	iterations : int
+		Number of simulated showdowns.
+	"""
+
+	win: float
+	tie: float
+	loss: float
+	equity: float
+	interval: Tuple[float, float]
+	iterations: int
+
+def estimate(player_cards: List[Union[Card, int]], community_cards: List[Union[Card, int]]=(), num_opponents: int=1, iterations: int=10000, rng: Union[np.random.Generator, int, None]=None, **config) -> Equity:
+	""" Estimate the equity of a hand with Monte Carlo rollouts
+
+	The remaining community cards and the
+	cards of the opponents are sampled
+	in batches, and all the showdowns of
+	a batch are evaluated at once.
+
+	Usage
+	-----
+
+	```python
+	state = game.active_state
+	num_opponents = np.sum(game.player_states != PlayerState.BROKEN) - 1
+	out = estimate(state.player_cards, state.community_cards, num_opponents, target_width=0.02)
+	print(out.equity, out.interval)
+	```
+
+	Params
+	------
+	player_cards : list of cards
+		The cards of the player, either as
+		`Card` objects or as card ids.
+	community_cards : list of cards
+		Zero to five known community cards.
+	num_opponents : int
+		Number of opponents still in the
+		hand; their cards are unknown.
+	iterations : int
+		Maximum number of showdowns to
+		simulate.
+	rng : numpy generator or seed
+		Random generator used to sample
+		the cards, or a seed to create
+		one.
+	batch_size : int
+		Number of showdowns simulated at
+		once; defaults to 1000.
+	target_width : float
+		If given, the estimation stops as
+		soon as the confidence interval is
+		narrower than this value.
+	min_iterations : int
+		Number of showdowns simulated before
+		the width of the interval is
+		checked, so that a few identical
+		outcomes do not stop the estimation;
+		defaults to 1000.
+	z : float
+		Z-score of the confidence interval;
+		defaults to 1.96, i.e. a 95%
+		interval.
+
+	Returns
+	-------
+	Equity
+		The estimated probabilities and
+		the confidence interval.
+	"""
+
+	batch_size: int = config.get('batch_size', 1000)
+	target_width: float = config.get('target_width', None)
+	min_iterations: int = config.get('min_iterations', 1000)
+	z: float = config.get('z', 1.96)
+
+	player_cards = get_card_ids(player_cards)
+	community_cards = get_card_ids(community_cards)
+	assert len(player_cards) == 2, 'Invalid player cards'
+	assert len(community_cards) <= 5, 'Invalid community cards'
+	assert num_opponents > 0, 'At least one opponent is required'
+	assert len(set(player_cards + community_cards)) == len(player_cards + community_cards), 'Known cards must be unique'
+	assert all(0 <= card < 52 for card in player_cards + community_cards), 'Invalid card id'
+
+	rng = np.random.default_rng(rng)
+
+	# Cards still in the deck
+	known = np.array(player_cards + community_cards, dtype=np.int64)
+	deck = np.setdiff1d(np.arange(52), known)
+	player_cards, community_cards = known[:2], known[2:]
+	num_board = 5 - len(community_cards)
+	num_drawn = num_board + 2 * num_opponents
+	assert num_drawn <= len(deck), 'Not enough cards for all opponents'
+
+	wins = ties = .0
+	total = total_sq = .0
+	num_iterations = 0
+
+	while num_iterations < iterations:
+		size = min(batch_size, iterations - num_iterations)
+
+		# Sample remaining cards without
+		# replacement, independently for
+		# each showdown
+		drawn = deck[np.argsort(rng.random((size, len(deck))), axis=1)[:, :num_drawn]]
+		board = np.concatenate((np.broadcast_to(community_cards, (size, len(community_cards))), drawn[:, :num_board]), axis=1)
+
+		# Build and evaluate hands
+		player_hands = np.concatenate((np.broadcast_to(player_cards, (size, 2)), board), axis=1)
+		opponent_hands = np.concatenate((drawn[:, num_board:].reshape(size, num_opponents, 2), np.broadcast_to(board[:, None], (size, num_opponents, 5))), axis=2)
+		player_strengths = eval_hands_batch(player_hands)
+		opponent_strengths = eval_hands_batch(opponent_hands)
+
+		# Compute share of the pot
+		best_opponent = np.max(opponent_strengths, axis=1)
+		num_tied = np.sum(opponent_strengths == player_strengths[:, None], axis=1)
+		win = player_strengths > best_opponent
+		tie = player_strengths == best_opponent
+		share = win + tie / (num_tied + 1)
+
+		wins += np.sum(win)
+		ties += np.sum(tie)
+		total += np.sum(share)
+		total_sq += np.sum(share * share)
+		num_iterations += size
+
+		if target_width is not None and num_iterations >= min_iterations:
+			# Check width of confidence interval
+			mean = total / num_iterations
+			std = np.sqrt(max(total_sq / num_iterations - mean * mean, .0) / num_iterations)
+			if 2 * z * std <= target_width: break
+
+	equity = float(total / num_iterations)
+	std = float(np.sqrt(max(total_sq / num_iterations - equity * equity, .0) / num_iterations))
+	interval = (max(equity - z * std, .0), min(equity + z * std, 1.))
+
+	return Equity(
+		win=float(wins / num_iterations),
+		tie=float(ties / num_iterations),
+		loss=float(1. - (wins + ties) / num_iterations),
+		equity=equity,
+		interval=interval,
+		iterations=num_iterations
+	)
\ No newline at end of file
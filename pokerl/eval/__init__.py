@@ -0,0 +1,3 @@
+from .stats import Standing, compute_standings, format_standings
+from .tournament import Match, MatchResult, Tournament, round_robin, play_match
+from .duplicate import generate_decks
@@ -0,0 +1,26 @@
+import numpy as np
+from typing import List
+from ..cards import Card
+
+# Cards by id
+CARDS = tuple(Card((card % 13, card // 13)) for card in range(52))
+
+def generate_decks(num_decks: int, seed: int=None) -> np.ndarray:
+	""" Generates deck permutations for duplicate matches
+
+	Returns
+	-------
+	array
+		A `(num_decks, 52)` array with the
+		card ids of each deck, in order.
+	"""
+
+	# Sort random keys, `Generator.permuted`
+	# needs numpy 1.20
+	rng = np.random.default_rng(seed)
+	return np.argsort(rng.random((num_decks, 52)), axis=1).astype(np.uint8)
+
+def get_deck(card_ids: np.ndarray) -> List[Card]:
+	""" Returns a deck of cards from their ids """
+
+	return [CARDS[card] for card in card_ids.tolist()]
@@ -0,0 +1,75 @@
+import numpy as np
+from typing import NamedTuple, List, Sequence
+
+class Standing(NamedTuple):
+	""" Results of an agent in a tournament
+
+	Attributes
+	----------
+	name : str
+		Name of the agent.
+	hands : int
+		Number of hands played; an agent
+		seated twice at the same table
+		counts each seat.
+	bb_per_100 : float
+		Average winnings, in big blinds per
+		100 hands.
+	ci : float
+		Half width of the confidence
+		interval of `bb_per_100`.
+	"""
+
+	name: str
+	hands: int
+	bb_per_100: float
+	ci: float
+
+def compute_standings(names: Sequence[str], hands: np.ndarray, winnings: np.ndarray, squares: np.ndarray, z: float=1.96, samples: np.ndarray=None) -> List[Standing]:
+	""" Computes win rates and ranks the agents
+
+	Params
+	------
+	names : list of str
+		Name of each agent.
+	hands : array
+		Hands played by each agent.
+	winnings : array
+		Sum of the payoffs of each agent,
+		in big blinds.
+	squares : array
+		Sum of the squared payoffs of each
+		agent, used to estimate the
+		variance.
+	z : float
+		Quantile of the normal distribution
+		of the confidence intervals;
+		defaults to 95% intervals.
+	samples : array
+		Number of samples of each agent, if
+		a sample is not a single hand, as
+		in duplicate matches; `winnings`
+		and `squares` are then sums of the
+		average payoff of each sample.
+
+	Returns
+	-------
+	list of Standing
+		Standings sorted by win rate.
+	"""
+
+	n = np.maximum(hands if samples is None else samples, 1)
+	mean = winnings / n
+	var = np.maximum(squares / n - mean ** 2, 0) * n / np.maximum(n - 1, 1)
+	ci = z * np.sqrt(var / n)
+
+	standings = [Standing(name, int(hands[idx]), 100 * float(mean[idx]), 100 * float(ci[idx])) for idx, name in enumerate(names)]
+	return sorted(standings, key=lambda standing: -standing.bb_per_100)
+
+def format_standings(standings: List[Standing]) -> str:
+	""" Formats the standings as a ranking table """
+
+	width = max([len('agent')] + [len(standing.name) for standing in standings])
+	lines = ['%4s  %-*s %10s %10s %8s' % ('rank', width, 'agent', 'hands', 'bb/100', 'ci')]
+	lines += ['%4d  %-*s %10d %+10.2f %8.2f' % (rank, width, *standing) for rank, standing in enumerate(standings, 1)]
+	return '\n'.join(lines)
@@ -0,0 +1,328 @@
+import os
+import json
+import itertools
+import numpy as np
+import multiprocessing as mp
+from typing import NamedTuple, Callable, Iterator, List, Sequence, Tuple
+from .stats import Standing, compute_standings
+from .duplicate import generate_decks, get_deck
+from ..game import Game
+
+class Match(NamedTuple):
+	""" A match of a tournament
+
+	Attributes
+	----------
+	seats : tuple of int
+		Index of the agent of each seat.
+	num_hands : int
+		Number of hands played.
+	"""
+
+	seats: Tuple[int, ...]
+	num_hands: int
+
+class MatchResult(NamedTuple):
+	""" Results of a match, in big blinds
+
+	Attributes
+	----------
+	idx : int
+		Index of the match in the schedule.
+	seed : int
+		Seed the match was played with.
+	winnings : tuple of float
+		Sum of the payoffs of each seat.
+	squares : tuple of float
+		Sum of the squared payoffs of each
+		seat.
+	"""
+
+	idx: int
+	seed: int
+	winnings: Tuple[float, ...]
+	squares: Tuple[float, ...]
+
+def round_robin(num_agents: int, num_players: int=2, num_hands: int=1000, repeats: int=1) -> List[Match]:
+	""" Schedules a match for each group of `num_players` agents
+
+	Each group plays `repeats` matches,
+	with the seats rotated between them.
+	"""
+
+	assert num_agents >= num_players, 'Not enough agents'
+	groups = list(itertools.combinations(range(num_agents), num_players))
+	schedule = []
+	for repeat in range(repeats):
+		shift = repeat % num_players
+		schedule += [Match(group[shift:] + group[:shift], num_hands) for group in groups]
+
+	return schedule
+
+def play_match(agents: Sequence[Callable], match: Match, decks: np.ndarray=None, **game_config) -> Tuple[np.ndarray, np.ndarray]:
+	""" Plays the hands of a match
+
+	Every hand starts with the initial
+	credits, and the dealer moves by one
+	seat after each hand, so that hands
+	are independent.
+
+	If `decks` is given, the match is
+	played in duplicate: the `i`-th hand
+	is dealt from the `i`-th deck once
+	for each rotation of the agents
+	through the seats, so that every
+	agent plays every set of cards, and
+	its payoffs are averaged.
+
+	Returns
+	-------
+	tuple
+		The sum of the payoffs of each
+		agent of `match.seats` and the sum
+		of their squares, in big blinds.
+	"""
+
+	game = Game(num_players=len(match.seats), **game_config)
+	num_players = game.num_players
+	winnings = np.zeros(num_players)
+	squares = np.zeros(num_players)
+
+	# Agent of each seat, for each rotation;
+	# with rotation `r` the `k`-th agent of
+	# the match sits at seat `k + r`
+	num_rotations = num_players if decks is not None else 1
+	rotations = [[agents[match.seats[(seat - rotation) % num_players]] for seat in range(num_players)] for rotation in range(num_rotations)]
+
+	for hand in range(match.num_hands):
+		deck = get_deck(decks[hand]) if decks is not None else None
+		payoffs = np.zeros(num_players)
+
+		for rotation, seats in enumerate(rotations):
+			game.reset(dealer=hand % num_players, deck=deck)
+
+			hand_over = False
+			while not hand_over:
+				_, hand_over, _ = game.step(int(seats[game.active_player](game.active_state)))
+
+			payoffs += np.roll(game.payoffs, -rotation)
+
+		payoffs /= game.big_blind * num_rotations
+		winnings += payoffs
+		squares += payoffs ** 2
+
+	return winnings, squares
+
+# Agents and game config of the worker
+# processes, set by `_init_worker`
+_worker_args = None
+
+def _init_worker(agents: Sequence[Callable], decks: np.ndarray, game_config: dict):
+	""" Stores the agents in a worker process """
+
+	global _worker_args
+	_worker_args = agents, decks, game_config
+
+def _run_match(idx: int, match: Match, seed: int) -> MatchResult:
+	""" Plays a match with the agents of the worker """
+
+	agents, decks, game_config = _worker_args
+
+	# Seed the global generator used by
+	# the agents; the game has its own
+	np.random.seed(seed)
+
+	winnings, squares = play_match(agents, match, decks, rng=seed, **game_config)
+	return MatchResult(idx, seed, tuple(winnings.tolist()), tuple(squares.tolist()))
+
+def _run_match_star(args: tuple) -> MatchResult:
+	""" Unpacks the arguments of `_run_match` """
+
+	return _run_match(*args)
+
+class Tournament:
+	""" Plays a schedule of matches between agents
+
+	Matches are spread across a pool of
+	processes. Each match is played with
+	its own seed, derived from the seed of
+	the tournament and the index of the
+	match, so the results do not depend on
+	the number of workers or on the order
+	in which matches complete.
+
+	If a journal is given, every result is
+	appended to it as soon as it arrives;
+	a tournament created with the same
+	journal skips the matches it already
+	played, so that it can resume after
+	an interruption.
+
+	In duplicate mode, the decks are
+	generated once from the seed of the
+	tournament and shared by all the
+	matches; each deck is played with the
+	agents rotated through every seat,
+	which removes most of the luck of the
+	cards from the comparison, see
+	`play_match`.
+
+	Usage
+	-----
+
+	```python
+	from pokerl.agents import RandomAgent
+	from pokerl.eval import Tournament, round_robin, format_standings
+
+	agents = [RandomAgent(), call_agent, raise_agent]
+	tournament = Tournament(agents, round_robin(len(agents), num_hands=10000), seed=0, journal='results.jsonl')
+	print(format_standings(tournament.run(num_workers=4)))
+	```
+	"""
+
+	def __init__(self, agents: Sequence[Callable], schedule: List[Match], seed: int=0, journal: str=None, names: Sequence[str]=None, duplicate: bool=False, **game_config):
+		""" Creates a new tournament
+
+		Params
+		------
+		agents : list
+			Callables that receive a state
+			and return an action, such as
+			`PokerAgent` instances.
+		schedule : list of Match
+			The matches to play.
+		seed : int
+			Seed of the tournament.
+		journal : str
+			Path of the file where results
+			are saved, one JSON object per
+			line.
+		names : list of str
+			Names of the agents in the
+			standings; defaults to `agent0`,
+			`agent1`, ...
+		duplicate : bool
+			If true, matches are played in
+			duplicate; a match of `num_hands`
+			hands then plays `num_hands` decks
+			once for each seat.
+
+		Other parameters are passed to the
+		`Game` of each match, except for the
+		number of players, which is the
+		number of seats of the match, and
+		the random generator, which is
+		seeded with the seed of the match.
+		"""
+
+		self.agents = list(agents)
+		self.schedule = list(schedule)
+		self.seed = seed
+		self.journal = journal
+		self.names = list(names) if names is not None else ['agent%d' % idx for idx in range(len(self.agents))]
+		self.duplicate = duplicate
+		self.game_config = game_config
+		self.start_method: str = game_config.pop('start_method', None)
+		game_config.pop('num_players', None)
+		game_config.pop('rng', None)
+
+		assert len(self.names) == len(self.agents), 'Invalid number of names'
+		assert all(0 <= agent < len(self.agents) for match in self.schedule for agent in match.seats), 'Invalid agent index'
+
+		# Decks shared by all the matches
+		self.decks: np.ndarray = None
+		if duplicate: self.decks = generate_decks(max([match.num_hands for match in self.schedule], default=0), np.random.SeedSequence([seed]))
+
+		self.results: List[MatchResult] = [None] * len(self.schedule)
+		if journal is not None and os.path.exists(journal): self.load(journal)
+
+	def get_match_seed(self, idx: int) -> int:
+		""" Returns the seed of the `idx`-th match """
+
+		return int(np.random.SeedSequence([self.seed, idx]).generate_state(1)[0])
+
+	def load(self, path: str):
+		""" Loads the results saved in a journal
+
+		Raises
+		------
+		ValueError
+			If a result does not belong to
+			this schedule.
+		"""
+
+		with open(path) as f:
+			for line in f:
+				# Skip a line that was not
+				# completely written
+				try: record = json.loads(line)
+				except json.JSONDecodeError: continue
+
+				result = MatchResult(record['idx'], record['seed'], tuple(record['winnings']), tuple(record['squares']))
+				if not 0 <= result.idx < len(self.schedule) or result.seed != self.get_match_seed(result.idx) or len(result.winnings) != len(self.schedule[result.idx].seats):
+					raise ValueError('Result of match %d does not belong to this tournament' % result.idx)
+
+				self.results[result.idx] = result
+
+	@property
+	def pending(self) -> List[int]:
+		""" Indices of the matches without a result """
+
+		return [idx for idx, result in enumerate(self.results) if result is None]
+
+	def play(self, num_workers: int=1) -> Iterator[MatchResult]:
+		""" Plays the pending matches, yields results as they complete """
+
+		args = [(idx, self.schedule[idx], self.get_match_seed(idx)) for idx in self.pending]
+		if not args: return
+
+		journal = open(self.journal, 'a') if self.journal is not None else None
+		try:
+			if num_workers > 1:
+				ctx = mp.get_context(self.start_method)
+				with ctx.Pool(min(num_workers, len(args)), initializer=_init_worker, initargs=(self.agents, self.decks, self.game_config)) as pool:
+					yield from self.collect(pool.imap_unordered(_run_match_star, args), journal)
+			else:
+				_init_worker(self.agents, self.decks, self.game_config)
+				yield from self.collect(map(_run_match_star, args), journal)
+		finally:
+			if journal is not None: journal.close()
+
+	def collect(self, results: Iterator[MatchResult], journal) -> Iterator[MatchResult]:
+		""" Stores and saves results """
+
+		for result in results:
+			self.results[result.idx] = result
+			if journal is not None:
+				journal.write(json.dumps(result._asdict()) + '\n')
+				journal.flush()
+
+			yield result
+
+	def run(self, num_workers: int=1) -> List[Standing]:
+		""" Plays the pending matches and returns the standings """
+
+		for _ in self.play(num_workers): pass
+		return self.standings()
+
+	def standings(self, z: float=1.96) -> List[Standing]:
+		""" Returns the standings of the matches played so far """
+
+		hands = np.zeros(len(self.agents), dtype=np.int64)
+		samples = np.zeros(len(self.agents), dtype=np.int64)
+		winnings = np.zeros(len(self.agents))
+		squares = np.zeros(len(self.agents))
+
+		for match, result in zip(self.schedule, self.results):
+			if result is None: continue
+
+			# A duplicate sample is a deck
+			# played from every seat
+			num_rotations = len(match.seats) if self.duplicate else 1
+			for seat, agent in enumerate(match.seats):
+				hands[agent] += match.num_hands * num_rotations
+				samples[agent] += match.num_hands
+				winnings[agent] += result.winnings[seat]
+				squares[agent] += result.squares[seat]
+
+		return compute_standings(self.names, hands, winnings, squares, z, samples)
@@ -0,0 +1,219 @@
+import logging
+import numpy as np
+from typing import List, NamedTuple
+from .cards import Card
+from .enums import GameEvent, PokerMoves, PlayerState, HandRanking
+from .judger import get_ranking
+
+class DealEvent(NamedTuple):
+	""" Emitted when the cards of a new hand are dealt
+
+	Attributes
+	----------
+	hand : int
+		Index of the hand.
+	player_cards : list of lists of cards
+		The cards of each player; broken
+		players have no cards.
+	"""
+
+	hand: int
+	player_cards: List[List[Card]]
+
+	kind = GameEvent.DEAL
+
+class BlindsEvent(NamedTuple):
+	""" Emitted after the blinds of a new hand are placed
+
+	Attributes
+	----------
+	hand : int
+		Index of the hand.
+	dealer : int
+		Index of the dealer.
+	small_blind_idx : int
+		Index of the small blind player.
+	big_blind_idx : int
+		Index of the big blind player.
+	small_blind : float
+		Value of the small blind.
+	big_blind : float
+		Value of the big blind.
+	active_player : int
+		The player that starts the turn.
+	player_states : numpy array
+		The state of each player.
+	credits : numpy array
+		The credits of each player.
+	"""
+
+	hand: int
+	dealer: int
+	small_blind_idx: int
+	big_blind_idx: int
+	small_blind: float
+	big_blind: float
+	active_player: int
+	player_states: np.ndarray
+	credits: np.ndarray
+
+	kind = GameEvent.BLINDS
+
+class ActionEvent(NamedTuple):
+	""" Emitted after a player performs an action
+
+	Attributes
+	----------
+	hand : int
+		Index of the hand.
+	player : int
+		The player that acted.
+	action : int
+		The action, as in `PokerMoves`.
+	bet : float
+		The pending bet of the player after
+		the action.
+	high_bet : float
+		The high bet before the action.
+	minimum_raise_value : float
+		The minimum raise value after the
+		action.
+	"""
+
+	hand: int
+	player: int
+	action: int
+	bet: float
+	high_bet: float
+	minimum_raise_value: float
+
+	kind = GameEvent.ACTION
+
+class StreetEvent(NamedTuple):
+	""" Emitted when the community cards of a new turn are revealed
+
+	Attributes
+	----------
+	hand : int
+		Index of the hand.
+	turn : int
+		The new turn, i.e. 1 for the flop,
+		2 for the turn and 3 for the river.
+	community_cards : list of cards
+		The visible community cards.
+	"""
+
+	hand: int
+	turn: int
+	community_cards: List[Card]
+
+	kind = GameEvent.STREET
+
+class ShowdownEvent(NamedTuple):
+	""" Emitted when two or more players reach the showdown
+
+	Attributes
+	----------
+	hand : int
+		Index of the hand.
+	hands : list of lists of cards
+		The final hand of each player; the
+		hand is empty if the player did not
+		reach the showdown.
+	strengths : list of ints
+		The strength of each hand, as
+		returned by `eval_strength`.
+	"""
+
+	hand: int
+	hands: List[List[Card]]
+	strengths: List[int]
+
+	kind = GameEvent.SHOWDOWN
+
+class PayoffEvent(NamedTuple):
+	""" Emitted when a hand ends
+
+	Attributes
+	----------
+	hand : int
+		Index of the hand.
+	pot : float
+		Total value of the pot.
+	winners : list of ints
+		Players that won a share of the
+		pot.
+	payoffs : numpy array
+		The net profit of each player.
+	last_stand : bool
+		True if the hand ended because all
+		players but one folded.
+	"""
+
+	hand: int
+	pot: float
+	winners: List[int]
+	payoffs: np.ndarray
+	last_stand: bool
+
+	kind = GameEvent.PAYOFF
+
+class EventLogger:
+	""" Subscriber that writes game events to a logger
+
+	Usage
+	-----
+
+	```python
+	logging.basicConfig(stream=sys.stdout, level=logging.INFO)
+	game = Game(num_players=4)
+	game.subscribe(EventLogger())
+	```
+	"""
+
+	def __init__(self, logger: logging.Logger=None, level: int=logging.INFO):
+		""" Creates a new bridge
+
+		Params
+		------
+		logger : Logger
+			The logger to write to; defaults
+			to the root logger.
+		level : int
+			The level of the messages.
+		"""
+
+		self.logger = logger or logging.getLogger()
+		self.level = level
+
+	def __call__(self, event: NamedTuple):
+		""" Formats and logs an event """
+
+		if not self.logger.isEnabledFor(self.level): return
+
+		log = lambda msg, *args: self.logger.log(self.level, msg, *args)
+
+		if event.kind == GameEvent.DEAL:
+			log('Dealing cards')
+			for player, cards in enumerate(event.player_cards):
+				if cards: log('Player %d has cards: %s', player, cards)
+		elif event.kind == GameEvent.BLINDS:
+			log('; '.join(['Player %d is %s with $%.2f' % (player, PlayerState.as_string[state], event.credits[player]) for player, state in enumerate(event.player_states)]))
+			log('Player %d is small blind; player %d is big blind', event.small_blind_idx, event.big_blind_idx)
+			log('Big blind is $%.2f; small blind is $%.2f', event.big_blind, event.small_blind)
+			log('Player %d starts the turn', event.active_player)
+		elif event.kind == GameEvent.ACTION:
+			if event.action == PokerMoves.FOLD: log('Player %d folds', event.player)
+			elif event.action == PokerMoves.CHECK: log('Player %d checks', event.player)
+			elif event.action == PokerMoves.ALL_IN: log('Player %d goes all-in with $%.2f', event.player, event.bet)
+			elif event.bet > event.high_bet: log('Player %d raises to $%.2f', event.player, event.bet)
+			else: log('Player %d called $%.2f', event.player, event.bet)
+		elif event.kind == GameEvent.STREET:
+			log('Community cards: %s', event.community_cards)
+		elif event.kind == GameEvent.SHOWDOWN:
+			log('Final hands: %s', ', '.join(['Player %d has %s' % (player, HandRanking.as_string[get_ranking(strength)[0]]) for player, strength in enumerate(event.strengths) if strength]))
+		elif event.kind == GameEvent.PAYOFF:
+			log('Pot value is $%.2f', event.pot)
+			if event.last_stand: log('Player %d wins by last stand', event.winners[0])
+			else: log('Player(s) %s win', event.winners)
+			log('Players\'s net profits: %s', event.payoffs)
@@ -1,10 +1,18 @@
-import random
 import logging
+import weakref
 import numpy as np
-from typing import Union, List, Tuple, Generator
-from .judger import compare_hands, compare_rankings, eval_hand
+from typing import Union, List, Tuple, Generator, Callable, Iterable, NamedTuple
+from .judger import eval_strength
+from .pots import resolve_pots
 from .cards import Card, create_default_deck
-from .enums import PokerMoves, PlayerState, HandRanking
+from .enums import PokerMoves, PlayerState, GameEvent, ChipRounding
+from .events import DealEvent, BlindsEvent, ActionEvent, StreetEvent, ShowdownEvent, PayoffEvent, EventLogger
+
+# Fraction of the remaining credits of
+# each raise move, as a float and as an
+# exact ratio for integer chips
+RAISE_FACTORS = (0.1, 0.25, 0.5)
+RAISE_FRACTIONS = ((1, 10), (1, 4), (1, 2))
 
 class Game:
 	""" A Texas Hold'em game
@@ -21,8 +29,8 @@ class Game:
 	# Enable logging
 	logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
-	# Create game
-	game = Game(num_players=4, start_credits=100)
+	# Create game and log its events
+	game = Game(num_players=4, start_credits=100, logger=logging.getLogger())
 
 	for g in range(10):
 		game.reset()
@@ -34,6 +42,18 @@ class Game:
 
 			game_over, *_ = game.step(u)
 	```
+
+	Each game deals from its own random
+	generator, created from the `rng`
+	parameter: a seed, a `SeedSequence` or
+	a numpy `Generator`. Games of a worker
+	pool get independent streams from the
+	children of a seed sequence:
+
+	```python
+	seeds = np.random.SeedSequence(0).spawn(num_games)
+	games = [Game(num_players=4, rng=seed) for seed in seeds]
+	```
 	"""
 
 	class StateView:
@@ -46,6 +66,12 @@ class Game:
 		`__getstate__` so that it can be
 		easily pickled.
 
+		Fields are computed lazily from the
+		game, and views that are still alive
+		when the game state changes take a
+		snapshot of the state, so that they
+		can be safely stored.
+
 		Usage
 		-----
 
@@ -112,23 +138,125 @@ class Game:
 		credit : float
 			The credit of the player captured
 			by this view.
+		bucket : int
+			The card bucket of the player, if
+			the game was created with an
+			`abstraction` that has a table for
+			this turn. Pickled views only keep
+			the bucket if it was read.
 		"""
 		
+		__slots__ = (
+			'player',
+			'num_players',
+			'turn',
+			'minimum_raise_value',
+			'_game',
+			'_valid_actions',
+			'_player_cards',
+			'_community_cards',
+			'_credits',
+			'_bets',
+			'_pending_bets',
+			'_abstraction',
+			'_bucket',
+			'_chip_rounding',
+			'__weakref__'
+		)
+
 		def __init__(self, game: 'Game', player: int=None):
-			"""  """
+			""" Creates a view of the current state of `game`
+			
+			The view reads the state directly
+			from the game, and fields such as
+			the valid actions and the cards are
+			only computed when first accessed.
+			Before the game state changes, the
+			game calls `detach` on the views
+			that are still alive, which then
+			keep a snapshot of the state.
+			"""
 
 			assert game is not None and isinstance(game, Game), 'Invalid game'
 
-			self.player = player or game.active_player
-			self.valid_actions, _ = game.get_valid_actions(self.player)
+			self.player = game.active_player if player is None else player
 			self.num_players = game.num_players
 			self.turn = game.turn
-			self.player_cards = game.get_cards_of(self.player)
-			self.community_cards = game.community_cards
-			self.credits = game.credits
-			self.bets = game.bets
-			self.pending_bets = game.pending_bets
 			self.minimum_raise_value = game.minimum_raise_value
+			self._game = game
+			self._valid_actions = None
+			self._player_cards = None
+			self._community_cards = None
+			self._credits = game.credits
+			self._bets = game.bets
+			self._pending_bets = game.pending_bets
+			self._abstraction = game.abstraction
+			self._bucket = None
+			self._chip_rounding = game.chip_rounding
+
+			game.views.append(weakref.ref(self))
+		
+		def detach(self):
+			""" Snapshots the game state, so that the view is no longer affected by the game """
+
+			game = self._game
+			if game is None: return
+
+			if self._player_cards is None: self._player_cards = game.get_cards_of(self.player)
+			if self._community_cards is None: self._community_cards = game.community_cards
+			self._credits = self._credits.copy()
+			self._bets = self._bets.copy()
+			self._pending_bets = self._pending_bets.copy()
+			self._game = None
+		
+		@property
+		def valid_actions(self) -> np.ndarray:
+			""" A one-hot encoded array of valid actions """
+
+			if self._valid_actions is None:
+				if self._game is not None: self._valid_actions, _ = self._game.get_valid_actions(self.player)
+				else: self._valid_actions = Game.compute_valid_actions(self._credits[self.player], np.max(self._pending_bets), self.minimum_raise_value, self._chip_rounding)
+
+			return self._valid_actions
+		
+		@property
+		def player_cards(self) -> List[Card]:
+			""" A 2-element list with the cards in the hand of the player """
+
+			if self._player_cards is None: self._player_cards = self._game.get_cards_of(self.player)
+			return self._player_cards
+		
+		@property
+		def community_cards(self) -> List[Card]:
+			""" A list with the community cards """
+
+			if self._community_cards is None: self._community_cards = self._game.community_cards
+			return self._community_cards
+		
+		@property
+		def bucket(self) -> int:
+			""" The card bucket of the player, see `pokerl.abstraction`; `None` if the game has no abstraction """
+
+			if self._bucket is None and self._abstraction is not None: self._bucket = self._abstraction.get_bucket(self.player_cards, self.community_cards)
+			return self._bucket
+		
+		@property
+		def credits(self) -> np.ndarray:
+			""" The credits of each player """
+
+			return self._credits
+		
+		@property
+		def bets(self) -> np.ndarray:
+			""" The commited bets of each player """
+
+			return self._bets
+		
+		@property
+		def pending_bets(self) -> np.ndarray:
+			""" The bets of each player in this turn """
+
+			return self._pending_bets
 		
 		@property
 		def valid_action_indices(self) -> Generator[int, None, None]:
@@ -219,7 +347,8 @@ class Game:
 				self.credits,
 				self.bets,
 				self.pending_bets,
-				self.minimum_raise_value
+				self.minimum_raise_value,
+				self._bucket
 			)
 
 		def __setstate__(self, state: tuple):
@@ -228,16 +357,37 @@ class Game:
 			# Unpack state
 			(
 				self.player,
-				self.valid_actions,
+				self._valid_actions,
 				self.num_players,
 				self.turn,
-				self.player_cards,
-				self.community_cards,
-				self.credits,
-				self.bets,
-				self.pending_bets,
-				self.minimum_raise_value
+				self._player_cards,
+				self._community_cards,
+				self._credits,
+				self._bets,
+				self._pending_bets,
+				self.minimum_raise_value,
+				self._bucket
 			) = state
+			self._game = None
+			self._abstraction = None
+			self._chip_rounding = None
+
+	class Snapshot(NamedTuple):
+		""" Immutable copy of the state of a game
+
+		Created by `Game.snapshot` and passed
+		to `Game.restore`. The arrays are
+		read-only; `money` stacks credits,
+		bets, pending bets and payoffs. Event
+		subscribers, state views and the
+		random generator are not part of the
+		snapshot.
+		"""
+
+		deck: Tuple[Card, ...]
+		player_states: np.ndarray
+		money: np.ndarray
+		scalars: tuple
 
 	def __init__(self, **config):
 		""" TODO """
@@ -247,21 +397,148 @@ class Game:
 		self.start_credits: Union[np.ndarray, int, list] = config.get('start_credits', 100)
 		self.big_blind: float = config.get('big_blind', 2)
 		self.small_blind: float = config.get('small_blind', 1)
-		self.logger: logging.Logger = config.get('logger', logging.getLogger())
 		self.dealer_idx: int = config.get('dealer', 0)
+		self.abstraction = config.get('abstraction', None)
+
+		# In integer mode money is counted in
+		# whole chips and raises are rounded
+		self.integer_chips: bool = config.get('integer_chips', False)
+		self.chip_rounding: int = config.get('chip_rounding', ChipRounding.DOWN) if self.integer_chips else None
+		self.chip_type: type = int if self.integer_chips else float
 
+		if self.integer_chips:
+			assert np.all(np.mod(self.start_credits, 1) == 0), 'Start credits must be whole chips'
+			assert self.big_blind % 1 == 0 and self.small_blind % 1 == 0, 'Blinds must be whole chips'
+			self.big_blind, self.small_blind = int(self.big_blind), int(self.small_blind)
+
+		self.rng: np.random.Generator = np.random.default_rng(config.get('rng', None))
 		self.deck = create_default_deck()
+
+		# Only the community cards and the
+		# cards of the players are dealt; the
+		# `i`-th card is drawn among the last
+		# `52 - i` cards of the deck
+		self.deal_ranges = [(idx, len(self.deck) - idx) for idx in range(5 + 2 * self.num_players)]
+
 		self.turn = 0
 		self.hand = 0
 		self.big_blind_idx = 0
 		self.small_blind_idx = 0
 		self.active_player = 0
 		self.player_states = np.full((self.num_players,), PlayerState.ACTIVE, dtype=np.uint8)
-		self.credits = np.zeros((self.num_players,))
-		self.bets = np.zeros((self.num_players,))
-		self.pending_bets = np.zeros((self.num_players,))
-		self.minimum_raise_value = .0
-		self.payoffs = np.zeros((self.num_players,))
+		self.credits = np.zeros((self.num_players,), dtype=self.chip_type)
+		self.bets = np.zeros((self.num_players,), dtype=self.chip_type)
+		self.pending_bets = np.zeros((self.num_players,), dtype=self.chip_type)
+		self.minimum_raise_value = self.chip_type(0)
+		self.payoffs = np.zeros((self.num_players,), dtype=self.chip_type)
+
+		# Scalars updated by each action, so
+		# that a step needs no reductions; see
+		# `count_players`
+		self.pot = self.bets.dtype.type(0)
+		self.high_bet = self.pending_bets.dtype.type(0)
+		self.num_remaining_players = self.num_players
+		self.num_playing_players = self.num_players
+
+		# Valid moves of the active player,
+		# cleared when the state changes
+		self.active_moves: Tuple[bool, ...] = None
+
+		# Weak references to the state views
+		# of the current state
+		self.views: List[weakref.ref] = []
+		self.active_view: weakref.ref = None
+
+		# Event subscribers, one list for
+		# each type of event
+		self.subscribers: List[List[Callable]] = [[] for _ in range(GameEvent.NUM_EVENTS)]
+
+		logger: logging.Logger = config.get('logger', None)
+		if logger is not None: self.subscribe(EventLogger(logger))
+
+		# Set while the phases are timed, see
+		# `enable_profiling`
+		self.profiler = None
+	
+	def __getstate__(self) -> dict:
+		""" Returns the game state, without the state views """
+
+		state = self.__dict__.copy()
+		state['views'] = []
+		state['active_view'] = None
+		state['subscribers'] = [[] for _ in range(GameEvent.NUM_EVENTS)]
+
+		# Timed methods are not copied
+		if self.profiler is not None:
+			for obj, attr, _, _ in self.profiler.wrapped:
+				if obj is self: state.pop(attr, None)
+
+			state['profiler'] = None
+
+		return state
+
+	def snapshot(self) -> 'Game.Snapshot':
+		""" Returns a snapshot of the game state
+		
+		The snapshot holds the deck order, the
+		player states, all the money arrays
+		and the turn, hand, dealer, blinds,
+		active player and minimum raise value;
+		it is cheap enough to branch the game
+		many times per decision, e.g. for
+		tree search
+		"""
+
+		player_states = self.player_states.copy()
+		money = np.array((self.credits, self.bets, self.pending_bets, self.payoffs))
+		player_states.flags.writeable = False
+		money.flags.writeable = False
+
+		return Game.Snapshot(
+			tuple(self.deck),
+			player_states,
+			money,
+			(
+				self.turn,
+				self.hand,
+				self.dealer_idx,
+				self.big_blind_idx,
+				self.small_blind_idx,
+				self.active_player,
+				self.minimum_raise_value,
+				self.big_blind,
+				self.small_blind
+			)
+		)
+	
+	def restore(self, snapshot: 'Game.Snapshot'):
+		""" Returns to the state captured by `snapshot` """
+
+		self.detach_views()
+
+		money = snapshot.money
+		self.deck[:] = snapshot.deck
+		self.player_states[:] = snapshot.player_states
+		self.credits[:] = money[0]
+		self.bets[:] = money[1]
+		self.pending_bets[:] = money[2]
+		self.payoffs[:] = money[3]
+		(
+			self.turn,
+			self.hand,
+			self.dealer_idx,
+			self.big_blind_idx,
+			self.small_blind_idx,
+			self.active_player,
+			self.minimum_raise_value,
+			self.big_blind,
+			self.small_blind
+		) = snapshot.scalars
+
+		self.pot = self.bets.sum()
+		self.high_bet = self.pending_bets.max()
+		self.count_players()
+		self.active_moves = None
 	
 	@property
 	def community_cards(self) -> List[Card]:
@@ -277,18 +554,6 @@ class Game:
 		# same thus we don't care
 		return [] if self.turn == 0 else self.deck[:self.turn + 2]
 	
-	@property
-	def pot(self) -> float:
-		""" The sum of all the bets """
-
-		return np.sum(self.bets)
-	
-	@property
-	def high_bet(self) -> float:
-		""" The current highest bet """
-		
-		return np.max(self.pending_bets)
-	
 	@property
 	def high_bidders(self) -> np.ndarray:
 		""" List of bidders that match the high bet """
@@ -317,7 +582,7 @@ class Game:
 	def game_over(self) -> bool:
 		""" Returns true if all players but one are broken """
 
-		return np.sum(self.player_states != PlayerState.BROKEN) == 1
+		return self.num_remaining_players == 1
 	
 	@property
 	def active_state(self) -> StateView:
@@ -329,12 +594,116 @@ class Game:
 			see the class for more info
 		"""
 		
-		return self.StateView(self, self.active_player)
+		view = self.active_view() if self.active_view is not None else None
+		if view is None:
+			view = self.StateView(self, self.active_player)
+			self.active_view = weakref.ref(view)
+
+		return view
 	
+	def detach_views(self):
+		""" Detaches the state views that are still alive
+		
+		Must be called before changing the
+		game state; views that are no longer
+		referenced are simply discarded
+		"""
+
+		for ref in self.views:
+			view = ref()
+			if view is not None: view.detach()
+		
+		self.views.clear()
+		self.active_view = None
+
+	def subscribe(self, callback: Callable, kinds: Iterable[int]=None):
+		""" Registers a callback for game events
+
+		Events are only built if there is at
+		least one subscriber for their type,
+		so that a game without subscribers
+		pays no cost
+
+		Params
+		------
+		callback : callable
+			Called with each event, see
+			`pokerl.events`.
+		kinds : iterable of ints
+			The types of events, as in
+			`GameEvent`; defaults to all.
+		"""
+
+		if kinds is None: kinds = range(GameEvent.NUM_EVENTS)
+		for kind in kinds: self.subscribers[kind].append(callback)
+
+	def unsubscribe(self, callback: Callable):
+		""" Removes a callback from all the events it subscribed to """
+
+		for subscribers in self.subscribers:
+			while callback in subscribers: subscribers.remove(callback)
+
+	def enable_profiling(self, profiler: 'Profiler'=None) -> 'Profiler':
+		""" Starts timing the phases of the game
+
+		Params
+		------
+		profiler : Profiler
+			Profiler that collects the times;
+			by default a new one.
+
+		Returns
+		-------
+		Profiler
+			The profiler of the game, see
+			`pokerl.profiling`.
+		"""
+
+		# Imported here, so that the module
+		# can also run as a script
+		from .profiling import Profiler
+
+		if self.profiler is None:
+			self.profiler = profiler if profiler is not None else Profiler()
+			self.profiler.attach_game(self)
+
+		return self.profiler
+
+	def disable_profiling(self):
+		""" Stops timing the game; the profiler keeps its counters """
+
+		if self.profiler is not None:
+			self.profiler.detach()
+			self.profiler = None
+
+	def emit(self, event: tuple):
+		""" Sends an event to its subscribers """
+
+		for callback in self.subscribers[event.kind]: callback(event)
+
+	def count_players(self):
+		""" Counts the players that are not broken, and those still in the hand
+
+		Must be called after changing the
+		player states other than by `step`,
+		which keeps the counts up to date
+		"""
+
+		self.num_remaining_players = self.num_playing_players = 0
+		for state in self.player_states.tolist():
+			if state != PlayerState.BROKEN:
+				self.num_remaining_players += 1
+				if state != PlayerState.FOLDED: self.num_playing_players += 1
+
 	def get_first_playing(self, idx: int) -> int:
 		""" Returns the index of the first non-broken player, starting from player `idx` """
 
-		return (idx + np.argmax(np.roll(self.player_states, -idx) != PlayerState.BROKEN)) % self.num_players
+		states = self.player_states
+		for offset in range(self.num_players):
+			player = (idx + offset) % self.num_players
+			if states[player] != PlayerState.BROKEN: return player
+
+		return idx % self.num_players
 	
 	def get_valid_actions(self, player: int=None) -> Tuple[np.ndarray, Generator[int, None, None]]:
 		""" List of valid actions
@@ -360,20 +729,8 @@ class Game:
 			of valid actions
 		"""
 
-		if player is None: player = self.active_player
-
-		high_bet = self.high_bet
-		credit = self.credits[player]
-		onehot = np.ones((PokerMoves.NUM_MOVES))
-		
-		# Compute minimum raise value
-		raise_values = np.array([0.1, 0.25, 0.5]) * (credit - high_bet)
-		raise_values = np.logical_and(raise_values > self.minimum_raise_value, (high_bet + raise_values) < credit)
-		onehot[PokerMoves.RAISE_ANY:PokerMoves.RAISE_ANY + PokerMoves.NUM_RAISE_MOVES] = raise_values
-
-		# Compute call and check validity
-		onehot[PokerMoves.CHECK] = high_bet == .0 # Check only if no hight bet
-		onehot[PokerMoves.CALL] = high_bet < credit # Call only if enough credits
+		if player is None or player == self.active_player: onehot = np.array(self.get_valid_moves(), dtype=float)
+		else: onehot = self.compute_valid_actions(self.credits[player], self.high_bet, self.minimum_raise_value, self.chip_rounding)
 		
 		# Generate action indices using
 		# a generator, so that we don't
@@ -381,7 +738,84 @@ class Game:
 		valids = (action for action, valid in enumerate(onehot) if valid)
 
 		return onehot, valids
+
+	def get_valid_moves(self) -> Tuple[bool, ...]:
+		""" Returns whether each move is valid for the active player
+		
+		The moves are computed once for each
+		state, and no array is allocated; see
+		`compute_valid_moves`
+		"""
+
+		if self.active_moves is None:
+			self.active_moves = self.compute_valid_moves(self.credits[self.active_player], self.high_bet, self.minimum_raise_value, self.chip_rounding)
+
+		return self.active_moves
+	
+	@staticmethod
+	def compute_valid_actions(credit: float, high_bet: float, minimum_raise_value: float, rounding: int=None) -> np.ndarray:
+		""" Returns the one-hot encoded array of valid actions for a player with `credit`
+
+		Raises are rounded to whole chips
+		with `rounding`, if given
+		"""
+
+		return np.array(Game.compute_valid_moves(credit, high_bet, minimum_raise_value, rounding), dtype=float)
+
+	@staticmethod
+	def compute_valid_moves(credit: float, high_bet: float, minimum_raise_value: float, rounding: int=None) -> Tuple[bool, ...]:
+		""" Returns a tuple with the validity of each move for a player with `credit`
+
+		Folding and going all-in are always
+		valid; raises are rounded to whole
+		chips with `rounding`, if given
+		"""
+
+		# Check only if no high bet, call
+		# only if enough credits
+		moves = [True, high_bet == 0, high_bet < credit]
+		
+		# A raise must exceed the minimum raise
+		# value and leave some credits
+		amount = credit - high_bet
+		for action in range(PokerMoves.RAISE_ANY, PokerMoves.ALL_IN):
+			if rounding is None: raise_value = RAISE_FACTORS[action - PokerMoves.RAISE_ANY] * amount
+			else: raise_value = Game.compute_raise_value(amount, action, rounding)
+			moves.append(raise_value > minimum_raise_value and high_bet + raise_value < credit)
+
+		moves.append(True)
+		return tuple(moves)
 	
+	@staticmethod
+	def compute_raise_value(amount: float, action: int, rounding: int=None) -> float:
+		""" Returns the raise of `action` given the remaining `amount` of credits
+
+		Params
+		------
+		amount : float
+			The credits left after calling.
+		action : int
+			A raise move, as in `PokerMoves`.
+		rounding : int
+			If given, the raise is rounded to
+			whole chips with this policy, as
+			in `ChipRounding`; the fraction is
+			computed exactly on integers.
+
+		Returns
+		-------
+		float
+			The raise, an int if rounded.
+		"""
+
+		if rounding is None: return amount * RAISE_FACTORS[action - PokerMoves.RAISE_ANY]
+
+		numerator, denominator = RAISE_FRACTIONS[action - PokerMoves.RAISE_ANY]
+		amount = int(amount) * numerator
+		if rounding == ChipRounding.DOWN: return amount // denominator
+		elif rounding == ChipRounding.UP: return -(-amount // denominator)
+		else: return (2 * amount + denominator) // (2 * denominator)
+
 	def get_cards_of(self, player: int) -> List[Card]:
 		""" Returns the cards in the hands of `player` """
 
@@ -397,10 +831,22 @@ class Game:
 	def reset(self, **config):
 		"""Reset game to its initial state
 		
-		Accepts the same parameters of `__init__`
+		Accepts the same parameters of `__init__`;
+		if `deck` is given, the first hand is
+		dealt from it, see `setup_hand`; if
+		`rng` is given, the random generator
+		is replaced and the deck is put back
+		in order, so that the deals can be
+		reproduced
 		"""
 
+		self.detach_views()
 		self.dealer_idx = config.get('dealer', 0)
+		if 'rng' in config:
+			# The partial shuffle starts from the
+			# current order of the deck
+			self.rng = np.random.default_rng(config['rng'])
+			self.deck[:] = create_default_deck()
 
 		# Reset initial state
 		self.hand = 0
@@ -409,10 +855,18 @@ class Game:
 		self.player_states[:] = PlayerState.ACTIVE
 		
 		# Setup hand
-		self.setup_hand()
+		self.setup_hand(config.get('deck', None))
 	
-	def setup_hand(self):
-		""" Setup a new hand """
+	def setup_hand(self, deck: List[Card]=None):
+		""" Setup a new hand
+		
+		Params
+		------
+		deck : list of cards
+			If given, the deck is arranged in
+			this order instead of being
+			shuffled; used to replay hands.
+		"""
 
 		self.hand += 1
 		self.turn = 0
@@ -421,12 +875,11 @@ class Game:
 		self.player_states[self.player_states != PlayerState.BROKEN] = PlayerState.ACTIVE
 
 		# Shuffle deck
-		random.shuffle(self.deck)
-		self.logger.info('Dealing cards')
+		if deck is None: self.shuffle_deck()
+		else: self.deck[:] = deck
 
-		for player in range(self.num_players):
-			if self.player_states[player] != PlayerState.BROKEN:
-				self.logger.info('Player %d has cards: %s', player, self.get_cards_of(player))
+		if self.subscribers[GameEvent.DEAL]:
+			self.emit(DealEvent(self.hand, [self.get_cards_of(player) if state != PlayerState.BROKEN else [] for player, state in enumerate(self.player_states)]))
 
 		# Update dealer, blinds and set active player
 		self.dealer_idx = self.get_first_playing(self.dealer_idx + 1)
@@ -442,14 +895,32 @@ class Game:
 
 		# Check if all-in and clip blinds
 		self.player_states[self.pending_bets > self.credits] = PlayerState.ALL_IN
-		self.pending_bets = np.minimum(self.pending_bets, self.credits)
+		np.minimum(self.pending_bets, self.credits, out=self.pending_bets)
 		self.minimum_raise_value = np.max(self.pending_bets)
 
-		self.logger.info('; '.join(['Player %d is %s with $%.2f' % (player, PlayerState.as_string[state], self.credits[player]) for player, state in enumerate(self.player_states)]))
-		self.logger.info('Player %d is small blind; player %d is big blind', self.small_blind_idx, self.big_blind_idx)
-		self.logger.info('Big blind is $%.2f; small blind is $%.2f', self.big_blind, self.small_blind)
-		self.logger.info('Player %d starts the turn', self.active_player)
+		self.pot = self.bets.dtype.type(0)
+		self.high_bet = self.minimum_raise_value
+		self.count_players()
+		self.active_moves = None
+
+		if self.subscribers[GameEvent.BLINDS]:
+			self.emit(BlindsEvent(self.hand, self.dealer_idx, self.small_blind_idx, self.big_blind_idx, self.small_blind, self.big_blind, self.active_player, self.player_states.copy(), self.credits.copy()))
 	
+	def shuffle_deck(self):
+		""" Deals the cards of a new hand
+
+		A partial Fisher-Yates shuffle that
+		only draws the cards in play: the
+		rest of the deck is never read. The
+		bias of drawing indices from floats
+		is below `2 ** -47`.
+		"""
+
+		deck = self.deck
+		for (idx, size), r in zip(self.deal_ranges, self.rng.random(len(self.deal_ranges)).tolist()):
+			pick = idx + int(r * size)
+			deck[idx], deck[pick] = deck[pick], deck[idx]
+
 	def end_hand(self):
 		""" Called to end the current hand and compute winners """
 
@@ -458,9 +929,9 @@ class Game:
 		self.credits -= self.pending_bets
 
 		self.pending_bets[:] = .0
-		self.minimum_raise_value = .0
-		
-		self.logger.info('Pot value is $%.2f', self.pot)
+		self.minimum_raise_value = self.chip_type(0)
+		self.high_bet = self.pending_bets.dtype.type(0)
+		self.pot = pot = self.bets.sum()
 
 		# Reset payoffs; we only reset them
 		# here so that they are available after
@@ -469,71 +940,49 @@ class Game:
 
 		# Get number of potential winners
 		potential_winners = np.logical_and(self.player_states != PlayerState.BROKEN, self.player_states != PlayerState.FOLDED)
-		num_potential_winners = np.sum(potential_winners)
+		num_potential_winners = self.num_playing_players
 		assert num_potential_winners > 0, 'Invalid state: no potential winner'
+		last_stand = num_potential_winners == 1
 		
-		if num_potential_winners == 1:
+		if last_stand:
 			# Winner takes all
 			winner = np.argmax(potential_winners)
 
 			self.payoffs[winner] = self.pot
 			self.credits[winner] += self.pot
-
-			self.logger.info('Player %d wins by last stand', winner)
 		else:
-			# Make working copy of bets
-			bets = np.copy(self.bets)
-
-			# First compute hand rankings
-			hands = (self.get_hand_for(player) if state == PlayerState.CALLED or state == PlayerState.ALL_IN else [] for player, state in enumerate(self.player_states))
-			hand_rankings = list(map(eval_hand, hands))
-			none_ranking = (HandRanking.NONE, [])
-
-			self.logger.debug('Final hands: %s', hands)
-
-			# Sort players by lowest bets and generate allins iterator
-			sorted_players = np.argsort(bets)
-			showdown = (player for player in sorted_players if self.player_states[player] == PlayerState.CALLED or self.player_states[player] == PlayerState.ALL_IN)
-			
-			for player in showdown:
-				if np.all(bets <= .0): break # Nothing left to split
-				if num_potential_winners == 1:
-					# Player must be potential winner
-					self.payoffs[player] += np.sum(bets)
-					self.logger.info('Player %d wins by last stand', player)
-
-					break
-
-				# Get max bet for this player
-				max_bet = bets[player]
-				max_bets = np.clip(bets, .0, max_bet)
-				
-				# Get hand winners and distribute wins
-				onehot, winners = compare_rankings(hand_rankings)
-				winning_hands = (hand_rankings[winner] for winner in winners)
-
-				if len(winners) == 1: self.payoffs[winners] += np.sum(max_bets)
-				else: self.payoffs += np.sum(max_bets) * np.array(onehot) / np.sum(onehot)
-
-				self.logger.debug('Hand rankings: %s', hand_rankings)
-				self.logger.info('Player(s) %s wins with %s', winners, ', '.join([HandRanking.as_string[ranking] for ranking, kickers in winning_hands]))
-
-				# Reset player hand and subtract max bets
-				hand_rankings[player] = none_ranking
-				bets -= max_bets
-
-				num_potential_winners -= 1
+			# First compute hand strengths; when
+			# chips are counted, players that are
+			# still active also show their hand,
+			# so that no chip is lost
+			if self.integer_chips: showdown = potential_winners
+			else: showdown = np.logical_or(self.player_states == PlayerState.CALLED, self.player_states == PlayerState.ALL_IN)
+			hands = [self.get_hand_for(player) if in_showdown else [] for player, in_showdown in enumerate(showdown)]
+			hand_strengths = list(map(eval_strength, hands))
+
+			if self.subscribers[GameEvent.SHOWDOWN]: self.emit(ShowdownEvent(self.hand, hands, hand_strengths.copy()))
+
+			# Split side pots; the last showdown
+			# player only takes what's left if no
+			# other player is still active
+			num_showdown = sum(strength > 0 for strength in hand_strengths)
+			self.payoffs[:] = resolve_pots(self.bets, hand_strengths, num_potential_winners == num_showdown, self.dealer_idx + 1)
 
 			# Distribute wins
 			self.credits += self.payoffs
 		
 		# Compute player hand's net value
 		self.payoffs -= self.bets
+		assert not self.integer_chips or np.sum(self.payoffs) == 0, 'Invalid state: chips not conserved'
 
-		self.logger.info('Players\'s net profits: %s', self.payoffs)
+		if self.subscribers[GameEvent.PAYOFF]:
+			# Players that only got back part of
+			# their bets did not win
+			winners = np.flatnonzero(self.payoffs > 0).tolist()
+			self.emit(PayoffEvent(self.hand, pot, winners, self.payoffs.copy(), bool(last_stand)))
 
 		# Update player state
-		self.player_states[self.credits <= .0] = PlayerState.BROKEN
+		self.player_states[self.credits <= 0] = PlayerState.BROKEN
 		
 		# Next hand
 		self.setup_hand()
@@ -555,7 +1004,10 @@ class Game:
 		self.credits -= self.pending_bets
 
 		self.pending_bets[:] = .0
-		self.minimum_raise_value = .0
+		self.minimum_raise_value = self.chip_type(0)
+		self.high_bet = self.pending_bets.dtype.type(0)
+		self.pot = self.bets.sum()
+		self.active_moves = None
 		
 		# Next turn
 		self.turn += 1
@@ -564,14 +1016,13 @@ class Game:
 			self.end_hand()
 			return self.game_over, True, True
 		else:
-			next_turn_players = self.player_states == PlayerState.CALLED
-			num_next_turn_players = np.sum(next_turn_players)
+			next_turn_players = [player for player, state in enumerate(self.player_states.tolist()) if state == PlayerState.CALLED]
 
-			if num_next_turn_players > 1:
+			if len(next_turn_players) > 1:
 				# Reset states
-				self.player_states[next_turn_players] = PlayerState.ACTIVE
+				for player in next_turn_players: self.player_states[player] = PlayerState.ACTIVE
 
-			self.logger.info('Community cards: %s', self.deck[:self.turn + 2].__repr__())
+			if self.subscribers[GameEvent.STREET]: self.emit(StreetEvent(self.hand, self.turn, self.community_cards))
 			self.active_player = self.get_first_playing(self.dealer_idx + 1)
 			return False, False, True
 	
@@ -594,24 +1045,20 @@ class Game:
 			- the turn has ended
 		"""
 
-		# Get number of playing players
-		playing_players = np.logical_and(self.player_states != PlayerState.BROKEN, self.player_states != PlayerState.FOLDED)
-		num_playing_players = np.sum(playing_players)
-
-		if num_playing_players > 1:
+		if self.num_playing_players > 1:
 			# Proceed normally
 			done = False, False, False
+			states = self.player_states
 			current_player = self.active_player
 			self.active_player = (self.active_player + 1) % self.num_players
 
-			while self.player_states[self.active_player] != PlayerState.ACTIVE:
+			while states[self.active_player] != PlayerState.ACTIVE:
 				if current_player == self.active_player:
 					done = self.next_turn()
 					if done[0]: return done # Game is over
 				else: self.active_player = (self.active_player + 1) % self.num_players
 
-			self.logger.info('It\'s Player %d\'s turn', self.active_player)
-			
+			self.active_moves = None
 			return done
 		else:
 			# One winner takes all
@@ -643,25 +1090,21 @@ class Game:
 		# TODO: Allow for both discrete actions
 		# and continous bets
 
+		self.detach_views()
+
 		if isinstance(action, (int, np.integer)):
-			# TODO: Compute valid actions
-			_, valid_actions = self.get_valid_actions()
-			if not action in valid_actions:
-				self.logger.error('Player %d invalid move: `%s`', self.active_player, PokerMoves.as_string[action])
-				raise ValueError('Player %d invalid move: `%s`' % (self.active_player, PokerMoves.as_string[action]))
+			if not 0 <= action < PokerMoves.NUM_MOVES: raise ValueError('Player %d invalid move %d' % (self.active_player, action))
+			if not self.get_valid_moves()[action]: raise ValueError('Player %d invalid move: `%s`' % (self.active_player, PokerMoves.as_string[action]))
 
-			self.logger.info('High bet is $%.2f', self.high_bet)
-			self.logger.debug('Player %d played action: %s', self.active_player, PokerMoves.as_string[action])
+			high_bet = self.high_bet
 
 			if action == PokerMoves.FOLD:
 				self.player_states[self.active_player] = PlayerState.FOLDED
-				self.logger.info('Player %d folds', self.active_player)
+				self.num_playing_players -= 1
 			elif action == PokerMoves.CHECK:
 				self.player_states[self.active_player] = PlayerState.CALLED
-				self.logger.info('Player %d checks', self.active_player)
 			else:
 				# Call first, always bet something
-				high_bet = self.high_bet
 				bet_value = max(high_bet, self.big_blind)
 				credit = self.credits[self.active_player]
 				self.player_states[self.active_player] = PlayerState.CALLED
@@ -669,31 +1112,29 @@ class Game:
 				if action == PokerMoves.ALL_IN:
 					bet_value = credit
 					self.player_states[self.active_player] = PlayerState.ALL_IN
-					self.logger.info('Player %d goes all-in with $%.2f', self.active_player, bet_value)
 				elif action >= PokerMoves.RAISE_ANY:
 					# Add raise value
 					future_credit = credit - bet_value
-					raise_factor = [0.1, 0.25, 0.5][action - PokerMoves.RAISE_ANY]
-					raise_value = future_credit * raise_factor
+					raise_value = self.compute_raise_value(future_credit, action, self.chip_rounding)
 					bet_value += raise_value
 				
 				if bet_value > high_bet:
 					# We raised the high bet, reset all aclled states to active
-					current_state = self.player_states[self.active_player]
-					self.player_states[self.player_states == PlayerState.CALLED] = PlayerState.ACTIVE
-					self.player_states[self.active_player] = current_state
+					states = self.player_states
+					for player in range(self.num_players):
+						if player != self.active_player and states[player] == PlayerState.CALLED: states[player] = PlayerState.ACTIVE
 
 					# Set minimum raise value
 					self.minimum_raise_value = bet_value - high_bet
-
-					self.logger.info('Player %d raises to $%.2f', self.active_player, bet_value)
-					self.logger.info('Minimum raise value is $%.2f', self.minimum_raise_value)
-				else:
-					# We called the high bet
-					self.logger.info('Player %d called $%.2f', self.active_player, bet_value)
 				
 				# Update pending bets
 				self.pending_bets[self.active_player] = bet_value
+				if bet_value > high_bet: self.high_bet = self.pending_bets[self.active_player]
+
+			self.active_moves = None
+
+			if self.subscribers[GameEvent.ACTION]:
+				self.emit(ActionEvent(self.hand, self.active_player, int(action), self.pending_bets[self.active_player], high_bet, self.minimum_raise_value))
 			
 			# Next player
 			return self.next_player()
@@ -0,0 +1,328 @@
+import os
+import numpy as np
+from typing import Generator, Tuple, Union
+from .game import Game
+from .cards import Card
+from .enums import GameEvent
+
+# Magic bytes and version of the file format
+HISTORY_MAGIC = b'PKRH'
+HISTORY_VERSION = 1
+
+# Header of a history file, padded to 16
+# bytes
+HEADER_DTYPE = np.dtype([
+	('magic', 'S4'),
+	('version', '<u2'),
+	('num_players', '<u2'),
+	('max_actions', '<u2'),
+	('reserved', 'V6')
+])
+
+def get_record_dtype(num_players: int, max_actions: int) -> np.dtype:
+	""" Returns the fixed-width record type of a hand
+
+	Fields are:
+	- `hand`, index of the hand in its
+		game;
+	- `deck`, ids of the cards in deck
+		order;
+	- `dealer`, `small_blind_idx` and
+		`big_blind_idx`;
+	- `small_blind` and `big_blind`;
+	- `player_states` and `credits`, the
+		state of each player when the hand
+		starts, before the blinds;
+	- `num_actions`, the number of valid
+		entries of `actions` and `bets`;
+	- `actions`, the actions performed;
+	- `players`, who performed each
+		action;
+	- `bets`, the pending bet of the player
+		after each action;
+	- `payoffs`, the net profit of each
+		player.
+	"""
+
+	return np.dtype([
+		('hand', '<i4'),
+		('deck', 'u1', (52,)),
+		('dealer', 'u1'),
+		('small_blind_idx', 'u1'),
+		('big_blind_idx', 'u1'),
+		('small_blind', '<f8'),
+		('big_blind', '<f8'),
+		('player_states', 'u1', (num_players,)),
+		('credits', '<f8', (num_players,)),
+		('num_actions', '<u2'),
+		('actions', 'u1', (max_actions,)),
+		('players', 'u1', (max_actions,)),
+		('bets', '<f8', (max_actions,)),
+		('payoffs', '<f8', (num_players,))
+	])
+
+class HandRecorder:
+	""" Appends the hands played by a game to a binary file
+
+	The file starts with a small header,
+	followed by one fixed-width record
+	for each completed hand. Hands that
+	are interrupted by a reset are not
+	recorded.
+
+	Usage
+	-----
+
+	```python
+	game = Game(num_players=4)
+	with HandRecorder('hands.bin', game) as recorder:
+		for episode in range(1000):
+			game.reset()
+			while not game.game_over: game.step(agent(game.active_state))
+	```
+	"""
+
+	def __init__(self, path: str, game: Game=None, **config):
+		""" Opens a history file for appending
+
+		Params
+		------
+		path : str
+			Path of the file; the header is
+			written if the file is empty.
+		game : Game
+			If given, the game to record.
+		num_players : int
+			Number of players; defaults to
+			that of `game`.
+		max_actions : int
+			Maximum number of actions per
+			hand; defaults to 64.
+		buffer_size : int
+			Number of hands buffered before
+			they are written; defaults to
+			1024.
+		"""
+
+		self.num_players: int = config.get('num_players', game.num_players if game is not None else 4)
+		self.max_actions: int = config.get('max_actions', 64)
+		self.dtype = get_record_dtype(self.num_players, self.max_actions)
+		self.buffer = np.zeros((config.get('buffer_size', 1024),), dtype=self.dtype)
+		self.size = 0
+		self.record = None
+		self.game = None
+
+		self.file = open(path, 'ab')
+		if self.file.tell() == 0:
+			header = np.zeros((), dtype=HEADER_DTYPE)
+			header['magic'] = HISTORY_MAGIC
+			header['version'] = HISTORY_VERSION
+			header['num_players'] = self.num_players
+			header['max_actions'] = self.max_actions
+			self.file.write(header.tobytes())
+		else:
+			# Check that the header matches
+			with open(path, 'rb') as f: header = np.frombuffer(f.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE)[0]
+			if header['magic'] != HISTORY_MAGIC or header['num_players'] != self.num_players or header['max_actions'] != self.max_actions:
+				raise ValueError('Incompatible history file `%s`' % path)
+
+		if game is not None: self.attach(game)
+
+	def attach(self, game: Game):
+		""" Starts recording the hands of `game` """
+
+		assert game.num_players == self.num_players, 'Invalid number of players'
+
+		self.detach()
+		self.game = game
+		game.subscribe(self, (GameEvent.DEAL, GameEvent.BLINDS, GameEvent.ACTION, GameEvent.PAYOFF))
+
+	def detach(self):
+		""" Stops recording """
+
+		if self.game is not None: self.game.unsubscribe(self)
+		self.game = None
+		self.record = None
+
+	def __call__(self, event: tuple):
+		""" Handles a game event """
+
+		if event.kind == GameEvent.DEAL:
+			# Start a new record
+			self.buffer[self.size] = 0
+			self.record = record = self.buffer[self.size]
+			record['hand'] = event.hand
+			record['deck'] = [card.id for card in self.game.deck]
+			record['player_states'] = self.game.player_states
+			record['credits'] = self.game.credits
+		elif self.record is None: return
+		elif event.kind == GameEvent.BLINDS:
+			record = self.record
+			record['dealer'] = event.dealer
+			record['small_blind_idx'] = event.small_blind_idx
+			record['big_blind_idx'] = event.big_blind_idx
+			record['small_blind'] = event.small_blind
+			record['big_blind'] = event.big_blind
+		elif event.kind == GameEvent.ACTION:
+			record = self.record
+			idx = record['num_actions']
+			if idx == self.max_actions: raise ValueError('Hand %d exceeds %d actions; increase `max_actions`' % (event.hand, self.max_actions))
+
+			record['actions'][idx] = event.action
+			record['players'][idx] = event.player
+			record['bets'][idx] = event.bet
+			record['num_actions'] = idx + 1
+		elif event.kind == GameEvent.PAYOFF:
+			self.record['payoffs'] = event.payoffs
+			self.record = None
+			self.size += 1
+			if self.size == len(self.buffer): self.flush()
+
+	def flush(self):
+		""" Writes the buffered hands to the file """
+
+		self.file.write(self.buffer[:self.size].tobytes())
+		self.file.flush()
+
+		# The record being filled, if any, is
+		# moved to the front of the buffer
+		if self.record is not None:
+			self.buffer[0] = self.record
+			self.record = self.buffer[0]
+
+		self.size = 0
+
+	def close(self):
+		""" Flushes and closes the file """
+
+		if self.file.closed: return
+
+		self.detach()
+		self.flush()
+		self.file.close()
+
+	def __enter__(self) -> 'HandRecorder':
+		"""  """
+
+		return self
+
+	def __exit__(self, *args):
+		"""  """
+
+		self.close()
+
+class HandHistory:
+	""" Memory-mapped reader of a hand history file
+
+	Records are not loaded in memory;
+	indexing the history or accessing a
+	column returns a view of the mapped
+	file.
+
+	Usage
+	-----
+
+	```python
+	history = HandHistory('hands.bin')
+	print(len(history), np.mean(history['payoffs'], axis=0))
+
+	for state, action in history.replay(42):
+		print(state.player, action)
+	```
+	"""
+
+	def __init__(self, path: str):
+		""" Maps a history file """
+
+		header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+		if len(header) == 0 or header[0]['magic'] != HISTORY_MAGIC: raise ValueError('Invalid history file `%s`' % path)
+		if header[0]['version'] != HISTORY_VERSION: raise ValueError('Unsupported history version %d' % header[0]['version'])
+
+		self.num_players = int(header[0]['num_players'])
+		self.max_actions = int(header[0]['max_actions'])
+		self.dtype = get_record_dtype(self.num_players, self.max_actions)
+
+		# Ignore trailing partial records
+		num_records = (os.path.getsize(path) - HEADER_DTYPE.itemsize) // self.dtype.itemsize
+		if num_records > 0: self.records = np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER_DTYPE.itemsize, shape=(num_records,))
+		else: self.records = np.zeros((0,), dtype=self.dtype)
+
+	def __len__(self) -> int:
+		"""  """
+
+		return len(self.records)
+
+	def __getitem__(self, key: Union[int, slice, str]) -> np.ndarray:
+		""" Returns a record, a slice of records or a column """
+
+		return self.records[key]
+
+	def __iter__(self) -> Generator[np.void, None, None]:
+		"""  """
+
+		return iter(self.records)
+
+	def get_deck(self, idx: int) -> list:
+		""" Returns the deck of a hand as a list of cards """
+
+		return [Card((int(card_id) % 13, int(card_id) // 13)) for card_id in self.records[idx]['deck']]
+
+	def replay(self, idx: int, game: Game=None) -> Generator[Tuple[Game.StateView, int], None, None]:
+		""" Replays a hand through `Game.step`
+
+		Params
+		------
+		idx : int
+			Index of the hand.
+		game : Game
+			The game used to replay the hand;
+			a new game is created if not
+			given. Its state is overwritten.
+
+		Returns
+		-------
+		generator
+			Yields the active state and the
+			recorded action, before each
+			action is performed. Once the hand
+			is over, the payoffs are checked
+			against the record.
+		"""
+
+		record = self.records[idx]
+		actions = record['actions'][:record['num_actions']]
+		players = record['players'][:record['num_actions']]
+		if game is None: game = Game(num_players=self.num_players)
+		assert game.num_players == self.num_players, 'Invalid number of players'
+
+		# Restore the state at the start of
+		# the hand
+		game.detach_views()
+		game.big_blind = game.chip_type(record['big_blind'])
+		game.small_blind = game.chip_type(record['small_blind'])
+		game.credits[:] = record['credits']
+		game.player_states[:] = record['player_states']
+		game.dealer_idx = (int(record['dealer']) - 1) % self.num_players
+		game.hand = int(record['hand']) - 1
+
+		# The payoffs are overwritten if the
+		# last step also ends the next hand
+		payoffs = []
+		callback = lambda event: payoffs.append(event.payoffs) if event.hand == record['hand'] else None
+		game.subscribe(callback, (GameEvent.PAYOFF,))
+
+		try:
+			game.setup_hand(self.get_deck(idx))
+
+			# A hand set up while `next_player`
+			# is looking for the next active
+			# player continues from there
+			if len(actions) == 0 or game.active_player != players[0]: game.next_player()
+
+			for action, player in zip(actions, players):
+				assert game.active_player == player, 'Replay diverged from record'
+				yield game.active_state, int(action)
+				game.step(int(action))
+		finally: game.unsubscribe(callback)
+
+		assert len(payoffs) == 1 and np.allclose(payoffs[0], record['payoffs']), 'Replay diverged from record'
@@ -0,0 +1,361 @@
+import itertools
+import numpy as np
+from typing import List, Tuple, Dict, NamedTuple, Union
+from .cards import Card, get_card_ids
+
+# Number of cards dealt in each round,
+# i.e. hole cards, flop, turn and river
+ROUND_SIZES = (2, 3, 1, 1)
+
+# Round of each card position
+_CARD_ROUNDS = [round for round, size in enumerate(ROUND_SIZES) for _ in range(size)]
+
+# Turn of the game, given the number of
+# cards of the hand
+_NUM_CARDS_TURN = {2: 0, 5: 1, 6: 2, 7: 3}
+
+# Bits used by each round in a shape
+# code and by a suit index in a key
+_SHAPE_BITS = 2
+_INDEX_BITS = 40
+
+def _comb(n: int, k: int) -> int:
+	""" Returns the binomial coefficient of `n` and `k`, 0 if `k > n`; `math.comb` needs Python 3.8 """
+
+	if k < 0 or k > n: return 0
+
+	k = min(k, n - k)
+	total = 1
+	for idx in range(1, k + 1): total = total * (n - k + idx) // idx
+
+	return total
+
+# Lookup tables
+_POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << 13)], dtype=np.int64)
+_LOWEST_RANK = np.array([(mask & -mask).bit_length() - 1 for mask in range(1 << 13)], dtype=np.int64)
+_COMB = np.array([[_comb(n, k) for k in range(14)] for n in range(14)], dtype=np.int64)
+
+class _TurnTables(NamedTuple):
+	""" Index tables of a turn """
+
+	size: int
+	configs: List[Tuple[int, ...]]
+	config_index: Dict[Tuple[int, ...], int]
+	offsets: np.ndarray
+	positions: np.ndarray
+	position_lists: List[List[Tuple[int, int, int]]]
+	config_keys: np.ndarray
+	config_order: np.ndarray
+
+def _get_shape_code(shape: Tuple[int, ...]) -> int:
+	""" Encodes the number of cards of a suit in each round """
+
+	return sum(size << (_SHAPE_BITS * round) for round, size in enumerate(shape))
+
+def _get_shape(code: int, num_rounds: int) -> Tuple[int, ...]:
+	""" Decodes a shape code """
+
+	return tuple((code >> (_SHAPE_BITS * round)) & ((1 << _SHAPE_BITS) - 1) for round in range(num_rounds))
+
+def _get_num_suit_indices(shape: Tuple[int, ...]) -> int:
+	""" Returns the number of rank configurations of a suit with `shape` """
+
+	used = 0
+	total = 1
+	for size in shape:
+		total *= _comb(13 - used, size)
+		used += size
+
+	return total
+
+def _build_tables(turn: int) -> _TurnTables:
+	""" Builds the index tables of a turn
+
+	A configuration is the sorted list of
+	the shape codes of the four suits.
+	Hands with the same configuration are
+	assigned a contiguous range of
+	indices; within the range, suits with
+	the same shape form a group, and the
+	index is a mixed radix number whose
+	digits are the multiset indices of
+	the suit indices of each group.
+	"""
+
+	num_rounds = turn + 1
+
+	# Enumerate all the ways to distribute
+	# the cards of each round among suits
+	distributions = [[split for split in itertools.product(range(size + 1), repeat=4) if sum(split) == size] for size in ROUND_SIZES[:num_rounds]]
+	configs = set()
+	for splits in itertools.product(*distributions):
+		shapes = zip(*splits)
+		configs.add(tuple(sorted((_get_shape_code(shape) for shape in shapes), reverse=True)))
+
+	configs = sorted(configs)
+	offsets = np.zeros((len(configs) + 1,), dtype=np.int64)
+	positions = np.zeros((len(configs), 4, 3), dtype=np.int64)
+
+	for config_idx, config in enumerate(configs):
+		# Split suits in groups of equal
+		# shape
+		groups = [(code, len(list(suits))) for code, suits in itertools.groupby(config)]
+		counts = [_comb(_get_num_suit_indices(_get_shape(code, num_rounds)) + size - 1, size) for code, size in groups]
+
+		suit = 0
+		for group, (code, size) in enumerate(groups):
+			multiplier = int(np.prod(counts[group + 1:], dtype=np.int64))
+			for position in range(size):
+				positions[config_idx, suit] = size, position, multiplier
+				suit += 1
+
+		offsets[config_idx + 1] = offsets[config_idx] + int(np.prod(counts, dtype=np.int64))
+
+	# Keys used to search configurations
+	# in batches
+	config_keys = np.array([_get_config_key(config) for config in configs], dtype=np.int64)
+	config_order = np.argsort(config_keys)
+
+	return _TurnTables(
+		size=int(offsets[-1]),
+		configs=configs,
+		config_index={config: idx for idx, config in enumerate(configs)},
+		offsets=offsets,
+		positions=positions,
+		position_lists=[[tuple(suit) for suit in config] for config in positions.tolist()],
+		config_keys=config_keys[config_order],
+		config_order=config_order
+	)
+
+def _get_config_key(codes) -> int:
+	""" Packs the four shape codes of a configuration """
+
+	return (codes[0] << 24) | (codes[1] << 16) | (codes[2] << 8) | codes[3]
+
+def _get_colex(mask: int, used: int) -> int:
+	""" Colex index of a set of ranks among the ranks not in `used` """
+
+	idx = 0
+	count = 0
+	while mask:
+		low = mask & -mask
+		count += 1
+		idx += _comb(low.bit_length() - 1 - bin(used & (low - 1)).count('1'), count)
+		mask ^= low
+
+	return idx
+
+def _get_ranks(idx: int, size: int, used: int) -> int:
+	""" Inverse of `_get_colex`, returns the mask of ranks """
+
+	free = [rank for rank in range(13) if not used >> rank & 1]
+	mask = 0
+	for count in range(size, 0, -1):
+		position = count - 1
+		while _comb(position + 1, count) <= idx: position += 1
+		idx -= _comb(position, count)
+		mask |= 1 << free[position]
+
+	return mask
+
+_TABLES = [_build_tables(turn) for turn in range(len(ROUND_SIZES))]
+
+def get_index_size(turn: int) -> int:
+	""" Returns the number of canonical hands at `turn` """
+
+	return _TABLES[turn].size
+
+def index_hand(player_cards: List[Union[Card, int]], community_cards: List[Union[Card, int]]=()) -> int:
+	""" Returns the canonical index of a hand
+
+	Hands that only differ by a
+	permutation of the suits have the
+	same index; indices of each turn are
+	dense, in the range
+	`[0, get_index_size(turn))`. Only the
+	set of cards dealt in each round
+	matters, not their order.
+
+	Params
+	------
+	player_cards : list of cards
+		The two hole cards, as `Card`
+		objects or card ids.
+	community_cards : list of cards
+		Zero, three, four or five community
+		cards; the turn is inferred from
+		their number.
+
+	Returns
+	-------
+	int
+		The index of the hand.
+	"""
+
+	ids = get_card_ids(player_cards) + get_card_ids(community_cards)
+	turn = _NUM_CARDS_TURN[len(ids)]
+	tables = _TABLES[turn]
+
+	# Ranks of each suit in each round
+	masks = [[0] * (turn + 1) for _ in range(4)]
+	for position, card in enumerate(ids): masks[card // 13][_CARD_ROUNDS[position]] |= 1 << (card % 13)
+
+	keys = []
+	for suit_masks in masks:
+		code = idx = used = 0
+		for round, mask in enumerate(suit_masks):
+			size = bin(mask).count('1')
+			idx = idx * _comb(13 - bin(used).count('1'), size) + _get_colex(mask, used)
+			code |= size << (_SHAPE_BITS * round)
+			used |= mask
+
+		keys.append((code, idx))
+
+	keys.sort(reverse=True)
+	config = tables.config_index[tuple(code for code, _ in keys)]
+
+	index = int(tables.offsets[config])
+	for (_, idx), (size, position, multiplier) in zip(keys, tables.position_lists[config]):
+		index += _comb(idx + size - 1 - position, size - position) * multiplier
+
+	return index
+
+def unindex_hand(index: int, turn: int) -> Tuple[List[Card], List[Card]]:
+	""" Returns the canonical hand with the given index
+
+	Params
+	------
+	index : int
+		The index of the hand.
+	turn : int
+		The turn of the hand, i.e. 0 for
+		preflop, 1 for the flop, 2 for the
+		turn and 3 for the river.
+
+	Returns
+	-------
+	tuple
+		The player cards and the community
+		cards of a hand with that index.
+	"""
+
+	tables = _TABLES[turn]
+	assert 0 <= index < tables.size, 'Invalid hand index'
+
+	num_rounds = turn + 1
+	config = int(np.searchsorted(tables.offsets, index, side='right')) - 1
+	codes = tables.configs[config]
+	index -= int(tables.offsets[config])
+
+	# Decode the multiset index of each group
+	suit_indices = [0] * 4
+	suit = 3
+	while suit >= 0:
+		size, _, multiplier = (int(value) for value in tables.positions[config, suit])
+		start = suit - size + 1
+		count = _comb(_get_num_suit_indices(_get_shape(codes[suit], num_rounds)) + size - 1, size)
+		rank = index // multiplier % count
+		index -= rank * multiplier
+
+		# Colex unrank, positions are stored
+		# in descending order
+		for position in range(size):
+			k = size - position
+			value = k - 1
+			while _comb(value + 1, k) <= rank: value += 1
+			rank -= _comb(value, k)
+			suit_indices[start + position] = value - (k - 1)
+
+		suit = start - 1
+
+	# Decode the ranks of each suit
+	rounds = [[] for _ in range(num_rounds)]
+	for suit, (code, idx) in enumerate(zip(codes, suit_indices)):
+		shape = _get_shape(code, num_rounds)
+		radices = []
+		used = 0
+		for size in shape:
+			radices.append(_comb(13 - used, size))
+			used += size
+
+		digits = []
+		for radix in reversed(radices):
+			digits.append(idx % radix)
+			idx //= radix
+
+		used = 0
+		for round, (size, digit) in enumerate(zip(shape, reversed(digits))):
+			mask = _get_ranks(digit, size, used)
+			rounds[round] += [Card((rank, suit)) for rank in range(13) if mask >> rank & 1]
+			used |= mask
+
+	cards = [card for round in rounds for card in round]
+	return cards[:2], cards[2:]
+
+def _comb_small(n: np.ndarray, k: np.ndarray) -> np.ndarray:
+	""" Vectorized binomial coefficient for `k <= 4` """
+
+	out = np.ones_like(n)
+	for i in range(4): out = np.where(i < k, out * (n - i) // (i + 1), out)
+	return out
+
+def index_hands_batch(cards: np.ndarray) -> np.ndarray:
+	""" Returns the canonical indices of many hands
+
+	Params
+	------
+	cards : numpy array
+		An array of card ids with shape
+		`(..., K)`, where `K` is 2, 5, 6 or
+		7; the first two cards of each hand
+		are the hole cards.
+
+	Returns
+	-------
+	numpy array
+		An array of indices with shape
+		`(...)`, as returned by
+		`index_hand`.
+	"""
+
+	cards = np.asarray(cards, dtype=np.int64)
+	shape = cards.shape[:-1]
+	cards = cards.reshape(-1, cards.shape[-1])
+	turn = _NUM_CARDS_TURN[cards.shape[1]]
+	tables = _TABLES[turn]
+	rows = np.arange(len(cards))
+
+	# Ranks of each suit in each round
+	masks = np.zeros((len(cards), 4, turn + 1), dtype=np.int64)
+	for position in range(cards.shape[1]):
+		masks[rows, cards[:, position] // 13, _CARD_ROUNDS[position]] |= 1 << (cards[:, position] % 13)
+
+	codes = np.zeros((len(cards), 4), dtype=np.int64)
+	indices = np.zeros((len(cards), 4), dtype=np.int64)
+	used = np.zeros((len(cards), 4), dtype=np.int64)
+	for round in range(turn + 1):
+		mask = masks[..., round]
+		size = _POPCOUNT[mask]
+
+		# Colex index among unused ranks, one
+		# rank at a time
+		colex = np.zeros_like(mask)
+		remaining = mask.copy()
+		for count in range(1, ROUND_SIZES[round] + 1):
+			low = remaining & -remaining
+			rank = _LOWEST_RANK[remaining]
+			colex += np.where(low > 0, _COMB[np.maximum(rank - _POPCOUNT[used & (low - 1)], 0), count], 0)
+			remaining ^= low
+
+		indices = indices * _COMB[13 - _POPCOUNT[used], size] + colex
+		codes |= size << (_SHAPE_BITS * round)
+		used |= mask
+
+	# Sort suits and find configuration
+	keys = -np.sort(-((codes << _INDEX_BITS) | indices), axis=1)
+	codes, indices = keys >> _INDEX_BITS, keys & ((1 << _INDEX_BITS) - 1)
+	config = tables.config_order[np.searchsorted(tables.config_keys, _get_config_key(codes.T))]
+
+	size, position, multiplier = np.moveaxis(tables.positions[config], 2, 0)
+	out = tables.offsets[config] + np.sum(_comb_small(indices + size - 1 - position, size - position) * multiplier, axis=1)
+	return out.reshape(shape)
@@ -1,9 +1,319 @@
+import numpy as np
 from typing import List, Tuple
 from itertools import islice
 from functools import reduce
 from .cards import Card
 from .enums import HandRanking, CardRank, CardSuit
 
+# Hand strengths are integers where the
+# hand category is packed above the
+# kickers, such that a stronger hand
+# always has a greater strength; an
+# empty hand has strength zero
+KICKERS_BITS = 20
+KICKERS_MASK = (1 << KICKERS_BITS) - 1
+
+# One prime for each card rank (i.e. `Card.rank`
+# in [1, 13]); the product of the primes of a
+# hand identifies its multiset of ranks
+RANK_PRIMES = [1, 2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+# Lookup tables indexed by `Card.value`
+_VALUE_PRIME = [0] * 64
+_VALUE_SUIT = [0] * 64
+_VALUE_BIT = [0] * 64
+
+for _suit in range(CardSuit.NUM_SUITS):
+	for _rank in range(CardRank.NUM_RANKS):
+		_value = (_suit << 4) | _rank
+		_VALUE_PRIME[_value] = RANK_PRIMES[_rank or CardRank.ACE]
+		_VALUE_SUIT[_value] = 1 << (_suit << 2)
+		_VALUE_BIT[_value] = 1 << (_rank or CardRank.ACE)
+
+# Suit counters start from 3, so that
+# the high bit of a counter is set as
+# soon as it reaches five cards
+_SUIT_COUNTERS = 0x3333
+_SUIT_FLUSH = 0x8888
+
+def _pack_strength(ranking: int, kickers: List[int]) -> int:
+	""" Packs a hand ranking and its kickers in a single integer """
+
+	value = 0
+	for idx, kicker in enumerate(kickers[:5]):
+		value |= kicker << (16 - (idx << 2))
+	
+	return ((HandRanking.NONE - ranking) << KICKERS_BITS) | value
+
+def _eval_counts(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+	""" Evaluates hands given the number of cards of each rank
+	
+	Flushes are not taken into account.
+
+	Params
+	------
+	counts : numpy array
+		An array with shape `(N, 14)` with
+		the number of cards of each rank
+		(i.e. `Card.rank`) in each hand.
+	
+	Returns
+	-------
+	tuple
+		A tuple where the first element
+		is the hand ranking of each hand
+		and the second element is an
+		array with shape `(N, 5)` with the
+		kickers of each hand, padded with
+		zeros.
+	"""
+
+	ranks = np.arange(CardRank.ACE + 1)
+	
+	# Highest rank of straights; the ace
+	# also counts as the lowest rank
+	mask = np.sum((counts > 0).astype(np.int64) << ranks, axis=1)
+	mask |= (mask >> CardRank.ACE) & 0x1
+	straight = np.zeros(len(counts), dtype=np.int64)
+	for high in range(CardRank.FIVE, CardRank.ACE + 1):
+		straight[(mask >> (high - 4)) & 0x1f == 0x1f] = high
+	
+	# Sort ranks by number of cards first,
+	# then by rank
+	groups = -np.sort(-np.where(counts > 0, (counts << 4) | ranks, 0), axis=1)[:, :5]
+	g = groups & 0xf
+	c0, c1 = groups[:, 0] >> 4, groups[:, 1] >> 4
+
+	rankings = np.full(len(counts), HandRanking.HIGH)
+	kickers = g.copy()
+
+	pair = c0 == 2
+	rankings[pair] = HandRanking.PAIR
+	kickers[pair, 4] = 0
+
+	two_pair = pair & (c1 == 2)
+	rankings[two_pair] = HandRanking.TWO_PAIR
+	kickers[two_pair, 2] = np.maximum(g[two_pair, 2], g[two_pair, 3])
+	kickers[two_pair, 3:] = 0
+
+	tris = c0 == 3
+	rankings[tris] = HandRanking.TRIS
+	kickers[tris, 3:] = 0
+
+	straights = (straight > 0) & (c0 < 4) & ~(tris & (c1 >= 2))
+	rankings[straights] = HandRanking.STRAIGHT
+	kickers[straights, 0] = straight[straights]
+	kickers[straights, 1:] = 0
+
+	full = tris & (c1 >= 2)
+	rankings[full] = HandRanking.FULL
+	kickers[full, 2:] = 0
+
+	poker = c0 == 4
+	rankings[poker] = HandRanking.POKER
+	kickers[poker, 1] = np.maximum(g[poker, 1], g[poker, 2])
+	kickers[poker, 2:] = 0
+
+	return rankings, kickers
+
+def _pack_strengths(rankings: np.ndarray, kickers: np.ndarray) -> np.ndarray:
+	""" Vectorized version of `_pack_strength` """
+
+	shifts = np.arange(16, -4, -4)
+	return ((HandRanking.NONE - rankings) << KICKERS_BITS) | np.sum(kickers << shifts, axis=1)
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+	""" Builds the flush table and the rank-product table
+	
+	The flush table maps the bitmask of
+	the ranks of the cards of the flush
+	suit to the strength of the hand;
+	the rank-product table maps the
+	product of the rank primes of any
+	hand of five, six or seven cards
+	to the strength of the hand,
+	assuming that there is no flush
+	
+	Returns
+	-------
+	tuple
+		A tuple with the flush table, the
+		sorted rank products and the
+		corresponding strengths.
+	"""
+
+	ranks = np.arange(CardRank.ACE + 1)
+
+	# Flush table, for all masks with at
+	# least five ranks
+	masks = np.arange(1 << (CardRank.ACE + 1))
+	counts = (masks[:, None] >> ranks) & 0x1
+	counts[:, 0] = 0
+	rankings, kickers = _eval_counts(counts)
+	rankings[rankings == HandRanking.HIGH] = HandRanking.FLUSH
+	rankings[rankings == HandRanking.STRAIGHT] = HandRanking.STRAIGHT_FLUSH
+	flushes = np.where(np.sum(counts, axis=1) >= 5, _pack_strengths(rankings, kickers), 0)
+
+	# Enumerate all multisets of up to
+	# seven ranks, with at most four
+	# cards per rank
+	counts = np.zeros((1, CardRank.ACE + 1), dtype=np.int64)
+	for rank in range(1, CardRank.ACE + 1):
+		counts = np.repeat(counts, 5, axis=0)
+		counts[:, rank] = np.tile(np.arange(5), len(counts) // 5)
+		counts = counts[np.sum(counts, axis=1) <= 7]
+	
+	counts = counts[np.sum(counts, axis=1) >= 5]
+	products = np.prod(np.array(RANK_PRIMES, dtype=np.int64) ** counts, axis=1)
+	strengths = _pack_strengths(*_eval_counts(counts))
+
+	order = np.argsort(products)
+	return flushes, products[order], strengths[order]
+
+_FLUSH_STRENGTHS, _RANK_PRODUCTS, _PRODUCT_STRENGTHS = _build_tables()
+_FLUSH_TABLE = _FLUSH_STRENGTHS.tolist()
+_PRODUCT_TABLE = dict(zip(_RANK_PRODUCTS.tolist(), _PRODUCT_STRENGTHS.tolist()))
+
+# Lookup tables indexed by `Card.id`
+_ID_VALUES = np.array([(suit << 4) | rank for suit in range(CardSuit.NUM_SUITS) for rank in range(CardRank.NUM_RANKS)])
+_ID_PRIME = np.array(_VALUE_PRIME, dtype=np.int64)[_ID_VALUES]
+_ID_SUIT = np.array(_VALUE_SUIT, dtype=np.int64)[_ID_VALUES]
+_ID_BIT = np.array(_VALUE_BIT, dtype=np.int64)[_ID_VALUES]
+
+def eval_strength(hand: List[Card]) -> int:
+	""" Evaluate hand of cards as a single integer
+
+	Hands of five, six or seven cards are
+	evaluated using precomputed lookup
+	tables.
+
+	Params
+	------
+	hand : list of cards
+		Up to seven cards to evaluate
+		as a poker hand.
+	
+	Returns
+	-------
+	int
+		The strength of the hand; given
+		two hands, the one with the
+		greatest strength wins. Use
+		`get_ranking` to get back the
+		hand ranking and the kickers.
+	"""
+
+	if len(hand) < 5: return get_ranking_value(eval_hand(hand))
+
+	product = 1
+	suits = _SUIT_COUNTERS
+	for card in hand:
+		value = card.value
+		product *= _VALUE_PRIME[value]
+		suits += _VALUE_SUIT[value]
+	
+	flush = suits & _SUIT_FLUSH
+	if flush:
+		# At most one suit can have five
+		# cards or more
+		suit = (flush.bit_length() - 1) >> 2
+		mask = 0
+		for card in hand:
+			if card.value >> 4 == suit: mask |= _VALUE_BIT[card.value]
+		
+		# May be zero if the hand has
+		# duplicate cards
+		strength = _FLUSH_TABLE[mask]
+		if strength: return strength
+	
+	return _PRODUCT_TABLE[product]
+
+def eval_hands_batch(cards: np.ndarray) -> np.ndarray:
+	""" Evaluate many hands at once
+
+	Vectorized version of `eval_strength`
+	that works on card ids rather than
+	`Card` objects.
+
+	Params
+	------
+	cards : numpy array
+		An integer array with shape
+		`(..., K)` where `K` is five, six
+		or seven, and each element is a
+		card id, as in `Card.id`.
+	
+	Returns
+	-------
+	numpy array
+		An array with shape `(...)` with
+		the strength of each hand, as
+		output by `eval_strength`.
+	"""
+
+	cards = np.asarray(cards)
+	assert 5 <= cards.shape[-1] <= 7, 'Hands must have five to seven cards'
+
+	shape = cards.shape[:-1]
+	cards = cards.reshape(-1, cards.shape[-1])
+
+	# Rank multiset and suit counters
+	products = np.prod(_ID_PRIME[cards], axis=1)
+	suits = _SUIT_COUNTERS + np.sum(_ID_SUIT[cards], axis=1)
+	strengths = _PRODUCT_STRENGTHS[np.searchsorted(_RANK_PRODUCTS, products)]
+
+	flush = suits & _SUIT_FLUSH
+	flushes = np.flatnonzero(flush)
+	if len(flushes):
+		# Compute bitmask of the ranks of
+		# the flush suit
+		flush = flush[flushes]
+		flush_suit = (flush > 0x8).astype(np.int64) + (flush > 0x80) + (flush > 0x800)
+		flush_cards = cards[flushes]
+		bits = np.where(flush_cards // CardRank.NUM_RANKS == flush_suit[:, None], _ID_BIT[flush_cards], 0)
+		flush_strengths = _FLUSH_STRENGTHS[np.bitwise_or.reduce(bits, axis=1)]
+		strengths[flushes] = np.where(flush_strengths > 0, flush_strengths, strengths[flushes])
+	
+	return strengths.reshape(shape)
+
+def compare_hands_batch(cards: np.ndarray) -> np.ndarray:
+	""" Compares many sets of hands at once
+
+	Params
+	------
+	cards : numpy array
+		An integer array with shape
+		`(N, P, K)` with the hands of `P`
+		players for each of `N` showdowns;
+		see `eval_hands_batch`.
+	
+	Returns
+	-------
+	numpy array
+		A boolean array with shape `(N, P)`
+		where winners of each showdown are
+		set to true.
+	"""
+
+	strengths = eval_hands_batch(cards)
+	return strengths == np.max(strengths, axis=-1, keepdims=True)
+
+def get_ranking(strength: int) -> Tuple[int, List[int]]:
+	""" Returns the hand ranking and the kickers of a hand strength, as output by `eval_hand` """
+
+	kickers = []
+	for shift in range(16, -4, -4):
+		kicker = (strength >> shift) & 0xf
+		if not kicker: break
+		kickers.append(kicker)
+	
+	return HandRanking.NONE - (strength >> KICKERS_BITS), kickers
+
+def get_ranking_value(ranking: Tuple[int, List[int]]) -> int:
+	""" Returns the hand strength of a hand ranking with kickers, as output by `eval_hand` """
+
+	return _pack_strength(*ranking)
+
 def eval_hand(hand: List[Card]) -> Tuple[int, List[int]]:
 	""" Evaluate hand of cards
 
@@ -27,7 +337,8 @@ def eval_hand(hand: List[Card]) -> Tuple[int, List[int]]:
 		are returned for a flush.
 	"""
 
-	if not hand: return HandRanking.NONE, []
+	if len(hand) >= 5: return get_ranking(eval_strength(hand))
+	elif not hand: return HandRanking.NONE, []
 	elif len(hand) == 1: return HandRanking.HIGH, [hand[0].rank]
 	elif len(hand) == 2:
 		first, second = hand
@@ -108,7 +419,31 @@ def get_kickers_value(kickers) -> int:
 
 	return reduce(lambda value, kicker: value | (kicker[1] << (kicker[0] << 2)), enumerate(reversed(kickers)), 0)
 
-def compare_rankings(rankings: List[Tuple[int, List[int]]]) -> Tuple[List[int], List[int], Tuple[int, List[int]]]:
+def compare_strengths(strengths: List[int]) -> Tuple[List[int], List[int]]:
+	""" Compares multiple hand strengths
+	
+	Params
+	------
+	`strengths` : list of ints
+		A list of hand strengths, as
+		output by `eval_strength`
+	
+	Returns
+	-------
+	tuple
+		Returns a tuple where:
+		- the first element is a one-hot
+			encoded array of the winners;
+		- the second element is a list
+			with the indices of the winner.
+	"""
+
+	best_strength = max(strengths)
+	onehot = [int(strength == best_strength) for strength in strengths]
+	winners = [idx for idx, strength in enumerate(strengths) if strength == best_strength]
+	return onehot, winners
+
+def compare_rankings(rankings: List[Tuple[int, List[int]]]) -> Tuple[List[int], List[int]]:
 	""" Compares multiple hands
 	
 	Returns the winner and the
@@ -130,34 +465,9 @@ def compare_rankings(rankings: List[Tuple[int, List[int]]]) -> Tuple[List[int],
 			with the indices of the winner.
 	"""
 
-	winners = []
-	best_rank = HandRanking.NONE
-	best_kicker = 0
-	idx = 0
-
-	for rank, kickers in rankings:
-		kicker = get_kickers_value(kickers)
-		if rank < best_rank:
-			# Flush winners
-			best_rank = rank
-			best_kicker = kicker
-			winners = [idx]
-		elif rank == best_rank:
-			if kicker > best_kicker:
-				# Flush winners
-				kicker = best_kicker
-				winners = [idx]
-			elif kicker == best_kicker:
-				# Add winner
-				winners.append(idx)
-		
-		# Next hand
-		idx += 1
-
-	onehot = [int(idx in winners) for idx, _ in enumerate(rankings)]
-	return onehot, winners
+	return compare_strengths([get_ranking_value(ranking) for ranking in rankings])
 
-def compare_hands(hands: List[List[Card]]) -> Tuple[List[int], List[int], Tuple[int, List[int]]]:
+def compare_hands(hands: List[List[Card]]) -> Tuple[List[int], List[int], List[Tuple[int, List[int]]]]:
 	""" Compares multiple hands
 	
 	Returns the winner and the
@@ -185,5 +495,5 @@ def compare_hands(hands: List[List[Card]]) -> Tuple[List[int], List[int], Tuple[
 			for each hand.
 	"""
 
-	rankings = [eval_hand(hand) for hand in hands]
-	return compare_rankings(rankings) + (rankings,)
\ No newline at end of file
+	strengths = [eval_strength(hand) for hand in hands]
+	return compare_strengths(strengths) + ([get_ranking(strength) for strength in strengths],)
\ No newline at end of file
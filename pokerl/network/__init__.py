@@ -1,2 +1,3 @@
 from .server import PokerGameServer
-from .client import PokerGameClient
\ No newline at end of file
+from .async_server import AsyncPokerGameServer
+from .client import PokerGameClient, PokerBatchClient, PokerMultiClient
\ No newline at end of file
@@ -0,0 +1,264 @@
+import asyncio
+from typing import List, Dict, Tuple, Optional
+from .framing import read_message, write_message, run_coroutine
+from .protocol import ProtocolError, encode_ready, encode_state, encode_state_batch, encode_over, decode
+from ..game import Game
+from ..enums import MessageType
+
+class Connection:
+	""" A client connected to the server
+
+	A connection plays one or more seats,
+	possibly at different tables. If the
+	client asked for batches, the states
+	of its seats are collected and sent
+	together when `batch_size` states are
+	pending, or `batch_window` seconds
+	after the first one.
+	"""
+
+	def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, num_seats: int=1, batch_size: int=0, batch_window: float=.005):
+		"""  """
+
+		self.reader = reader
+		self.writer = writer
+		self.addr = writer.get_extra_info('peername')
+		self.num_seats = num_seats
+		self.batch_size = batch_size
+		self.batch_window = batch_window
+		self.closed = False
+
+		# Decisions waiting for an action, by
+		# table and player
+		self.pending: Dict[Tuple[int, int], asyncio.Future] = {}
+		self.batch: List[bytes] = []
+		self.flush_handle: asyncio.TimerHandle = None
+
+	def send(self, message: bytes):
+		""" Writes an encoded message """
+
+		if not self.closed: write_message(self.writer, message)
+
+	async def request(self, table: int, state: Game.StateView) -> int:
+		""" Sends a state and waits for the action of its player
+
+		Raises
+		------
+		ConnectionError
+			If the connection is lost.
+		"""
+
+		if self.closed: raise ConnectionError('Connection closed')
+
+		future = asyncio.get_event_loop().create_future()
+		self.pending[table, state.player] = future
+
+		if self.batch_size > 0:
+			self.batch.append(encode_state(table, state))
+			if len(self.batch) >= self.batch_size: self.flush()
+			elif self.flush_handle is None: self.flush_handle = asyncio.get_event_loop().call_later(self.batch_window, self.flush)
+		else: self.send(encode_state(table, state))
+
+		await self.writer.drain()
+		return await future
+
+	def flush(self):
+		""" Sends the pending batch of states """
+
+		if self.flush_handle is not None:
+			self.flush_handle.cancel()
+			self.flush_handle = None
+
+		if self.batch:
+			self.send(encode_state_batch(self.batch))
+			self.batch = []
+
+	def resolve(self, table: int, player: int, action: int):
+		""" Delivers an action; actions of tables that were dropped are ignored """
+
+		future = self.pending.pop((table, player), None)
+		if future is not None and not future.done(): future.set_result(action)
+
+	async def read_loop(self):
+		""" Reads actions until the connection is closed """
+
+		try:
+			while True:
+				message = decode(await read_message(self.reader))
+				if message.kind == MessageType.ACTION: self.resolve(message.table, message.player, message.value)
+				elif message.kind == MessageType.ACTION_BATCH:
+					for table, player, action in message.value: self.resolve(table, player, action)
+				else: raise ProtocolError('Received unexpected message')
+		except (ConnectionError, ValueError):
+			pass
+		finally: self.close()
+
+	def release(self, table: int, player: int):
+		""" Closes a seat, and the connection after its last seat """
+
+		self.send(encode_over(table, player))
+		self.num_seats -= 1
+		if self.num_seats == 0: self.close()
+
+	def close(self):
+		""" Closes the connection and fails the pending decisions """
+
+		if self.flush_handle is not None: self.flush_handle.cancel()
+		self.closed = True
+		self.writer.close()
+
+		for future in self.pending.values():
+			if not future.done(): future.set_exception(ConnectionError('Connection closed'))
+
+		self.pending.clear()
+
+class AsyncPokerGameServer:
+	""" Hosts many concurrent tables on a single port
+
+	A client first joins with the number
+	of seats it wants to play. Seats wait
+	in a queue and, as soon as there are
+	enough of them, they are seated at a
+	new table, which runs as an asyncio
+	task. Each table plays `num_games`
+	games; the server keeps accepting
+	clients until it is stopped.
+
+	A client that plays many seats can
+	ask for batches: the decisions of all
+	its seats are sent together, so that
+	an agent can evaluate them with a
+	single call, see `PokerBatchClient`.
+
+	Messages use the same protocol of
+	`PokerGameServer`, see
+	`pokerl.network.protocol`, so the
+	same `PokerGameClient` can connect to
+	both.
+
+	Usage
+	-----
+
+	```python
+	server = AsyncPokerGameServer(num_players=4, num_games=10)
+	server.run('localhost', 25560)
+	```
+	"""
+
+	def __init__(self, num_games: Optional[int]=1, batch_window: float=.005, **game_config):
+		""" Creates a new server
+
+		Params
+		------
+		num_games : int
+			Number of games played by each
+			table; if `None`, tables play
+			until one of their players
+			disconnects.
+		batch_window : float
+			Maximum time, in seconds, that a
+			decision waits for other decisions
+			of the same client to fill a batch.
+
+		Other parameters are passed to the
+		`Game` of each table.
+		"""
+
+		self.num_games = num_games
+		self.batch_window = batch_window
+		self.game_config = game_config
+		self.num_players: int = game_config.get('num_players', 4)
+
+		self.waiting: List[Connection] = []
+		self.tables = {}
+		self.next_table = 0
+
+		# Statistics
+		self.games_played = 0
+		self.tables_played = 0
+		self.decisions = 0
+
+	async def start(self, host: str='localhost', port: int=25560, backlog: int=1024) -> asyncio.AbstractServer:
+		""" Starts listening and returns the asyncio server
+
+		Use port 0 to listen on any free
+		port; the actual port is available
+		in the sockets of the returned
+		server.
+		"""
+
+		return await asyncio.start_server(self.handle_client, host, int(port), backlog=backlog, reuse_address=True)
+
+	async def serve_forever(self, host: str='localhost', port: int=25560):
+		""" Runs the server until it is cancelled """
+
+		server = await self.start(host, port)
+		print('server running on %s:%d' % server.sockets[0].getsockname()[:2])
+		try: await asyncio.get_event_loop().create_future()
+		finally:
+			server.close()
+			await server.wait_closed()
+
+	def run(self, host: str='localhost', port: int=25560):
+		""" Runs the server in a new event loop """
+
+		run_coroutine(self.serve_forever(host, port))
+
+	async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		""" Queues the seats of a new client, then reads its actions """
+
+		try:
+			message = decode(await read_message(reader))
+			if message.kind != MessageType.JOIN or message.value[0] == 0: raise ProtocolError('Expected join message')
+		except (ConnectionError, ValueError):
+			writer.close()
+			return
+
+		num_seats, batch_size = message.value
+		connection = Connection(reader, writer, num_seats, batch_size, self.batch_window)
+
+		# Drop clients that left while waiting
+		self.waiting = [seat for seat in self.waiting if not seat.closed]
+		self.waiting += [connection] * num_seats
+
+		while len(self.waiting) >= self.num_players:
+			seats, self.waiting = self.waiting[:self.num_players], self.waiting[self.num_players:]
+			table = self.next_table
+			self.next_table += 1
+			self.tables[table] = asyncio.ensure_future(self.play_table(table, seats))
+
+		await connection.read_loop()
+
+	async def play_table(self, table: int, seats: List[Connection]):
+		""" Plays the games of a table
+
+		If a player disconnects or sends an
+		invalid action the table is closed;
+		so it is if the game fails, without
+		affecting the other tables.
+		"""
+
+		game = Game(**self.game_config)
+		num_games = 0
+
+		try:
+			for player, seat in enumerate(seats): seat.send(encode_ready(table, player, self.num_players))
+
+			while self.num_games is None or num_games < self.num_games:
+				game.reset()
+				game_over = False
+				while not game_over:
+					action = await seats[game.active_player].request(table, game.active_state)
+					game_over, _, _ = game.step(action)
+					self.decisions += 1
+
+				num_games += 1
+				self.games_played += 1
+		except asyncio.CancelledError: raise
+		except Exception:
+			# Drop the table
+			pass
+		finally:
+			for player, seat in enumerate(seats): seat.release(table, player)
+			self.tables_played += 1
+			del self.tables[table]
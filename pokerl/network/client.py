@@ -1,6 +1,11 @@
-import socket, pickle
+import socket
+import asyncio
 import numpy as np
-from ..agents import PokerAgent, RandomAgent
+from typing import Callable, Dict, Tuple
+from .framing import send_message, recv_message, read_message, write_message, run_coroutine
+from .protocol import encode_join, encode_action, encode_action_batch, decode
+from ..enums import MessageType
+from ..agents import PokerAgent, PokerBatchAgent, RandomAgent
 
 class PokerGameClient:
 	"""  """
@@ -12,6 +17,7 @@ class PokerGameClient:
 		self.agent = agent
 
 		self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		self.table = -1
 		self.player = -1
 		self.state = None
 
@@ -20,25 +26,185 @@ class PokerGameClient:
 
 		# Wait for ready state
 		self.sock.connect((host, int(port)))
-		ready_state = self.sock.recv(1024)
-		ready_state: dict= pickle.loads(ready_state)
+		send_message(self.sock, encode_join())
+		ready_state = decode(recv_message(self.sock))
 
-		assert ready_state.get('status') == 'ready', 'Invalid status'
-		self.player = ready_state.get('player', 0)
+		assert ready_state.kind == MessageType.READY, 'Invalid status'
+		self.table = ready_state.table
+		self.player = ready_state.player
 		print('Connnected to %s:%d as player %d' % (host, port, self.player))
 
 		while True:
 			# Receive state from server
-			state = self.sock.recv(4096)
-			state: dict = pickle.loads(state)
-			assert state.get('player') == self.player, 'Received state with wrong player id'
-
-			status = state.get('status', 'playing')
-			if status == 'over': break
-			elif status == 'playing':
-				# Send random action
-				active_state = state.get('active_state')
-				action = self.agent(active_state)
-				action = pickle.dumps((self.player, action))
-				self.sock.sendall(action)
-			else: raise AssertionError('Invalid status')
\ No newline at end of file
+			state = decode(recv_message(self.sock))
+			assert state.player == self.player, 'Received state with wrong player id'
+
+			if state.kind == MessageType.OVER: break
+			elif state.kind == MessageType.STATE:
+				# Send agent action
+				self.state = state.value
+				action = self.agent(self.state)
+				send_message(self.sock, encode_action(self.table, self.player, int(action)))
+			else: raise AssertionError('Invalid status')
+		
+		self.sock.close()
+
+class PokerBatchClient:
+	""" Plays many seats with a single batch agent
+
+	The client joins with `num_seats`
+	seats, possibly at different tables,
+	and asks the server for batches: the
+	decisions of all its seats are
+	collected by the server and the agent
+	is called once for each batch.
+
+	Usage
+	-----
+
+	```python
+	client = PokerBatchClient(agent, num_seats=256, batch_size=64)
+	client.connect('localhost', 25560)
+	```
+	"""
+
+	def __init__(self, agent: PokerBatchAgent, num_seats: int=1, batch_size: int=64):
+		""" Creates a new client
+
+		Params
+		------
+		agent : PokerBatchAgent
+			Called with a list of states,
+			returns the action of each one.
+		num_seats : int
+			Number of seats to play.
+		batch_size : int
+			Maximum number of states in a
+			batch.
+		"""
+
+		assert agent is not None, 'Invalid agent'
+		assert 0 < batch_size and 0 < num_seats < (1 << 16), 'Invalid number of seats'
+		self.agent = agent
+		self.num_seats = num_seats
+		self.batch_size = batch_size
+
+		self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		self.seats: Dict[Tuple[int, int], int] = {}
+		self.num_batches = 0
+		self.num_decisions = 0
+
+	def connect(self, host: str='localhost', port: int=25560):
+		""" Plays until all the seats are closed by the server """
+
+		self.sock.connect((host, int(port)))
+		self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		send_message(self.sock, encode_join(self.num_seats, self.batch_size))
+
+		num_seats = self.num_seats
+		while num_seats > 0:
+			message = decode(recv_message(self.sock))
+
+			if message.kind == MessageType.READY: self.seats[message.table, message.player] = message.value
+			elif message.kind == MessageType.OVER:
+				del self.seats[message.table, message.player]
+				num_seats -= 1
+			elif message.kind == MessageType.STATE_BATCH:
+				# One agent call for the whole batch
+				actions = self.agent([state.value for state in message.value])
+				send_message(self.sock, encode_action_batch([(state.table, state.player, int(action)) for state, action in zip(message.value, actions)]))
+
+				self.num_batches += 1
+				self.num_decisions += len(message.value)
+			else: raise AssertionError('Invalid status')
+
+		self.sock.close()
+
+class PokerMultiClient:
+	""" Plays many seats over a single connection
+
+	The client joins with `num_seats`
+	seats, which the server may place at
+	different tables, and creates a new
+	agent for each seat it receives.
+	States are routed to the agent of
+	their table and seat, and actions are
+	written as soon as they are ready,
+	without waiting for the other seats:
+	many decisions can be in flight on
+	the same connection.
+
+	The client runs on asyncio, so that a
+	single thread can play hundreds of
+	bots; `connect` runs it in a new
+	event loop, `play` can be awaited
+	from a running one.
+
+	Usage
+	-----
+
+	```python
+	client = PokerMultiClient(RandomAgent, num_seats=500)
+	client.connect('localhost', 25560)
+	```
+	"""
+
+	def __init__(self, agent_factory: Callable[[], PokerAgent]=RandomAgent, num_seats: int=1):
+		""" Creates a new client
+
+		Params
+		------
+		agent_factory : callable
+			Called with no arguments when a
+			seat is assigned, returns the
+			agent of that seat.
+		num_seats : int
+			Number of seats to play.
+		"""
+
+		assert agent_factory is not None, 'Invalid agent factory'
+		assert 0 < num_seats < (1 << 16), 'Invalid number of seats'
+		self.agent_factory = agent_factory
+		self.num_seats = num_seats
+
+		# Agents of the open seats, by table
+		# and player
+		self.agents: Dict[Tuple[int, int], PokerAgent] = {}
+		self.num_decisions = 0
+
+	def connect(self, host: str='localhost', port: int=25560):
+		""" Plays until all the seats are closed by the server """
+
+		run_coroutine(self.play(host, port))
+
+	async def play(self, host: str='localhost', port: int=25560):
+		""" Coroutine version of `connect` """
+
+		reader, writer = await asyncio.open_connection(host, int(port))
+		writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		write_message(writer, encode_join(self.num_seats))
+
+		try:
+			num_seats = self.num_seats
+			while num_seats > 0:
+				message = decode(await read_message(reader))
+				seat = message.table, message.player
+
+				if message.kind == MessageType.READY: self.agents[seat] = self.agent_factory()
+				elif message.kind == MessageType.OVER:
+					del self.agents[seat]
+					num_seats -= 1
+				elif message.kind == MessageType.STATE:
+					action = self.agents[seat](message.value)
+					write_message(writer, encode_action(message.table, message.player, int(action)))
+					self.num_decisions += 1
+
+					# Only waits if the server
+					# stopped reading
+					await writer.drain()
+				else: raise AssertionError('Invalid status')
+		finally:
+			writer.close()
+
+			# Python 3.7+
+			if hasattr(writer, 'wait_closed'): await writer.wait_closed()
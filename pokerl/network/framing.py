@@ -0,0 +1,90 @@
+import socket
+import struct
+import asyncio
+
+# Each message is prefixed by its length,
+# as a 4 bytes little-endian integer
+HEADER = struct.Struct('<I')
+
+# Messages larger than this are rejected
+MAX_MESSAGE_SIZE = 1 << 24
+
+def pack_message(payload: bytes) -> bytes:
+	""" Prefixes `payload` with its length """
+
+	assert len(payload) <= MAX_MESSAGE_SIZE, 'Message too large'
+	return HEADER.pack(len(payload)) + payload
+
+def send_message(sock: socket.socket, payload: bytes):
+	""" Sends a framed message on a blocking socket """
+
+	sock.sendall(pack_message(payload))
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+	""" Receives exactly `size` bytes from a blocking socket """
+
+	buffer = bytearray(size)
+	view = memoryview(buffer)
+	received = 0
+	while received < size:
+		num_bytes = sock.recv_into(view[received:])
+		if num_bytes == 0: raise ConnectionError('Connection closed')
+		received += num_bytes
+
+	return bytes(buffer)
+
+def recv_message(sock: socket.socket) -> bytes:
+	""" Receives a framed message from a blocking socket
+
+	Raises
+	------
+	ConnectionError
+		If the connection is closed before
+		the message is complete.
+	"""
+
+	size, = HEADER.unpack(recv_exactly(sock, HEADER.size))
+	if size > MAX_MESSAGE_SIZE: raise ConnectionError('Message too large')
+	return recv_exactly(sock, size)
+
+def write_message(writer: asyncio.StreamWriter, payload: bytes):
+	""" Writes a framed message to an asyncio stream, without draining it """
+
+	writer.write(pack_message(payload))
+
+async def read_message(reader: asyncio.StreamReader) -> bytes:
+	""" Reads a framed message from an asyncio stream
+
+	Raises
+	------
+	ConnectionError
+		If the stream ends before the
+		message is complete.
+	"""
+
+	try:
+		size, = HEADER.unpack(await reader.readexactly(HEADER.size))
+		if size > MAX_MESSAGE_SIZE: raise ConnectionError('Message too large')
+		return await reader.readexactly(size)
+	except asyncio.IncompleteReadError as e: raise ConnectionError('Connection closed') from e
+
+def run_coroutine(coroutine):
+	""" Runs a coroutine in a new event loop and returns its result
+
+	Like `asyncio.run`, which needs Python
+	3.7: the tasks still pending at the end
+	are cancelled and the loop is closed.
+	"""
+
+	loop = asyncio.new_event_loop()
+	asyncio.set_event_loop(loop)
+	try: return loop.run_until_complete(coroutine)
+	finally:
+		all_tasks = getattr(asyncio, 'all_tasks', None) or asyncio.Task.all_tasks
+		pending = [task for task in all_tasks(loop) if not task.done()]
+		for task in pending: task.cancel()
+		if pending: loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+		loop.run_until_complete(loop.shutdown_asyncgens())
+		asyncio.set_event_loop(None)
+		loop.close()
@@ -0,0 +1,233 @@
+import struct
+import numpy as np
+from functools import lru_cache
+from typing import NamedTuple, Union, List, Tuple
+from ..game import Game
+from ..cards import Card
+from ..enums import MessageType, PokerMoves
+
+# Version of the protocol, messages with a
+# different version are rejected
+PROTOCOL_VERSION = 2
+
+# Every message starts with the version,
+# the type of message, the table and the
+# player
+HEADER = struct.Struct('<BBIB')
+
+# Body of the messages
+READY = struct.Struct('<B')
+ACTION = struct.Struct('<B')
+
+# A client joins with the number of seats
+# it plays and the maximum number of
+# states it wants in a batch, 0 to get
+# states one at a time
+JOIN = struct.Struct('<HH')
+
+# Batches start with the number of items;
+# each state is a full state message
+# prefixed by its size, each action has
+# the table, the player and the action
+BATCH = struct.Struct('<H')
+BATCH_STATE = struct.Struct('<H')
+BATCH_ACTION = struct.Struct('<IBB')
+
+# A state has the number of players, the
+# turn, the valid actions as a bitmask,
+# the money type and the bucket (-1 if
+# none); then the player cards and the
+# community cards, one byte each, and
+# the credits, bets and pending bets of
+# each player followed by the minimum
+# raise value
+STATE = struct.Struct('<BBBBi')
+
+# Number of community cards of each turn
+NUM_COMMUNITY_CARDS = (0, 3, 4, 5)
+
+# Money types
+MONEY_FLOAT = 0
+MONEY_INT = 1
+MONEY_FORMATS = ('d', 'q')
+
+# Cards by id, and one-hot valid actions
+# by bitmask
+CARDS = tuple(Card((card % 13, card // 13)) for card in range(52))
+VALID_ACTIONS = np.array([[(mask >> action) & 1 for action in range(PokerMoves.NUM_MOVES)] for mask in range(1 << PokerMoves.NUM_MOVES)], dtype=np.float64)
+
+class ProtocolError(ValueError):
+	""" Raised when a message cannot be decoded """
+
+class Message(NamedTuple):
+	""" A decoded message
+
+	Attributes
+	----------
+	kind : int
+		The type of message, as in
+		`MessageType`.
+	table : int
+		The table of the message.
+	player : int
+		The seat of the player at the table.
+	value : object
+		The number of players of a ready
+		message, the `Game.StateView` of a
+		state message, the action of an
+		action message, the number of seats
+		and the batch size of a join
+		message, a list of state messages
+		or a list of `(table, player,
+		action)` tuples for batches; `None`
+		otherwise.
+	"""
+
+	kind: int
+	table: int
+	player: int
+	value: object
+
+@lru_cache(maxsize=None)
+def _get_money_struct(count: int, money_type: int) -> struct.Struct:
+	""" Returns the struct of `count` amounts """
+
+	return struct.Struct('<%d%s' % (count, MONEY_FORMATS[money_type]))
+
+def encode_ready(table: int, player: int, num_players: int) -> bytes:
+	""" Encodes the message that seats `player` at `table` """
+
+	return HEADER.pack(PROTOCOL_VERSION, MessageType.READY, table, player) + READY.pack(num_players)
+
+def encode_over(table: int, player: int) -> bytes:
+	""" Encodes the message that closes the seat of `player` """
+
+	return HEADER.pack(PROTOCOL_VERSION, MessageType.OVER, table, player)
+
+def encode_action(table: int, player: int, action: int) -> bytes:
+	""" Encodes the action of `player` """
+
+	return HEADER.pack(PROTOCOL_VERSION, MessageType.ACTION, table, player) + ACTION.pack(action)
+
+def encode_join(num_seats: int=1, batch_size: int=0) -> bytes:
+	""" Encodes the first message of a client, see `JOIN` """
+
+	return HEADER.pack(PROTOCOL_VERSION, MessageType.JOIN, 0, 0) + JOIN.pack(num_seats, batch_size)
+
+def encode_state_batch(states: List[bytes]) -> bytes:
+	""" Encodes a batch of states already encoded with `encode_state` """
+
+	return b''.join([HEADER.pack(PROTOCOL_VERSION, MessageType.STATE_BATCH, 0, 0), BATCH.pack(len(states))] + [BATCH_STATE.pack(len(state)) + state for state in states])
+
+def encode_action_batch(actions: List[Tuple[int, int, int]]) -> bytes:
+	""" Encodes a batch of `(table, player, action)` tuples """
+
+	return b''.join([HEADER.pack(PROTOCOL_VERSION, MessageType.ACTION_BATCH, 0, 0), BATCH.pack(len(actions))] + [BATCH_ACTION.pack(*action) for action in actions])
+
+def encode_state(table: int, state: Game.StateView) -> bytes:
+	""" Encodes a state view
+
+	Cards are encoded as their id, the
+	valid actions as a bitmask and the
+	amounts as 8 bytes integers if the
+	game counts chips, or as doubles.
+	"""
+
+	num_players = state.num_players
+	money_type = MONEY_INT if state.credits.dtype.kind == 'i' else MONEY_FLOAT
+	valid_mask = 0
+	for action, valid in enumerate(state.valid_actions.tolist()):
+		if valid: valid_mask |= 1 << action
+
+	bucket = state.bucket
+	cards = bytes(card.id for card in state.player_cards + state.community_cards)
+	money = _get_money_struct(3 * num_players + 1, money_type).pack(*state.credits.tolist(), *state.bets.tolist(), *state.pending_bets.tolist(), state.minimum_raise_value)
+
+	return b''.join((
+		HEADER.pack(PROTOCOL_VERSION, MessageType.STATE, table, state.player),
+		STATE.pack(num_players, state.turn, valid_mask, money_type, -1 if bucket is None else bucket),
+		cards,
+		money
+	))
+
+def decode_state(player: int, data: Union[bytes, memoryview], offset: int=0) -> Game.StateView:
+	""" Decodes a state encoded by `encode_state`, starting at `offset` """
+
+	num_players, turn, valid_mask, money_type, bucket = STATE.unpack_from(data, offset)
+	offset += STATE.size
+
+	num_cards = 2 + NUM_COMMUNITY_CARDS[turn]
+	cards = [CARDS[card] for card in data[offset:offset + num_cards]]
+	offset += num_cards
+
+	money = np.array(_get_money_struct(3 * num_players + 1, money_type).unpack_from(data, offset), dtype=np.int64 if money_type == MONEY_INT else np.float64)
+	valid_actions = VALID_ACTIONS[valid_mask].copy()
+
+	state = Game.StateView.__new__(Game.StateView)
+	state.__setstate__((
+		player,
+		valid_actions,
+		num_players,
+		turn,
+		cards[:2],
+		cards[2:],
+		money[:num_players],
+		money[num_players:2 * num_players],
+		money[2 * num_players:3 * num_players],
+		money[-1].item(),
+		bucket if bucket >= 0 else None
+	))
+	return state
+
+def decode_state_batch(data: Union[bytes, memoryview]) -> List[Message]:
+	""" Decodes the states of a batch """
+
+	count, = BATCH.unpack_from(data, HEADER.size)
+	offset = HEADER.size + BATCH.size
+	data = memoryview(data)
+
+	states = []
+	for _ in range(count):
+		size, = BATCH_STATE.unpack_from(data, offset)
+		offset += BATCH_STATE.size
+		if offset + size > len(data): raise ProtocolError('Malformed message')
+
+		state = decode(data[offset:offset + size])
+		if state.kind != MessageType.STATE: raise ProtocolError('Invalid batch')
+		states.append(state)
+		offset += size
+
+	return states
+
+def decode(data: Union[bytes, memoryview]) -> Message:
+	""" Decodes a message
+
+	Raises
+	------
+	ProtocolError
+		If the message has a different
+		version, is malformed or has an
+		action that is not a move.
+	"""
+
+	try:
+		version, kind, table, player = HEADER.unpack_from(data)
+		if version != PROTOCOL_VERSION: raise ProtocolError('Unsupported protocol version %d' % version)
+
+		if kind == MessageType.STATE: value = decode_state(player, data, HEADER.size)
+		elif kind == MessageType.ACTION:
+			value, = ACTION.unpack_from(data, HEADER.size)
+			if value >= PokerMoves.NUM_MOVES: raise ProtocolError('Invalid action %d' % value)
+		elif kind == MessageType.READY: value, = READY.unpack_from(data, HEADER.size)
+		elif kind == MessageType.OVER: value = None
+		elif kind == MessageType.JOIN: value = JOIN.unpack_from(data, HEADER.size)
+		elif kind == MessageType.STATE_BATCH: value = decode_state_batch(data)
+		elif kind == MessageType.ACTION_BATCH:
+			count, = BATCH.unpack_from(data, HEADER.size)
+			value = list(BATCH_ACTION.iter_unpack(memoryview(data)[HEADER.size + BATCH.size:HEADER.size + BATCH.size + count * BATCH_ACTION.size]))
+			if len(value) != count: raise ProtocolError('Malformed message')
+			if any(action >= PokerMoves.NUM_MOVES for _, _, action in value): raise ProtocolError('Invalid action')
+		else: raise ProtocolError('Invalid message type %d' % kind)
+	except (struct.error, IndexError) as e: raise ProtocolError('Malformed message') from e
+
+	return Message(kind, table, player, value)
@@ -1,5 +1,8 @@
-import socket, pickle
+import socket
+from .framing import send_message, recv_message
+from .protocol import encode_ready, encode_state, encode_over, decode
 from ..game import Game
+from ..enums import MessageType
 
 class PokerGameServer:
 	"""  """
@@ -23,6 +26,8 @@ class PokerGameServer:
 
 		while len(self.clients) < self.game.num_players:
 			client, addr = self.sock.accept()
+			join = decode(recv_message(client))
+			assert join.kind == MessageType.JOIN and join.value[0] == 1, 'Only single seat clients are supported'
 			print('%s connecting as Player %d' % (addr, len(self.clients)))
 			self.clients.append(client)
 		
@@ -30,24 +35,25 @@ class PokerGameServer:
 		self.game.reset()
 		for player, client in enumerate(self.clients):
 			# Send ready state
-			data = pickle.dumps(dict(status='ready', player=player, num_players=self.game.num_players))
-			client.sendall(data)
+			send_message(client, encode_ready(0, player, self.game.num_players))
 		
 		game_over = False
 		while not game_over:
 			player_client = self.clients[self.game.active_player]
 
 			# Get active state and send to player
-			active_state = self.game.active_state
-			active_state = pickle.dumps(dict(status='playing', player=self.game.active_player, active_state=active_state))
-			player_client.sendall(active_state)
+			send_message(player_client, encode_state(0, self.game.active_state))
 
 			# Wait for a response
-			action = player_client.recv(1024)
-			player, action = pickle.loads(action)
-			assert player == self.game.active_player, 'Received action from wrong player'
+			message = decode(recv_message(player_client))
+			assert message.kind == MessageType.ACTION, 'Invalid message'
+			assert message.player == self.game.active_player, 'Received action from wrong player'
 			
 			# Do action
-			game_over, _, _ = self.game.step(action)
+			game_over, _, _ = self.game.step(message.value)
 		
+		for player, client in enumerate(self.clients):
+			send_message(client, encode_over(0, player))
+			client.close()
+
 		print('game ended')
\ No newline at end of file
@@ -0,0 +1,181 @@
+import numpy as np
+from typing import List, Union
+
+def resolve_pots(bets: np.ndarray, strengths: List[int], collect_remainder: bool=True, first_seat: int=0) -> np.ndarray:
+	""" Splits the bets of a hand between the showdown players
+
+	Showdown players are sorted once by
+	their bet, and the best hands among
+	the players from each position to the
+	last are found in a single backward
+	pass. Then, the bet left of each
+	player caps a side pot, which takes
+	up to that amount from every bet and
+	is split between the best hands still
+	in contention. The last player
+	collects what is left, if
+	`collect_remainder` is true.
+
+	If the bets are integers, pots are
+	split in whole chips and odd chips go
+	to the winners closest to the left of
+	`first_seat`, starting from
+	`first_seat` itself; otherwise pots
+	are split evenly.
+
+	Params
+	------
+	bets : numpy array
+		The committed bets of each player.
+	strengths : list of ints
+		The hand strength of each player,
+		as returned by `eval_strength`;
+		players with strength 0 are not in
+		the showdown.
+	collect_remainder : bool
+		Whether the last showdown player
+		collects the bets above its own
+		bet.
+	first_seat : int
+		The first seat that receives odd
+		chips, usually the seat to the left
+		of the dealer.
+
+	Returns
+	-------
+	numpy array
+		The amount won by each player,
+		with the same type as `bets`.
+	"""
+
+	num_players = len(bets)
+	integer = np.issubdtype(np.asarray(bets).dtype, np.integer)
+	values = np.asarray(bets).tolist()
+	payoffs = [0] * num_players
+
+	# Sort showdown players by bet, the
+	# sort is stable so ties keep seat order
+	showdown = sorted((player for player in range(num_players) if strengths[player] > 0), key=values.__getitem__)
+
+	# Best hands among the players from
+	# each position to the last
+	contenders = [None] * len(showdown)
+	best = 0
+	winners = []
+	for idx in range(len(showdown) - 1, -1, -1):
+		strength = strengths[showdown[idx]]
+		if strength > best: best, winners = strength, [showdown[idx]]
+		elif strength == best: winners = winners + [showdown[idx]]
+		contenders[idx] = winners
+
+	for idx, player in enumerate(showdown):
+		if all(value <= 0 for value in values): break # Nothing left to split
+
+		# Sum in seat order, so that float
+		# results do not depend on `sum`
+		amount = 0
+		if collect_remainder and idx == len(showdown) - 1:
+			# Last player takes what's left
+			for value in values: amount += value
+			payoffs[player] += amount
+			break
+
+		# Take each bet up to the bet left of
+		# this player
+		level = values[player]
+		for seat, value in enumerate(values):
+			part = value if value > 0 else 0
+			if part > level: part = level
+			values[seat] = value - part
+			amount += part
+
+		winners = contenders[idx]
+		if integer:
+			# Odd chips go to the first winners
+			# from `first_seat`
+			share, odd = divmod(amount, len(winners))
+			for rank, winner in enumerate(sorted(winners, key=lambda winner: (winner - first_seat) % num_players)): payoffs[winner] += share + (rank < odd)
+		else:
+			share = amount / len(winners)
+			for winner in winners: payoffs[winner] += share
+
+	return np.array(payoffs, dtype=np.asarray(bets).dtype)
+
+def resolve_pots_batch(bets: np.ndarray, strengths: np.ndarray, collect_remainder: Union[np.ndarray, bool]=True, first_seat: Union[np.ndarray, int]=0) -> np.ndarray:
+	""" Batched version of `resolve_pots`
+
+	Params
+	------
+	bets : numpy array
+		Bets with shape `(N, num_players)`.
+	strengths : numpy array
+		Hand strengths with the same shape.
+	collect_remainder : numpy array or bool
+		Boolean of each hand, with shape
+		`(N,)`.
+	first_seat : numpy array or int
+		First seat of each hand, with shape
+		`(N,)`.
+
+	Returns
+	-------
+	numpy array
+		The amount won by each player,
+		with shape `(N, num_players)`; the
+		same amounts as `resolve_pots`.
+	"""
+
+	size, num_players = bets.shape
+	rows = np.arange(size)
+	integer = np.issubdtype(bets.dtype, np.integer)
+	collect_remainder = np.broadcast_to(collect_remainder, (size,))
+	first_seat = np.broadcast_to(first_seat, (size,))
+
+	# Sort showdown players by bet
+	showdown = strengths > 0
+	num_showdown = np.sum(showdown, axis=1)
+	sorted_players = np.argsort(np.where(showdown, bets, np.inf), axis=1, kind='stable')
+	sorted_strengths = np.where(np.arange(num_players) < num_showdown[:, None], np.take_along_axis(strengths, sorted_players, axis=1), 0)
+	sorted_bets = np.take_along_axis(bets, sorted_players, axis=1)
+
+	# Best hand among the players from each
+	# position to the last
+	best = np.maximum.accumulate(sorted_strengths[:, ::-1], axis=1)[:, ::-1]
+
+	# Odd chips order of each seat
+	seat_order = (np.arange(num_players) - first_seat[:, None]) % num_players
+
+	payoffs = np.zeros_like(bets)
+	values = bets.copy()
+	for idx in range(num_players):
+		playing = np.logical_and(idx < num_showdown, np.any(values > 0, axis=1))
+		last = np.logical_and(playing, np.logical_and(collect_remainder, idx == num_showdown - 1))
+		split = np.logical_and(playing, ~last)
+		player = sorted_players[:, idx]
+
+		# Sum bets in seat order, as in the
+		# scalar version
+		amount = np.zeros_like(values[:, 0])
+		remainder = np.zeros_like(amount)
+		level = values[rows, player]
+		for seat in range(num_players):
+			remainder += values[:, seat]
+			part = np.where(split, np.minimum(np.maximum(values[:, seat], 0), level), 0)
+			values[:, seat] -= part
+			amount += part
+
+		payoffs[rows[last], player[last]] += remainder[last]
+
+		# Winners of this pot, in seat order
+		winners = np.zeros_like(showdown)
+		winners[rows[:, None], sorted_players] = np.logical_and(np.arange(num_players) >= idx, sorted_strengths == best[:, idx, None])
+		winners &= split[:, None]
+		num_winners = np.maximum(np.sum(winners, axis=1), 1)
+
+		if integer:
+			share, odd = np.divmod(amount, num_winners)
+			rank = np.sum(winners[:, None, :] & (seat_order[:, None, :] < seat_order[:, :, None]), axis=2)
+			payoffs += winners * (share[:, None] + (rank < odd[:, None]))
+		else: payoffs += winners * (amount / num_winners)[:, None]
+
+	return payoffs
@@ -0,0 +1,260 @@
+""" Opt-in timing of the phases of a game
+
+A `Profiler` replaces some methods of a
+game or environment with timed wrappers,
+stored as instance attributes that shadow
+the methods of the class. Objects that
+are not profiled run their usual code, so
+profiling costs nothing when disabled.
+
+Run random games and print where the time
+goes with:
+
+```console
+agent@pokerl:~$ python -m pokerl.profiling [--num-games <N=20>] [--num-players <P=6>] [--env]
+```
+"""
+
+import time
+import numpy as np
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, List, Tuple
+
+# Phases of a game, by method
+GAME_PHASES = {
+	'step': 'step',
+	'get_valid_actions': 'valid_actions',
+	'get_valid_moves': 'valid_moves',
+	'StateView': 'state_view',
+	'next_player': 'next_player',
+	'next_turn': 'next_turn',
+	'end_hand': 'end_hand',
+	'setup_hand': 'setup_hand',
+	'shuffle_deck': 'shuffle',
+	'emit': 'events'
+}
+
+# Phases of an environment, by method
+ENV_PHASES = {
+	'reset': 'env.reset',
+	'step': 'env.step',
+	'get_observation': 'env.observation'
+}
+
+class Profiler:
+	""" Cumulative wall time and calls of each phase
+
+	For each phase the profiler counts the
+	calls, the total time and the self
+	time, which excludes the time of the
+	nested phases. The time of each phase
+	is also collected for every hand, and
+	a hand ends when `Game.step` says so.
+
+	Usage
+	-----
+
+	```python
+	profiler = game.enable_profiling()
+	play(game)
+	print(profiler.format())
+	stats = profiler.as_dict()
+	game.disable_profiling()
+	```
+	"""
+
+	def __init__(self):
+		"""  """
+
+		self.phases: List[str] = []
+		self.calls: List[int] = []
+		self.totals: List[float] = []
+		self.selfs: List[float] = []
+
+		# Time of each phase in the current
+		# hand, and in every past hand
+		self.hand_totals: List[float] = []
+		self.hand_steps = 0
+		self.hands: List[Tuple[List[float], int]] = []
+
+		# Time of the nested phases of each
+		# running phase
+		self.stack: List[float] = []
+
+		# Wrapped attributes, with their value
+		# before wrapping
+		self.wrapped: List[Tuple[Any, str, bool, Any]] = []
+
+	def get_phase(self, name: str) -> int:
+		""" Returns the index of a phase, adding it if new """
+
+		if name not in self.phases:
+			self.phases.append(name)
+			for counters in (self.calls, self.totals, self.selfs, self.hand_totals): counters.append(0)
+
+		return self.phases.index(name)
+
+	def timed(self, name: str, fn: Callable, on_exit: Callable=None) -> Callable:
+		""" Returns a wrapper of `fn` that times it as phase `name`
+
+		If given, `on_exit` is called with the
+		return value of `fn`.
+		"""
+
+		idx = self.get_phase(name)
+		calls, totals, selfs, hand_totals, stack = self.calls, self.totals, self.selfs, self.hand_totals, self.stack
+		clock = time.perf_counter
+
+		def wrapper(*args, **kwargs):
+			stack.append(.0)
+			start = clock()
+			try: result = fn(*args, **kwargs)
+			finally:
+				elapsed = clock() - start
+				nested = stack.pop()
+				calls[idx] += 1
+				totals[idx] += elapsed
+				selfs[idx] += elapsed - nested
+				hand_totals[idx] += elapsed
+				if stack: stack[-1] += elapsed
+
+			if on_exit is not None: on_exit(result)
+			return result
+
+		return wrapper
+
+	def wrap(self, obj: Any, attr: str, name: str, on_exit: Callable=None):
+		""" Times the attribute `attr` of `obj` """
+
+		shadowed = attr in vars(obj)
+		self.wrapped.append((obj, attr, shadowed, vars(obj).get(attr)))
+		setattr(obj, attr, self.timed(name, getattr(obj, attr), on_exit))
+
+	def on_step(self, result: Tuple[bool, bool, bool]):
+		""" Counts a step and closes the hand if it ended """
+
+		self.hand_steps += 1
+		if result[1]:
+			self.hands.append((self.hand_totals[:], self.hand_steps))
+			self.hand_totals[:] = [0] * len(self.hand_totals)
+			self.hand_steps = 0
+
+	def attach_game(self, game: 'Game'):
+		""" Times the phases of a game, see `GAME_PHASES` """
+
+		for attr, name in GAME_PHASES.items(): self.wrap(game, attr, name, self.on_step if attr == 'step' else None)
+
+	def attach_env(self, env: 'PokerGameEnv'):
+		""" Times an environment, its game and the opponents """
+
+		self.attach_game(env.game)
+		for attr, name in ENV_PHASES.items(): self.wrap(env, attr, name)
+
+		# Opponents are stored in a list
+		for idx, agent in enumerate(env.agents):
+			if agent is not None:
+				self.wrapped.append((env.agents, idx, None, agent))
+				env.agents[idx] = self.timed('env.opponents', agent)
+
+	def detach(self):
+		""" Restores all the wrapped attributes """
+
+		for obj, attr, shadowed, value in reversed(self.wrapped):
+			if isinstance(obj, list): obj[attr] = value
+			elif shadowed: setattr(obj, attr, value)
+			else: delattr(obj, attr)
+
+		self.wrapped.clear()
+
+	def reset(self):
+		""" Clears all the counters and the hands """
+
+		for counters in (self.calls, self.totals, self.selfs, self.hand_totals): counters[:] = [0] * len(counters)
+		self.hands.clear()
+		self.hand_steps = 0
+
+	def histograms(self, bins: int=10) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+		""" Returns histograms of the time of each phase in a hand
+
+		Returns
+		-------
+		dict
+			The counts and the bin edges, in
+			seconds, of each phase, and of the
+			number of steps per hand under
+			`steps`.
+		"""
+
+		if not self.hands: return {}
+
+		times = np.array([totals + [0] * (len(self.phases) - len(totals)) for totals, _ in self.hands])
+		histograms = {name: np.histogram(times[:, idx], bins) for idx, name in enumerate(self.phases)}
+		histograms['steps'] = np.histogram([steps for _, steps in self.hands], bins)
+		return histograms
+
+	def as_dict(self) -> Dict[str, Any]:
+		""" Returns the counters of each phase and the number of hands """
+
+		phases = {name: {
+			'calls': self.calls[idx],
+			'total': self.totals[idx],
+			'self': self.selfs[idx],
+			'per_call': self.totals[idx] / self.calls[idx] if self.calls[idx] else .0
+		} for idx, name in enumerate(self.phases)}
+		return {'hands': len(self.hands), 'phases': phases}
+
+	def format(self) -> str:
+		""" Formats the counters as a table, by self time """
+
+		total = sum(self.selfs) or 1.
+		lines = ['%-16s %10s %10s %10s %10s %7s' % ('phase', 'calls', 'total (s)', 'self (s)', 'us/call', 'self %')]
+		for idx in sorted(range(len(self.phases)), key=lambda idx: -self.selfs[idx]):
+			per_call = 1e6 * self.totals[idx] / self.calls[idx] if self.calls[idx] else .0
+			lines.append('%-16s %10d %10.3f %10.3f %10.2f %6.1f%%' % (self.phases[idx], self.calls[idx], self.totals[idx], self.selfs[idx], per_call, 100 * self.selfs[idx] / total))
+
+		if self.hands: lines.append('%d hands, %.1f steps per hand' % (len(self.hands), np.mean([steps for _, steps in self.hands])))
+		return '\n'.join(lines)
+
+if __name__ == '__main__':
+	from .game import Game
+	from .agents import RandomAgent
+	from .envs import PokerGameEnv
+
+	parser = ArgumentParser('pokerl.profiling')
+	parser.add_argument('--num-games', '-G', default=20, type=int, help='Number of games, or episodes with --env')
+	parser.add_argument('--num-players', '-N', default=6, type=int)
+	parser.add_argument('--seed', default=0, type=int)
+	parser.add_argument('--env', action='store_true', help='Profile a PokerGameEnv with random opponents')
+	parser.add_argument('--bins', default=10, type=int, help='Bins of the per-hand histograms')
+	args = parser.parse_args()
+
+	np.random.seed(args.seed)
+	agent = RandomAgent()
+	start = time.perf_counter()
+
+	if args.env:
+		env = PokerGameEnv([agent] * (args.num_players - 1), num_players=args.num_players, rng=args.seed)
+		profiler = env.enable_profiling()
+		for _ in range(args.num_games):
+			state = env.reset()
+			done = False
+			while not done: state, _, done, _ = env.step(agent(state))
+	else:
+		game = Game(num_players=args.num_players, rng=args.seed)
+		profiler = game.enable_profiling()
+		for _ in range(args.num_games):
+			game.reset()
+			game_over = False
+			while not game_over: game_over, _, _ = game.step(agent(game.active_state))
+
+	print('%d %s in %.2f s' % (args.num_games, 'episodes' if args.env else 'games', time.perf_counter() - start))
+	print(profiler.format())
+
+	# Time of a hand in the slowest phases
+	histograms = profiler.histograms(args.bins)
+	for name in ('step', 'steps'):
+		if name not in histograms: continue
+		counts, edges = histograms[name]
+		scale, unit = (1, '') if name == 'steps' else (1e6, ' us')
+		print('\nper hand %s' % name)
+		for count, low, high in zip(counts, edges[:-1], edges[1:]): print('%10.0f - %-10.0f%s %6d' % (low * scale, high * scale, unit, count))
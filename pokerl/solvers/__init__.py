@@ -0,0 +1,2 @@
+from .infoset import InfosetTable
+from .mccfr import MCCFRSolver, SolverStats, ranking_abstraction
@@ -0,0 +1,166 @@
+import sys
+import numpy as np
+from typing import Dict, Tuple, Iterable
+from ..enums import PokerMoves
+
+class InfosetTable:
+	""" Regret and strategy tables indexed by information set
+
+	Each information set is identified by
+	a bytes key and is assigned a row of
+	two arrays with shape
+	`(capacity, PokerMoves.NUM_MOVES)`:
+	the cumulative regrets and the
+	cumulative strategy. Arrays grow by
+	doubling their capacity.
+
+	Usage
+	-----
+
+	```python
+	table = InfosetTable()
+	idx = table.get_index(key)
+	table.regrets[idx, action] += regret
+	```
+	"""
+
+	def __init__(self, capacity: int=1024, dtype=np.float32):
+		""" Creates an empty table
+
+		Params
+		------
+		capacity : int
+			Initial number of rows.
+		dtype : numpy dtype
+			Type of the regrets and of the
+			strategy sums.
+		"""
+
+		self.index: Dict[bytes, int] = {}
+		self.regrets = np.zeros((capacity, PokerMoves.NUM_MOVES), dtype=dtype)
+		self.strategy = np.zeros((capacity, PokerMoves.NUM_MOVES), dtype=dtype)
+
+	def __len__(self) -> int:
+		"""  """
+
+		return len(self.index)
+
+	def __contains__(self, key: bytes) -> bool:
+		"""  """
+
+		return key in self.index
+
+	@property
+	def keys(self) -> Iterable[bytes]:
+		""" The keys of the information sets, in index order """
+
+		return self.index.keys()
+
+	def get_index(self, key: bytes) -> int:
+		""" Returns the row of an information set, adding it if new """
+
+		idx = self.index.get(key)
+		if idx is None:
+			idx = self.index[key] = len(self.index)
+			if idx == len(self.regrets): self.reserve(2 * idx)
+
+		return idx
+
+	def reserve(self, capacity: int):
+		""" Grows the arrays to at least `capacity` rows """
+
+		if capacity <= len(self.regrets): return
+
+		for name in ('regrets', 'strategy'):
+			array = getattr(self, name)
+			grown = np.zeros((capacity, array.shape[1]), dtype=array.dtype)
+			grown[:len(array)] = array
+			setattr(self, name, grown)
+
+	def get_average_strategy(self, key: bytes, valid_actions: np.ndarray) -> np.ndarray:
+		""" Returns the average strategy of an information set
+
+		The strategy is uniform over the
+		valid actions if the information set
+		was never visited
+		"""
+
+		idx = self.index.get(key)
+		probs = self.strategy[idx] * valid_actions if idx is not None else np.zeros_like(valid_actions)
+		total = np.sum(probs)
+		return probs / total if total > 0 else valid_actions / np.sum(valid_actions)
+
+	def merge(self, other: 'InfosetTable', base: 'InfosetTable'=None):
+		""" Adds the updates of another table
+
+		Params
+		------
+		other : InfosetTable
+			The updated table.
+		base : InfosetTable
+			The table from which `other`
+			started; only the difference is
+			added.
+		"""
+
+		indices = np.fromiter((self.get_index(key) for key in other.keys), dtype=np.int64, count=len(other))
+		regrets = other.regrets[:len(other)].copy()
+		strategy = other.strategy[:len(other)].copy()
+
+		if base is not None and len(base) > 0:
+			# Keys of `base` come first in
+			# `other`, with the same indices
+			regrets[:len(base)] -= base.regrets[:len(base)]
+			strategy[:len(base)] -= base.strategy[:len(base)]
+
+		self.regrets[indices] += regrets
+		self.strategy[indices] += strategy
+
+	def get_memory_usage(self) -> Tuple[int, int]:
+		""" Returns the bytes used by the arrays and by the keys """
+
+		arrays = self.regrets.nbytes + self.strategy.nbytes
+		keys = sys.getsizeof(self.index) + sum(sys.getsizeof(key) for key in self.index)
+		return arrays, keys
+
+	def save(self, path: str, **extra):
+		""" Saves the table to a `.npz` file
+
+		Keys are stored as a single byte
+		array plus offsets. Extra arrays
+		can be saved alongside the table.
+		"""
+
+		keys = list(self.index)
+		offsets = np.cumsum([0] + [len(key) for key in keys])
+		np.savez(
+			path,
+			keys=np.frombuffer(b''.join(keys), dtype=np.uint8),
+			offsets=offsets,
+			regrets=self.regrets[:len(keys)],
+			strategy=self.strategy[:len(keys)],
+			**extra
+		)
+
+	@classmethod
+	def load(cls, path: str) -> Tuple['InfosetTable', dict]:
+		""" Loads a table saved with `save`
+
+		Returns
+		-------
+		tuple
+			The table and a dict with the
+			extra arrays.
+		"""
+
+		with np.load(path) as data:
+			data = dict(data)
+
+		keys, offsets = data.pop('keys').tobytes(), data.pop('offsets')
+		regrets, strategy = data.pop('regrets'), data.pop('strategy')
+
+		table = cls(max(len(regrets), 1), regrets.dtype)
+		table.index = {keys[start:end]: idx for idx, (start, end) in enumerate(zip(offsets[:-1], offsets[1:]))}
+		table.regrets[:len(regrets)] = regrets
+		table.strategy[:len(strategy)] = strategy
+		return table, data
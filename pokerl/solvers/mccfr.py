@@ -0,0 +1,294 @@
+import time
+import copy
+import struct
+import numpy as np
+import multiprocessing as mp
+from typing import Callable, NamedTuple
+from .infoset import InfosetTable
+from ..game import Game
+from ..judger import eval_strength, get_ranking
+from ..enums import GameEvent
+
+def ranking_abstraction(game: Game, player: int) -> int:
+	""" Default card abstraction, the ranking of the best hand of `player` """
+
+	ranking, _ = get_ranking(eval_strength(game.get_cards_of(player) + game.community_cards))
+	return ranking
+
+class SolverStats(NamedTuple):
+	""" Statistics of a run of the solver
+
+	Attributes
+	----------
+	iterations : int
+		Total number of iterations.
+	elapsed : float
+		Seconds spent in the last run.
+	iterations_per_second : float
+		Throughput of the last run.
+	num_infosets : int
+		Number of information sets.
+	bytes_per_infoset : float
+		Memory used by the tables and by
+		the keys, per information set.
+	"""
+
+	iterations: int
+	elapsed: float
+	iterations_per_second: float
+	num_infosets: int
+	bytes_per_infoset: float
+
+class MCCFRSolver:
+	""" External-sampling Monte Carlo CFR over single hands of `Game`
+
+	Each iteration deals a new hand and,
+	for each player in turn, traverses
+	the game tree: all the actions of
+	the traversing player are explored,
+	branching the game with
+	`Game.snapshot` and `Game.restore`,
+	while the actions of the opponents
+	are sampled from their current
+	strategy. The utility of a player is
+	its payoff at the end of the hand.
+
+	An information set is identified by
+	the player, the bucket returned by
+	the card abstraction and the actions
+	played so far in the hand.
+
+	Usage
+	-----
+
+	```python
+	solver = MCCFRSolver(num_players=2, start_credits=20)
+	stats = solver.solve(10000, num_workers=4, checkpoint='mccfr.npz')
+	print(stats.iterations_per_second, stats.bytes_per_infoset)
+
+	probs = solver.get_strategy(game, history)
+	```
+	"""
+
+	def __init__(self, abstraction: Callable[[Game, int], int]=ranking_abstraction, **config):
+		""" Creates a new solver
+
+		Params
+		------
+		abstraction : callable
+			Maps a game and a player to a
+			non-negative card bucket; defaults
+			to the ranking of the player's
+			best hand. Must be picklable to
+			run parallel iterations.
+		dtype : numpy dtype
+			Type of the tables; defaults to
+			`np.float32`.
+
+		Other parameters are passed to
+		`Game`.
+		"""
+
+		self.abstraction = abstraction
+		self.table = InfosetTable(dtype=config.pop('dtype', np.float32))
+		self.game_config = config
+		self.iterations = 0
+
+		# The generator is not kept in the
+		# config, which is passed to `reset`
+		# at every iteration
+		self.game = Game(rng=config.pop('rng', None), **config)
+		self.game.subscribe(self.on_payoff, (GameEvent.PAYOFF,))
+		self.payoffs = None
+		self.root_hand = 0
+
+	def __getstate__(self) -> dict:
+		""" Returns the solver state, without the game """
+
+		state = self.__dict__.copy()
+		del state['game']
+		return state
+
+	def __setstate__(self, state: dict):
+		"""  """
+
+		self.__dict__.update(state)
+		self.game = Game(**self.game_config)
+		self.game.subscribe(self.on_payoff, (GameEvent.PAYOFF,))
+
+	def on_payoff(self, event: tuple):
+		""" Stores the payoffs of the traversed hand """
+
+		if event.hand == self.root_hand: self.payoffs = event.payoffs
+
+	def get_key(self, game: Game, history: bytes) -> bytes:
+		""" Returns the information set key of the active player """
+
+		player = game.active_player
+		return struct.pack('<BI', player, self.abstraction(game, player)) + history
+
+	def get_strategy(self, game: Game, history: bytes) -> np.ndarray:
+		""" Returns the average strategy of the active player
+
+		Params
+		------
+		game : Game
+			The game, in a state reached
+			by the actions in `history`.
+		history : bytes
+			The actions played so far in the
+			hand, one byte per action.
+
+		Returns
+		-------
+		numpy array
+			The probability of each action.
+		"""
+
+		valid_actions, _ = game.get_valid_actions()
+		return self.table.get_average_strategy(self.get_key(game, history), valid_actions)
+
+	def get_current_strategy(self, idx: int, valid_actions: np.ndarray) -> np.ndarray:
+		""" Regret matching over the valid actions """
+
+		regrets = np.maximum(self.table.regrets[idx], 0) * valid_actions
+		total = np.sum(regrets)
+		return regrets / total if total > 0 else valid_actions / np.sum(valid_actions)
+
+	def traverse(self, traverser: int, history: bytes) -> float:
+		""" Returns the sampled utility of `traverser` from the current state """
+
+		game = self.game
+		if game.hand != self.root_hand or game.game_over: return self.payoffs[traverser]
+
+		valid_actions, _ = game.get_valid_actions()
+		idx = self.table.get_index(self.get_key(game, history))
+		strategy = self.get_current_strategy(idx, valid_actions)
+
+		if game.active_player == traverser:
+			# Explore all valid actions
+			snapshot = game.snapshot()
+			values = np.zeros_like(strategy)
+			for action in np.flatnonzero(valid_actions):
+				game.step(int(action))
+				values[action] = self.traverse(traverser, history + bytes((action,)))
+				game.restore(snapshot)
+
+			value = np.dot(strategy, values)
+			self.table.regrets[idx] += (values - value) * valid_actions
+			return value
+		else:
+			# Sample opponent action and update
+			# average strategy
+			self.table.strategy[idx] += strategy
+			action = min(np.searchsorted(np.cumsum(strategy), np.random.random(), side='right'), np.flatnonzero(strategy)[-1])
+			game.step(int(action))
+			return self.traverse(traverser, history + bytes((action,)))
+
+	def iterate(self, iterations: int):
+		""" Runs `iterations` iterations in this process """
+
+		game = self.game
+		for _ in range(iterations):
+			# Deal a new hand
+			game.reset(**self.game_config)
+			self.root_hand = game.hand
+			root = game.snapshot()
+
+			for traverser in range(game.num_players):
+				game.restore(root)
+				self.traverse(traverser, b'')
+
+			self.iterations += 1
+
+	def solve(self, iterations: int, num_workers: int=1, **config) -> SolverStats:
+		""" Runs the solver
+
+		Params
+		------
+		iterations : int
+			Number of iterations.
+		num_workers : int
+			Number of processes; with more
+			than one process, each worker
+			runs on a copy of the tables,
+			and the updates are merged every
+			`merge_every` iterations.
+		merge_every : int
+			Iterations run by each worker
+			between merges; defaults to 1000.
+		checkpoint : str
+			If given, the tables are saved to
+			this path after every merge, or
+			every `merge_every` iterations.
+		seed : int
+			Seed used to derive the seed of
+			each worker.
+
+		Returns
+		-------
+		SolverStats
+			Throughput and memory usage.
+		"""
+
+		merge_every: int = config.get('merge_every', 1000)
+		checkpoint: str = config.get('checkpoint', None)
+		seeds = np.random.SeedSequence(config.get('seed', None))
+
+		start = time.perf_counter()
+		done = 0
+
+		if num_workers > 1:
+			with mp.get_context(config.get('start_method', None)).Pool(num_workers) as pool:
+				while done < iterations:
+					# Split iterations between workers
+					size = min(merge_every * num_workers, iterations - done)
+					shares = [len(share) for share in np.array_split(np.arange(size), num_workers) if len(share)]
+					base = copy.deepcopy(self.table)
+					args = [(self, share, seed) for share, seed in zip(shares, seeds.spawn(len(shares)))]
+
+					for table in pool.starmap(_run_worker, args): self.table.merge(table, base)
+
+					self.iterations += size
+					done += size
+					if checkpoint: self.save(checkpoint)
+		else:
+			while done < iterations:
+				size = min(merge_every, iterations - done)
+				self.iterate(size)
+				done += size
+				if checkpoint: self.save(checkpoint)
+
+		elapsed = time.perf_counter() - start
+		arrays, keys = self.table.get_memory_usage()
+
+		return SolverStats(
+			iterations=self.iterations,
+			elapsed=elapsed,
+			iterations_per_second=done / elapsed if elapsed > 0 else .0,
+			num_infosets=len(self.table),
+			bytes_per_infoset=(arrays + keys) / max(len(self.table), 1)
+		)
+
+	def save(self, path: str):
+		""" Saves the tables and the number of iterations """
+
+		self.table.save(path, iterations=np.array(self.iterations))
+
+	def load(self, path: str):
+		""" Loads the tables saved with `save` """
+
+		self.table, extra = InfosetTable.load(path)
+		self.iterations = int(extra['iterations'])
+
+def _run_worker(solver: MCCFRSolver, iterations: int, seed: np.random.SeedSequence) -> InfosetTable:
+	""" Runs iterations on a copy of the solver and returns its table """
+
+	# The game deals from its own stream,
+	# sampling uses the global generator
+	game_seed, sample_seed = seed.spawn(2)
+	solver.game.rng = np.random.default_rng(game_seed)
+	np.random.seed(sample_seed.generate_state(1))
+
+	solver.iterate(iterations)
+	return solver.table
@@ -0,0 +1,474 @@
+import numpy as np
+from typing import Union, Tuple
+from .judger import eval_hands_batch
+from .pots import resolve_pots_batch
+from .enums import PokerMoves, PlayerState
+
+class VectorGame:
+	""" Many Texas Hold'em tables played in lockstep
+
+	The state of all the tables is stored
+	in arrays with shape `(num_tables,
+	num_players)`, and each call to `step`
+	performs one action on each table.
+	The rules are exactly the same of
+	`Game`; cards are represented by their
+	ids, as in `Card.id`.
+
+	Tables whose game is over are not
+	stepped until they are reset.
+
+	Usage
+	-----
+
+	```python
+	import numpy as np
+	from pokerl import VectorGame
+
+	game = VectorGame(num_tables=1000, num_players=4, start_credits=100)
+	game.reset()
+
+	for step in range(1000):
+		# Get random action from valid actions
+		v = game.get_valid_actions()
+		u = np.argmax(np.random.random(v.shape) * v, axis=1)
+
+		game_over, *_ = game.step(u)
+		game.reset(game_over)
+	```
+	"""
+
+	# Raise factors of raise moves
+	raise_factors = np.array([0.1, 0.25, 0.5])
+
+	def __init__(self, num_tables: int=1, **config):
+		""" Creates a new set of tables
+
+		Params
+		------
+		num_tables : int
+			The number of tables.
+		rng : numpy generator or seed
+			The random generator used to
+			shuffle the decks.
+
+		Other parameters are the same of
+		`Game`.
+		"""
+
+		self.num_tables = num_tables
+		self.num_players: int = config.get('num_players', 4)
+		self.start_credits: Union[np.ndarray, int, list] = config.get('start_credits', 100)
+		self.big_blind: float = config.get('big_blind', 2)
+		self.small_blind: float = config.get('small_blind', 1)
+		self.rng: np.random.Generator = np.random.default_rng(config.get('rng', None))
+
+		shape = (num_tables, self.num_players)
+		self.tables = np.arange(num_tables)
+		self.decks = np.tile(np.arange(52), (num_tables, 1))
+		self.turn = np.zeros((num_tables,), dtype=np.int64)
+		self.hand = np.zeros((num_tables,), dtype=np.int64)
+		self.dealer_idx = np.full((num_tables,), config.get('dealer', 0), dtype=np.int64)
+		self.big_blind_idx = np.zeros((num_tables,), dtype=np.int64)
+		self.small_blind_idx = np.zeros((num_tables,), dtype=np.int64)
+		self.active_player = np.zeros((num_tables,), dtype=np.int64)
+		self.player_states = np.full(shape, PlayerState.ACTIVE, dtype=np.uint8)
+		self.credits = np.zeros(shape)
+		self.bets = np.zeros(shape)
+		self.pending_bets = np.zeros(shape)
+		self.minimum_raise_value = np.zeros((num_tables,))
+		self.payoffs = np.zeros(shape)
+
+	@property
+	def community_cards(self) -> np.ndarray:
+		""" The five community cards of each table
+
+		Only the first `num_community_cards`
+		cards of each table are visible
+		"""
+
+		return self.decks[:, :5]
+
+	@property
+	def num_community_cards(self) -> np.ndarray:
+		""" The number of visible community cards of each table """
+
+		return np.where(self.turn == 0, 0, self.turn + 2)
+
+	@property
+	def pot(self) -> np.ndarray:
+		""" The sum of all the bets of each table """
+
+		return np.sum(self.bets, axis=1)
+
+	@property
+	def high_bet(self) -> np.ndarray:
+		""" The current highest bet of each table """
+
+		return np.max(self.pending_bets, axis=1)
+
+	@property
+	def game_over(self) -> np.ndarray:
+		""" Returns true for tables where all players but one are broken """
+
+		return np.sum(self.player_states != PlayerState.BROKEN, axis=1) == 1
+
+	def get_first_playing(self, tables: np.ndarray, idx: np.ndarray) -> np.ndarray:
+		""" Returns the index of the first non-broken player of each table, starting from player `idx` """
+
+		players = (idx[:, None] + np.arange(self.num_players)) % self.num_players
+		return players[np.arange(len(tables)), np.argmax(self.player_states[tables[:, None], players] != PlayerState.BROKEN, axis=1)]
+
+	def get_valid_actions(self) -> np.ndarray:
+		""" Valid actions of the active player of each table
+
+		Returns
+		-------
+		numpy array
+			A boolean array with shape
+			`(num_tables, PokerMoves.NUM_MOVES)`
+			of valid actions.
+		"""
+
+		high_bet = self.high_bet
+		credit = self.credits[self.tables, self.active_player]
+		valids = np.ones((self.num_tables, PokerMoves.NUM_MOVES), dtype=bool)
+
+		# Compute minimum raise value
+		raise_values = self.raise_factors * (credit - high_bet)[:, None]
+		raise_values = np.logical_and(raise_values > self.minimum_raise_value[:, None], (high_bet[:, None] + raise_values) < credit[:, None])
+		valids[:, PokerMoves.RAISE_ANY:PokerMoves.RAISE_ANY + PokerMoves.NUM_RAISE_MOVES] = raise_values
+
+		# Compute call and check validity
+		valids[:, PokerMoves.CHECK] = high_bet == .0
+		valids[:, PokerMoves.CALL] = high_bet < credit
+
+		return valids
+
+	def get_cards_of(self, player: np.ndarray=None) -> np.ndarray:
+		""" Returns the cards of one player for each table; defaults to the active players """
+
+		if player is None: player = self.active_player
+
+		card_idx = 5 + np.asarray(player)[..., None] * 2 + np.arange(2)
+		return self.decks[self.tables[:, None], card_idx]
+
+	def get_hands(self, tables: np.ndarray) -> np.ndarray:
+		""" Returns the final hands of all players, with shape `(len(tables), num_players, 7)` """
+
+		decks = self.decks[tables]
+		players = decks[:, 5:5 + 2 * self.num_players].reshape(len(tables), self.num_players, 2)
+		community = np.broadcast_to(decks[:, None, :5], (len(tables), self.num_players, 5))
+		return np.concatenate((community, players), axis=2)
+
+	def reset(self, tables: np.ndarray=None, **config):
+		""" Reset tables to their initial state
+
+		Params
+		------
+		tables : numpy array
+			Indices or boolean mask of the
+			tables to reset; all tables are
+			reset if `None`.
+		dealer : int
+			Same as in `Game.reset`.
+		"""
+
+		tables = self.tables if tables is None else self.tables[tables]
+		if len(tables) == 0: return
+
+		self.dealer_idx[tables] = config.get('dealer', 0)
+
+		# Reset initial state
+		self.hand[tables] = 0
+		self.active_player[tables] = 0
+		self.credits[tables] = self.start_credits
+		self.player_states[tables] = PlayerState.ACTIVE
+
+		# Setup hand
+		self.setup_hand(tables)
+
+	def shuffle_decks(self, tables: np.ndarray):
+		""" Shuffles the decks of `tables` """
+
+		self.decks[tables] = np.argsort(self.rng.random((len(tables), 52)), axis=1)
+
+	def setup_hand(self, tables: np.ndarray):
+		""" Setup a new hand on `tables` """
+
+		self.hand[tables] += 1
+		self.turn[tables] = 0
+
+		# Reset player states
+		states = self.player_states[tables]
+		states[states != PlayerState.BROKEN] = PlayerState.ACTIVE
+
+		# Shuffle decks
+		self.shuffle_decks(tables)
+
+		# Update dealer, blinds and set active player
+		self.player_states[tables] = states
+		self.dealer_idx[tables] = self.get_first_playing(tables, self.dealer_idx[tables] + 1)
+		self.small_blind_idx[tables] = self.get_first_playing(tables, self.dealer_idx[tables] + 1)
+		self.big_blind_idx[tables] = self.get_first_playing(tables, self.small_blind_idx[tables] + 1)
+		self.active_player[tables] = self.get_first_playing(tables, self.big_blind_idx[tables] + 1)
+
+		# Blind bets
+		self.bets[tables] = .0
+		self.pending_bets[tables] = .0
+		self.pending_bets[tables, self.big_blind_idx[tables]] = self.big_blind
+		self.pending_bets[tables, self.small_blind_idx[tables]] = self.small_blind
+		self.player_states[tables, self.big_blind_idx[tables]] = PlayerState.CALLED
+
+		# Check if all-in and clip blinds
+		credits, pending_bets, states = self.credits[tables], self.pending_bets[tables], self.player_states[tables]
+		states[pending_bets > credits] = PlayerState.ALL_IN
+		self.player_states[tables] = states
+		self.pending_bets[tables] = np.minimum(pending_bets, credits)
+		self.minimum_raise_value[tables] = np.max(self.pending_bets[tables], axis=1)
+
+	def commit_bets(self, tables: np.ndarray):
+		""" Commits pending bets of `tables` """
+
+		self.bets[tables] += self.pending_bets[tables]
+		self.credits[tables] -= self.pending_bets[tables]
+
+		self.pending_bets[tables] = .0
+		self.minimum_raise_value[tables] = .0
+
+	def end_hand(self, tables: np.ndarray):
+		""" Ends the current hand of `tables` and computes winners """
+
+		self.commit_bets(tables)
+
+		# Reset payoffs
+		self.payoffs[tables] = .0
+
+		# Get number of potential winners
+		states = self.player_states[tables]
+		potential_winners = np.logical_and(states != PlayerState.BROKEN, states != PlayerState.FOLDED)
+		num_potential_winners = np.sum(potential_winners, axis=1)
+		assert np.all(num_potential_winners > 0), 'Invalid state: no potential winner'
+
+		# Winner takes all
+		last_stand = num_potential_winners == 1
+		if np.any(last_stand):
+			last_tables = tables[last_stand]
+			winner = np.argmax(potential_winners[last_stand], axis=1)
+			pot = self.pot[last_tables]
+
+			self.payoffs[last_tables, winner] = pot
+			self.credits[last_tables, winner] += pot
+
+		showdown_tables = tables[~last_stand]
+		if len(showdown_tables):
+			self.resolve_showdown(showdown_tables)
+
+		# Compute player hand's net value
+		self.payoffs[tables] -= self.bets[tables]
+
+		# Update player state
+		credits, states = self.credits[tables], self.player_states[tables]
+		states[credits <= .0] = PlayerState.BROKEN
+		self.player_states[tables] = states
+
+		# Next hand
+		self.setup_hand(tables)
+
+	def resolve_showdown(self, tables: np.ndarray):
+		""" Splits the pots of `tables` between showdown players
+
+		Mirrors `Game.end_hand`, see
+		`resolve_pots_batch`.
+		"""
+
+		bets = self.bets[tables]
+		states = self.player_states[tables]
+		showdown = np.logical_or(states == PlayerState.CALLED, states == PlayerState.ALL_IN)
+		num_potential_winners = np.sum(np.logical_and(states != PlayerState.BROKEN, states != PlayerState.FOLDED), axis=1)
+
+		# Compute hand strengths
+		strengths = np.where(showdown, eval_hands_batch(self.get_hands(tables)), 0)
+
+		# The last showdown player only takes
+		# what's left if no other player is
+		# still active
+		collect_remainder = num_potential_winners == np.sum(showdown, axis=1)
+		payoffs = resolve_pots_batch(bets, strengths, collect_remainder, self.dealer_idx[tables] + 1)
+
+		self.payoffs[tables] += payoffs
+		self.credits[tables] += payoffs
+
+	def next_turn(self, tables: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		""" Advances `tables` to the next turn
+
+		Returns
+		-------
+		tuple
+			A tuple of boolean arrays
+			indicating whether:
+			- the game has ended
+			- the hand has ended
+			- the turn has ended
+		"""
+
+		self.commit_bets(tables)
+
+		# Next turn
+		self.turn[tables] += 1
+
+		ended = self.turn[tables] == 4
+		game_over = np.zeros((len(tables),), dtype=bool)
+		if np.any(ended):
+			self.end_hand(tables[ended])
+			game_over[ended] = self.game_over[tables[ended]]
+
+		next_tables = tables[~ended]
+		if len(next_tables):
+			states = self.player_states[next_tables]
+			next_turn_players = states == PlayerState.CALLED
+			reset = np.sum(next_turn_players, axis=1) > 1
+
+			# Reset states
+			states[np.logical_and(next_turn_players, reset[:, None])] = PlayerState.ACTIVE
+			self.player_states[next_tables] = states
+			self.active_player[next_tables] = self.get_first_playing(next_tables, self.dealer_idx[next_tables] + 1)
+
+		return game_over, ended, np.ones((len(tables),), dtype=bool)
+
+	def next_player(self, tables: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		""" Finds the next player of `tables`
+
+		See `Game.next_player`
+		"""
+
+		game_over = np.zeros((len(tables),), dtype=bool)
+		hand_over = np.zeros((len(tables),), dtype=bool)
+		turn_over = np.zeros((len(tables),), dtype=bool)
+
+		# Get number of playing players
+		states = self.player_states[tables]
+		num_playing_players = np.sum(np.logical_and(states != PlayerState.BROKEN, states != PlayerState.FOLDED), axis=1)
+
+		# One winner takes all
+		last_stand = num_playing_players <= 1
+		if np.any(last_stand):
+			self.end_hand(tables[last_stand])
+			game_over[last_stand] = self.game_over[tables[last_stand]]
+			hand_over[last_stand] = True
+
+		# Proceed normally
+		pending = np.flatnonzero(~last_stand)
+		current_player = self.active_player[tables]
+		self.active_player[tables[pending]] = (self.active_player[tables[pending]] + 1) % self.num_players
+
+		while True:
+			pending = pending[self.player_states[tables[pending], self.active_player[tables[pending]]] != PlayerState.ACTIVE]
+			if len(pending) == 0: break
+
+			ended = self.active_player[tables[pending]] == current_player[pending]
+			if np.any(ended):
+				turn_idx = pending[ended]
+				game_over[turn_idx], hand_over[turn_idx], turn_over[turn_idx] = self.next_turn(tables[turn_idx])
+
+			# Drop tables whose game is over
+			next_idx = pending[~ended]
+			self.active_player[tables[next_idx]] = (self.active_player[tables[next_idx]] + 1) % self.num_players
+			pending = pending[~game_over[pending]]
+
+		return game_over, hand_over, turn_over
+
+	def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		""" Perform a step on each table
+
+		Make the active player of each table
+		perform the corresponding action and
+		advance the tables state
+
+		Params
+		------
+		actions : numpy array
+			An integer array with shape
+			`(num_tables,)` with the index of
+			a valid action for each table, as
+			in `PokerMoves`; actions of tables
+			whose game is over are ignored.
+
+		Returns
+		-------
+		tuple
+			A tuple of boolean arrays with
+			shape `(num_tables,)` indicating
+			whether:
+			- the game has ended
+			- the hand has ended
+			- the turn has ended
+		"""
+
+		actions = np.asarray(actions)
+		tables = np.flatnonzero(~self.game_over)
+		actions = actions[tables]
+		players = self.active_player[tables]
+
+		invalid = (actions < 0) | (actions >= PokerMoves.NUM_MOVES)
+		if np.any(invalid):
+			idx = np.argmax(invalid)
+			raise ValueError('Table %d invalid move %d' % (tables[idx], actions[idx]))
+
+		valid = self.get_valid_actions()[tables, actions]
+		if not np.all(valid):
+			table = tables[np.argmin(valid)]
+			raise ValueError('Table %d invalid move: `%s`' % (table, PokerMoves.as_string[actions[np.argmin(valid)]]))
+
+		states = self.player_states[tables]
+		rows = np.arange(len(tables))
+
+		folds = actions == PokerMoves.FOLD
+		states[rows[folds], players[folds]] = PlayerState.FOLDED
+
+		checks = actions == PokerMoves.CHECK
+		states[rows[checks], players[checks]] = PlayerState.CALLED
+
+		betting = actions >= PokerMoves.CALL
+		if np.any(betting):
+			# Call first, always bet something
+			bet_tables, bet_rows, bet_players, bet_actions = tables[betting], rows[betting], players[betting], actions[betting]
+			high_bet = self.high_bet[bet_tables]
+			credit = self.credits[bet_tables, bet_players]
+			bet_value = np.maximum(high_bet, self.big_blind)
+			player_state = np.full((len(bet_tables),), PlayerState.CALLED, dtype=np.uint8)
+
+			all_in = bet_actions == PokerMoves.ALL_IN
+			bet_value[all_in] = credit[all_in]
+			player_state[all_in] = PlayerState.ALL_IN
+
+			raising = np.logical_and(bet_actions >= PokerMoves.RAISE_ANY, ~all_in)
+			if np.any(raising):
+				# Add raise value
+				future_credit = credit[raising] - bet_value[raising]
+				raise_value = future_credit * self.raise_factors[bet_actions[raising] - PokerMoves.RAISE_ANY]
+				bet_value[raising] += raise_value
+
+			# If we raised the high bet, reset
+			# all called states to active
+			raised = bet_value > high_bet
+			raised_states = states[bet_rows[raised]]
+			raised_states[raised_states == PlayerState.CALLED] = PlayerState.ACTIVE
+			states[bet_rows[raised]] = raised_states
+			states[bet_rows, bet_players] = player_state
+
+			# Set minimum raise value
+			self.minimum_raise_value[bet_tables[raised]] = bet_value[raised] - high_bet[raised]
+
+			# Update pending bets
+			self.pending_bets[bet_tables, bet_players] = bet_value
+
+		self.player_states[tables] = states
+
+		# Next player
+		game_over = np.zeros((self.num_tables,), dtype=bool)
+		hand_over = np.zeros((self.num_tables,), dtype=bool)
+		turn_over = np.zeros((self.num_tables,), dtype=bool)
+		game_over[tables], hand_over[tables], turn_over[tables] = self.next_player(tables)
+
+		return game_over, hand_over, turn_over
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pytest
+import pickle
+import numpy as np
+from pokerl.cards import Card
+from pokerl.game import Game
+from pokerl.enums import PokerMoves
+from pokerl.abstraction import build_buckets, compute_histograms, CardAbstraction
+from pokerl.network.protocol import encode_state, decode
+
+def test_compute_histograms():
+	""" Test equity histograms """
+
+	hands = np.array([[0, 13], [1, 15]]) # Pair of aces and 2-3 offsuit
+	histograms = compute_histograms(hands, rng=0, num_bins=4, num_futures=64)
+	assert histograms.shape == (2, 4)
+	assert np.allclose(np.sum(histograms, axis=1), 1.)
+	assert np.argmax(histograms[0]) == 3
+
+def test_card_abstraction(tmp_path):
+	""" Test bucket tables and lookup """
+
+	path = str(tmp_path / 'preflop.npy')
+	buckets = build_buckets(0, 8, path, rng=0, num_futures=16, num_samples=4)
+	assert buckets.dtype == np.uint8 and len(buckets) == 169
+	assert set(np.unique(buckets)) == set(range(8))
+
+	abstraction = CardAbstraction([path])
+	assert isinstance(abstraction.tables[0], np.memmap)
+	assert abstraction.get_bucket([Card('AS'), Card('AH')]) == 7
+	assert abstraction.get_bucket([Card('AS'), Card('AH')]) > abstraction.get_bucket([Card('7S'), Card('2H')])
+	assert np.array_equal(abstraction.get_buckets_batch([[0, 13], [0, 26]]), [abstraction.get_bucket([0, 13])] * 2)
+
+	game = Game(num_players=4, abstraction=abstraction)
+	game.reset()
+	state = game.active_state
+	assert state.bucket == abstraction.get_bucket(state.player_cards)
+	assert pickle.loads(pickle.dumps(state)).bucket == state.bucket
+	assert pickle.loads(pickle.dumps(abstraction)).paths == [path, None, None, None]
+	assert Game(num_players=4).active_state.bucket is None
+
+	# Turns without a table have no bucket
+	game = Game(num_players=3, abstraction=abstraction)
+	game.reset()
+	while game.turn == 0: game.step(PokerMoves.CHECK if game.active_state.valid_actions[PokerMoves.CHECK] else PokerMoves.CALL)
+	state = game.active_state
+	assert state.bucket is None and pickle.loads(pickle.dumps(state)).bucket is None
+	assert decode(encode_state(0, state)).value.bucket is None
@@ -0,0 +1,51 @@
+import pytest
+import numpy as np
+from pokerl.cards import Card
+from pokerl.equity import estimate
+
+def create_hand(*symbols):
+	"""  """
+
+	return [Card(sym) for sym in symbols]
+
+def test_equity_estimate():
+	""" Test Monte Carlo equity estimation """
+
+	# Pocket aces against a random hand
+	out = estimate(create_hand("1S", "1H"), num_opponents=1, iterations=20000, rng=0)
+	assert out.iterations == 20000
+	assert out.interval[0] <= out.equity <= out.interval[1]
+	assert 0.83 < out.equity < 0.88
+	assert out.win + out.tie + out.loss == pytest.approx(1.)
+
+	# Same seed, same result
+	assert estimate(create_hand("1S", "1H"), num_opponents=1, iterations=20000, rng=0) == out
+
+	# Card ids are accepted as well
+	assert estimate([card.id for card in create_hand("1S", "1H")], num_opponents=1, iterations=20000, rng=0) == out
+
+	# Royal flush on the board, everyone splits
+	out = estimate(create_hand("2S", "3H"), create_hand("1D", "KD", "QD", "JD", "TD"), num_opponents=3, iterations=1000, rng=0)
+	assert out.tie == 1. and out.equity == pytest.approx(0.25)
+
+	# Nut straight flush always wins
+	out = estimate(create_hand("1D", "KD"), create_hand("QD", "JD", "TD"), num_opponents=5, iterations=1000, rng=0)
+	assert out.win == 1.
+
+def test_equity_estimate_early_stop():
+	""" Test that estimation stops when the interval is narrow enough """
+
+	out = estimate(create_hand("7S", "2H"), num_opponents=2, iterations=100000, rng=np.random.default_rng(1), target_width=0.05)
+	assert out.iterations < 100000
+	assert out.interval[1] - out.interval[0] <= 0.05
+
+	# Identical outcomes of a small batch
+	# do not stop the estimation
+	out = estimate(create_hand("1D", "KD"), create_hand("QD", "JD", "TD"), num_opponents=1, iterations=100000, rng=0, batch_size=10, target_width=0.05)
+	assert out.iterations == 1000
+
+def test_equity_estimate_invalid_cards():
+	""" Test that repeated known cards are rejected """
+
+	with pytest.raises(AssertionError): estimate(create_hand("1S", "1S"))
+	with pytest.raises(AssertionError): estimate(create_hand("1S", "1H"), create_hand("KD", "1H", "QD"))
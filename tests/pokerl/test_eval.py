@@ -0,0 +1,77 @@
+import numpy as np
+from pokerl.game import Game
+from pokerl.agents import RandomAgent
+from pokerl.enums import PokerMoves
+from pokerl.eval import Match, Tournament, round_robin, play_match, generate_decks, compute_standings, format_standings
+from pokerl.eval.duplicate import get_deck
+
+def call_agent(state):
+	""" Calls or checks whenever possible """
+
+	if state.valid_actions[PokerMoves.CALL]: return PokerMoves.CALL
+	return PokerMoves.CHECK if state.valid_actions[PokerMoves.CHECK] else PokerMoves.FOLD
+
+def test_round_robin():
+	""" Test that every group of agents plays, with rotated seats """
+
+	schedule = round_robin(4, num_players=3, num_hands=10, repeats=2)
+	assert len(schedule) == 8
+	assert schedule[0].seats == (0, 1, 2) and schedule[4].seats == (1, 2, 0)
+	assert all(match.num_hands == 10 for match in schedule)
+
+def test_tournament_deterministic(tmp_path):
+	""" Test that results depend only on the seed, and that a tournament resumes from its journal """
+
+	agents = [RandomAgent(), call_agent, RandomAgent()]
+	schedule = round_robin(len(agents), num_hands=50)
+
+	serial = Tournament(agents, schedule, seed=3, start_credits=40)
+	expected = serial.run()
+	parallel = Tournament(agents, schedule, seed=3, start_credits=40)
+	assert parallel.run(num_workers=2) == expected
+	assert parallel.results == serial.results
+
+	# Stop after the first result
+	journal = str(tmp_path / 'results.jsonl')
+	for result in Tournament(agents, schedule, seed=3, journal=journal, start_credits=40).play(): break
+
+	resumed = Tournament(agents, schedule, seed=3, journal=journal, start_credits=40)
+	assert resumed.pending == [1, 2]
+	assert [result.idx for result in resumed.play()] == [1, 2]
+	assert resumed.standings() == expected
+	assert Tournament(agents, schedule, seed=3, journal=journal, start_credits=40).pending == []
+
+	# Heads up hands are zero-sum
+	for result in resumed.results: assert np.isclose(sum(result.winnings), 0)
+
+def test_standings():
+	""" Test win rates and confidence intervals """
+
+	standings = compute_standings(['a', 'b'], np.array([4, 100]), np.array([2., -50.]), np.array([2., 100.]))
+	assert [standing.name for standing in standings] == ['a', 'b']
+	assert np.isclose(standings[0].bb_per_100, 50) and np.isclose(standings[1].bb_per_100, -50)
+
+	# Sample variance of [1, 1, 0, 0] is 1/3
+	assert np.isclose(standings[0].ci, 100 * 1.96 * np.sqrt(1 / 3 / 4))
+	assert format_standings(standings).splitlines()[1].split()[:2] == ['1', 'a']
+
+def test_duplicate():
+	""" Test that duplicate matches replay each deck from every seat """
+
+	decks = generate_decks(20, 0)
+	assert decks.shape == (20, 52) and decks.dtype == np.uint8 and np.all(np.sort(decks, axis=1) == np.arange(52))
+	assert np.array_equal(generate_decks(20, 0), decks) and not np.array_equal(generate_decks(20, 1), decks)
+
+	game = Game(num_players=3)
+	game.reset(deck=get_deck(decks[0]))
+	assert [card.id for card in game.deck] == decks[0].tolist()
+
+	# Identical deterministic agents break
+	# even on every deck
+	winnings, squares = play_match([call_agent, call_agent, call_agent], Match((0, 1, 2), 20), decks)
+	assert np.allclose(winnings, 0) and np.allclose(squares, 0)
+
+	tournament = Tournament([call_agent, RandomAgent()], round_robin(2, num_hands=20), seed=0, duplicate=True)
+	standings = tournament.run()
+	assert [standing.hands for standing in standings] == [40, 40]
+	assert np.isclose(sum(standing.bb_per_100 for standing in standings), 0)
@@ -0,0 +1,242 @@
+import pytest
+import pickle
+import logging
+import numpy as np
+from pokerl.game import Game
+from pokerl.enums import PokerMoves, PlayerState, GameEvent, ChipRounding
+
+def test_game_state_view_snapshot():
+	""" Test that state views are not affected by later steps """
+
+	game = Game(num_players=3)
+	game.reset()
+
+	state = game.active_state
+	assert game.active_state is state, 'Active state should be cached'
+
+	player = state.player
+	credits = state.credits.copy()
+	pending_bets = state.pending_bets.copy()
+	valid_actions = state.valid_actions.copy()
+	player_cards = list(state.player_cards)
+
+	game.step(PokerMoves.ALL_IN)
+	assert game.active_state is not state
+	assert state.player == player
+	assert np.array_equal(state.credits, credits)
+	assert np.array_equal(state.pending_bets, pending_bets)
+	assert np.array_equal(state.valid_actions, valid_actions)
+	assert state.player_cards == player_cards
+
+	# Lazy fields are computed from the snapshot
+	state = game.active_state
+	game.step(PokerMoves.FOLD)
+	assert state.valid_actions[PokerMoves.FOLD] == 1
+	assert state.valid_actions[PokerMoves.CHECK] == 0
+
+def test_game_state_view_pickle():
+	""" Test state view pickling """
+
+	game = Game(num_players=4)
+	game.reset()
+
+	state = game.active_state
+	copy = pickle.loads(pickle.dumps(state))
+	assert copy.player == state.player
+	assert copy.player_cards[0].value == state.player_cards[0].value
+	assert np.array_equal(copy.valid_actions, state.valid_actions)
+	assert np.array_equal(copy.credits, state.credits)
+
+	# Explicit player index
+	assert Game.StateView(game, 0).player == 0
+
+def test_game_events():
+	""" Test event subscribers and logging bridge """
+
+	np.random.seed(0)
+	game = Game(num_players=4)
+	events = []
+	game.subscribe(events.append)
+	game.reset()
+
+	kinds = [event.kind for event in events]
+	assert kinds == [GameEvent.DEAL, GameEvent.BLINDS]
+	assert len(events[0].player_cards) == 4
+
+	# Play until the end of the hand
+	hand = game.hand
+	while game.hand == hand: game.step(np.random.choice(list(game.active_state.valid_action_indices)))
+
+	actions = [event for event in events if event.kind == GameEvent.ACTION]
+	payoffs = [event for event in events if event.kind == GameEvent.PAYOFF]
+	assert len(actions) > 0
+	assert len(payoffs) == 1 and payoffs[0].hand == hand
+	assert np.isclose(np.sum(payoffs[0].payoffs), 0)
+
+	# Filtered subscribers and unsubscribe
+	streets = []
+	game.subscribe(streets.append, [GameEvent.STREET])
+	game.unsubscribe(events.append)
+	num_events = len(events)
+	while not game.game_over: game.step(np.random.choice(list(game.active_state.valid_action_indices)))
+	assert len(events) == num_events
+	assert all(event.kind == GameEvent.STREET for event in streets)
+
+	# Subscribers are not pickled
+	assert all(not subscribers for subscribers in pickle.loads(pickle.dumps(game)).subscribers)
+
+def test_game_event_logger(caplog):
+	""" Test logging bridge """
+
+	game = Game(num_players=2, logger=logging.getLogger('pokerl'))
+	with caplog.at_level(logging.INFO, logger='pokerl'):
+		game.reset()
+		game.step(PokerMoves.FOLD)
+
+	assert 'Dealing cards' in caplog.text
+	assert 'folds' in caplog.text
+	assert 'wins by last stand' in caplog.text
+
+def test_game_payoff_winners():
+	""" Test that players that get back an uncalled bet are not winners """
+
+	rng = np.random.default_rng(0)
+	game = Game(num_players=4, rng=0)
+	payoffs = []
+	game.subscribe(payoffs.append, [GameEvent.PAYOFF])
+
+	for _ in range(20):
+		game.reset()
+		while not game.game_over:
+			# Go all-in often, so that stacks differ
+			valids = game.active_state.valid_actions
+			game.step(PokerMoves.ALL_IN if valids[PokerMoves.ALL_IN] and rng.random() < .3 else rng.choice(np.flatnonzero(valids)))
+
+	assert len(payoffs) > 0
+	for event in payoffs: assert event.winners == np.flatnonzero(event.payoffs > 0).tolist()
+
+def test_game_rng():
+	""" Test that games deal from their own seedable generator """
+
+	def deal(game: Game, num_hands: int=20):
+		hands = []
+		for _ in range(num_hands):
+			game.setup_hand()
+			hands.append([card.id for card in game.deck[:5 + 2 * game.num_players]])
+		return hands
+
+	assert deal(Game(num_players=3, rng=7)) == deal(Game(num_players=3, rng=7))
+	assert deal(Game(num_players=3, rng=7)) != deal(Game(num_players=3, rng=8))
+
+	# Reset replaces the generator
+	game = Game(num_players=3)
+	game.reset(rng=7)
+	assert [card.id for card in game.deck[:11]] == deal(Game(num_players=3, rng=7), 1)[0]
+
+	# Reseeding reproduces the deals,
+	# whatever the order of the deck
+	first = deal(game)
+	game.reset(rng=7)
+	assert deal(game) == first
+
+	# Independent child streams
+	games = [Game(num_players=3, rng=seed) for seed in np.random.SeedSequence(0).spawn(4)]
+	hands = [deal(game) for game in games]
+	assert all(hands[idx] != hands[0] for idx in range(1, 4))
+
+	# The deck stays a permutation and the
+	# dealt cards are uniform
+	game = Game(num_players=2, rng=0)
+	counts = np.zeros((9, 52))
+	for _ in range(5200):
+		game.shuffle_deck()
+		ids = [card.id for card in game.deck]
+		assert sorted(ids) == list(range(52))
+		counts[np.arange(9), ids[:9]] += 1
+
+	assert np.all(np.abs(counts - 100) < 50)
+
+def test_game_snapshot_restore():
+	""" Test game snapshot and restore """
+
+	np.random.seed(0)
+	game = Game(num_players=4, rng=0)
+	game.reset()
+	for _ in range(5): game.step(np.random.choice(list(game.active_state.valid_action_indices)))
+
+	snapshot = game.snapshot()
+	state = game.active_state
+	rng_state = game.rng.bit_generator.state
+	actions = []
+	trajectory = []
+	while not game.game_over:
+		actions.append(np.random.choice(list(game.active_state.valid_action_indices)))
+		trajectory.append(game.step(actions[-1]))
+	final = game.snapshot()
+
+	# Views taken before restore keep their state
+	credits = state.credits.copy()
+	game.restore(snapshot)
+	assert np.array_equal(state.credits, credits)
+	assert game.active_player == state.player
+
+	# Same actions lead to the same outcome
+	game.rng.bit_generator.state = rng_state
+	assert [game.step(action) for action in actions] == trajectory
+	assert np.array_equal(game.credits, final.money[0])
+	assert game.deck == list(final.deck)
+
+	with pytest.raises(ValueError): snapshot.money[0, 0] = 1
+
+@pytest.mark.parametrize('rounding', [ChipRounding.DOWN, ChipRounding.NEAREST, ChipRounding.UP])
+def test_game_integer_chips(rounding):
+	""" Test that integer chips are never created or lost """
+
+	rng = np.random.default_rng(rounding)
+	game = Game(num_players=5, start_credits=1000, integer_chips=True, chip_rounding=rounding, rng=rounding)
+
+	for _ in range(5):
+		game.reset()
+		for _ in range(1000):
+			valid_actions, _ = game.get_valid_actions()
+			assert np.array_equal(game.active_state.valid_actions, valid_actions)
+			game_over, *_ = game.step(int(rng.choice(np.flatnonzero(valid_actions))))
+
+			assert game.credits.dtype == np.int64 and game.payoffs.dtype == np.int64
+			assert np.sum(game.credits) + np.sum(game.bets) == 5000
+			if game_over: break
+
+	# 10% of 25 chips
+	assert Game.compute_raise_value(25, PokerMoves.RAISE_TEN, ChipRounding.DOWN) == 2
+	assert Game.compute_raise_value(25, PokerMoves.RAISE_TEN, ChipRounding.NEAREST) == 3
+	assert Game.compute_raise_value(25, PokerMoves.RAISE_TEN, ChipRounding.UP) == 3
+	assert Game.compute_raise_value(25, PokerMoves.RAISE_HALF, ChipRounding.NEAREST) == 13
+
+def test_game_tracked_state():
+	""" Test that the scalars updated by each step match the arrays """
+
+	rng = np.random.default_rng(0)
+	game = Game(num_players=6, rng=0)
+	game.reset()
+	snapshot = game.snapshot()
+
+	for _ in range(2000):
+		valid_actions, _ = game.get_valid_actions()
+		assert game.high_bet == np.max(game.pending_bets) and game.pot == np.sum(game.bets)
+		assert game.num_playing_players == np.sum((game.player_states != PlayerState.BROKEN) & (game.player_states != PlayerState.FOLDED))
+		assert np.array_equal(valid_actions, Game.compute_valid_actions(game.credits[game.active_player], np.max(game.pending_bets), game.minimum_raise_value))
+
+		# Invalid and out of range moves are
+		# rejected
+		invalid = np.flatnonzero(valid_actions == 0)
+		if len(invalid):
+			with pytest.raises(ValueError): game.step(int(invalid[0]))
+		for action in (-1, PokerMoves.NUM_MOVES, 200):
+			with pytest.raises(ValueError, match='invalid move %d' % action): game.step(action)
+
+		game_over, *_ = game.step(int(rng.choice(np.flatnonzero(valid_actions))))
+		assert game_over == (np.sum(game.player_states != PlayerState.BROKEN) == 1)
+		if game_over: game.restore(snapshot)
+
+	game.restore(snapshot)
+	assert game.high_bet == np.max(game.pending_bets) and game.num_remaining_players == 6
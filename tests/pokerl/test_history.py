@@ -0,0 +1,36 @@
+import pytest
+import numpy as np
+from pokerl.game import Game
+from pokerl.history import HandRecorder, HandHistory
+
+def play_games(game: Game, num_games: int):
+	"""  """
+
+	for _ in range(num_games):
+		game.reset()
+		while not game.game_over: game.step(np.random.choice(list(game.active_state.valid_action_indices)))
+
+def test_hand_history_replay(tmp_path):
+	""" Test recording and replaying hands """
+
+	np.random.seed(0)
+	path = tmp_path / 'hands.bin'
+
+	game = Game(num_players=4, rng=0)
+	with HandRecorder(path, game, buffer_size=16): play_games(game, 5)
+
+	# Append to existing file
+	with HandRecorder(path, game): play_games(game, 5)
+
+	history = HandHistory(path)
+	assert len(history) > 0
+	assert history['payoffs'].shape == (len(history), 4)
+	assert history[0]['hand'] == 1
+
+	# Replay all hands
+	replay = Game(num_players=4)
+	for idx in range(len(history)):
+		actions = [action for _, action in history.replay(idx, replay)]
+		assert actions == list(history[idx]['actions'][:history[idx]['num_actions']])
+
+	with pytest.raises(ValueError): HandRecorder(path, Game(num_players=2))
@@ -0,0 +1,42 @@
+import pytest
+import random
+import itertools
+import numpy as np
+from pokerl.cards import Card
+from pokerl.isomorphism import get_index_size, index_hand, unindex_hand, index_hands_batch
+
+def test_index_size():
+	""" Test number of canonical hands """
+
+	assert [get_index_size(turn) for turn in range(4)] == [169, 1286792, 55190538, 2428287420]
+
+def test_index_hand():
+	""" Test canonical index of hands """
+
+	# Preflop indices are dense
+	hands = np.array(list(itertools.combinations(range(52), 2)))
+	indices = index_hands_batch(hands)
+	assert np.array_equal(np.unique(indices), np.arange(169))
+
+	# Suit permutations and order within a
+	# round don't change the index
+	assert index_hand([Card('AS'), Card('KS')], [Card('2H'), Card('3H'), Card('4D')]) == index_hand([Card('KC'), Card('AC')], [Card('4S'), Card('2D'), Card('3D')])
+	assert index_hand([Card('AS'), Card('KS')]) != index_hand([Card('AS'), Card('KH')])
+
+	rng = random.Random(0)
+	for num_cards in (2, 5, 6, 7):
+		hands = np.array([rng.sample(range(52), num_cards) for _ in range(500)])
+		indices = index_hands_batch(hands)
+		suits = np.array(rng.sample(range(4), 4))
+		assert np.array_equal(index_hands_batch(suits[hands // 13] * 13 + hands % 13), indices)
+		assert [index_hand(hand[:2], hand[2:]) for hand in hands.tolist()] == indices.tolist()
+
+def test_unindex_hand():
+	""" Test inverse of hand index """
+
+	rng = random.Random(0)
+	for turn in range(4):
+		for index in [0, get_index_size(turn) - 1] + [rng.randrange(get_index_size(turn)) for _ in range(200)]:
+			player_cards, community_cards = unindex_hand(index, turn)
+			assert len(player_cards) == 2 and len(community_cards) == [0, 3, 4, 5][turn]
+			assert index_hand(player_cards, community_cards) == index
@@ -1,6 +1,7 @@
 import pytest
+import numpy as np
 from pokerl.cards import Card
-from pokerl.judger import eval_hand, compare_hands
+from pokerl.judger import eval_hand, eval_strength, eval_hands_batch, compare_hands, compare_hands_batch, get_ranking, get_ranking_value
 from pokerl.enums import CardRank, CardSuit, HandRanking
 
 def create_hand(*symbols):
@@ -114,4 +115,60 @@ def test_judger_compare_hands():
 	h2 = create_hand("1D", "3C", "5H", "7H", "9H", "7S", "7S")
 	h3 = create_hand("1D", "3C", "5H", "7H", "9H", "9S", "9S")
 	out = compare_hands([h1, h2, h3])
-	assert out[0] == [0, 0, 1]
\ No newline at end of file
+	assert out[0] == [0, 0, 1]
+
+def test_judger_eval_strength():
+	""" Test hand strengths """
+
+	straight_flush = eval_strength(create_hand("1D", "2D", "3D", "4D", "5D", "6C", "7C"))
+	royal_flush = eval_strength(create_hand("1S", "KS", "QS", "JS", "TS", "6C", "7C"))
+	flush = eval_strength(create_hand("1D", "2D", "3D", "4D", "8D", "6C", "7C"))
+	straight = eval_strength(create_hand("1D", "2C", "3D", "4D", "5H", "9C", "KC"))
+	full = eval_strength(create_hand("8D", "8C", "8H", "5H", "5S", "5D", "KD"))
+	assert royal_flush > straight_flush > full > flush > straight
+
+	# Strengths can be converted back
+	assert get_ranking(royal_flush) == (HandRanking.STRAIGHT_FLUSH, [CardRank.ACE])
+	assert get_ranking(straight) == (HandRanking.STRAIGHT, [CardRank.FIVE])
+	assert get_ranking(full) == (HandRanking.FULL, [CardRank.EIGHT, CardRank.FIVE])
+	assert get_ranking_value(get_ranking(flush)) == flush
+
+	# Flush beats straight, even if both are available
+	out = eval_hand(create_hand("1C", "3C", "4C", "5C", "7C", "2H", "9D"))
+	assert out == (HandRanking.FLUSH, [CardRank.ACE, CardRank.SEVEN, CardRank.FIVE, CardRank.FOUR, CardRank.THREE])
+
+	# Full house uses the highest pair
+	out = eval_hand(create_hand("8D", "8C", "8H", "5H", "5S", "KD", "KC"))
+	assert out == (HandRanking.FULL, [CardRank.EIGHT, CardRank.KING])
+
+	# Works with five and six cards
+	assert eval_strength(create_hand("2D", "3C", "4D", "5D", "8D")) == get_ranking_value((HandRanking.HIGH, [CardRank.EIGHT, CardRank.FIVE, CardRank.FOUR, CardRank.THREE, CardRank.TWO]))
+	assert eval_hand(create_hand("2D", "2C", "4D", "5D", "8D", "8S")) == (HandRanking.TWO_PAIR, [CardRank.EIGHT, CardRank.TWO, CardRank.FIVE])
+
+	# Empty hands are the weakest
+	assert eval_strength([]) == 0
+	assert eval_strength(create_hand("2D", "3C", "4D", "5D", "7D")) > 0
+
+def test_judger_eval_hands_batch():
+	""" Test batch hand evaluation """
+
+	rng = np.random.default_rng(0)
+	for num_cards in (5, 6, 7):
+		cards = np.argsort(rng.random((1000, 52)), axis=1)[:, :num_cards]
+		strengths = eval_hands_batch(cards)
+		assert strengths.shape == (1000,)
+		assert strengths.tolist() == [eval_strength([Card((card % 13, card // 13)) for card in hand]) for hand in cards.tolist()]
+
+	# Leading dimensions are preserved
+	assert eval_hands_batch(cards.reshape(10, 100, -1)).shape == (10, 100)
+
+def test_judger_compare_hands_batch():
+	""" Test batch hand comparison """
+
+	h1 = create_hand("1D", "3C", "5H", "7H", "9H", "1S", "9D")
+	h2 = create_hand("1D", "3C", "5H", "7H", "9H", "7S", "7C")
+	h3 = create_hand("1D", "3C", "5H", "7H", "9H", "9S", "9C")
+	h4 = create_hand("1D", "3C", "5H", "7H", "9H", "2S", "KC")
+	cards = np.array([[[card.id for card in hand] for hand in hands] for hands in [(h1, h2, h3), (h1, h1, h4)]])
+	winners = compare_hands_batch(cards)
+	assert winners.tolist() == [[False, False, True], [True, True, False]]
@@ -0,0 +1,170 @@
+import socket
+import asyncio
+import pytest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from pokerl.game import Game
+from pokerl.enums import MessageType, PokerMoves
+from pokerl.agents import RandomAgent, RandomBatchAgent
+from pokerl.network import AsyncPokerGameServer, PokerGameClient, PokerBatchClient, PokerMultiClient
+from pokerl.network.framing import send_message, recv_message, pack_message, run_coroutine
+from pokerl.network.protocol import PROTOCOL_VERSION, ProtocolError, encode_ready, encode_action, encode_action_batch, encode_state, decode
+
+def test_framing():
+	""" Test that framed messages survive partial reads and writes """
+
+	left, right = socket.socketpair()
+	with left, right:
+		messages = [b'', b'x', bytes(range(256)) * 40]
+		for message in messages: send_message(left, message)
+		assert [recv_message(right) for _ in messages] == messages
+
+		# A message split across many sends
+		data = pack_message(b'hello')
+		for idx in range(len(data)): left.sendall(data[idx:idx + 1])
+		assert recv_message(right) == b'hello'
+
+		left.close()
+		with pytest.raises(ConnectionError): recv_message(right)
+
+def test_async_server_tables():
+	""" Test that clients are seated at concurrent tables """
+
+	num_players = 3
+	num_tables = 4
+
+	async def main():
+		server = AsyncPokerGameServer(num_games=2, num_players=num_players, start_credits=20)
+		listener = await server.start('localhost', 0)
+		port = listener.sockets[0].getsockname()[1]
+
+		loop = asyncio.get_event_loop()
+		clients = [PokerGameClient() for _ in range(num_players * num_tables)]
+		try:
+			# Blocking clients, one thread each
+			with ThreadPoolExecutor(len(clients)) as executor:
+				await asyncio.gather(*(loop.run_in_executor(executor, client.connect, 'localhost', port) for client in clients))
+
+			while server.tables: await asyncio.sleep(.01)
+		finally:
+			listener.close()
+			await listener.wait_closed()
+
+		return server, clients
+
+	server, clients = run_coroutine(main())
+	assert server.games_played == 2 * num_tables
+	assert server.tables_played == num_tables
+	assert sorted(client.player for client in clients) == sorted(list(range(num_players)) * num_tables)
+
+def test_async_server_batches():
+	""" Test that a batch client plays many seats next to single seat clients """
+
+	class CountingAgent(RandomBatchAgent):
+		def __call__(self, states):
+			self.sizes.append(len(states))
+			return super().__call__(states)
+
+	agent = CountingAgent()
+	agent.sizes = []
+
+	async def main():
+		server = AsyncPokerGameServer(num_games=3, num_players=3, start_credits=20)
+		listener = await server.start('localhost', 0)
+		port = listener.sockets[0].getsockname()[1]
+
+		loop = asyncio.get_event_loop()
+		batch_client = PokerBatchClient(agent, num_seats=16, batch_size=8)
+		clients = [PokerGameClient() for _ in range(2)]
+		try:
+			with ThreadPoolExecutor(3) as executor:
+				await asyncio.gather(*(loop.run_in_executor(executor, client.connect, 'localhost', port) for client in [batch_client] + clients))
+		finally:
+			listener.close()
+			await listener.wait_closed()
+
+		return server, batch_client
+
+	server, batch_client = run_coroutine(main())
+	assert server.tables_played == 6 and server.games_played == 18
+	assert batch_client.num_decisions == sum(agent.sizes) and batch_client.num_batches == len(agent.sizes)
+	assert max(agent.sizes) <= 8 and batch_client.num_decisions > batch_client.num_batches
+
+def test_async_server_multiplexed():
+	""" Test that a multiplexed client routes states to the agent of each seat """
+
+	class SeatAgent(RandomAgent):
+		def __call__(self, state):
+			self.players.add(state.player)
+			return super().__call__(state)
+
+	agents = []
+	def make_agent():
+		agents.append(SeatAgent())
+		agents[-1].players = set()
+		return agents[-1]
+
+	async def main():
+		server = AsyncPokerGameServer(num_games=2, num_players=3, start_credits=20)
+		listener = await server.start('localhost', 0)
+		port = listener.sockets[0].getsockname()[1]
+
+		client = PokerMultiClient(make_agent, num_seats=10)
+		single_clients = [PokerGameClient() for _ in range(2)]
+		loop = asyncio.get_event_loop()
+		try:
+			with ThreadPoolExecutor(2) as executor:
+				await asyncio.gather(client.play('localhost', port), *(loop.run_in_executor(executor, single.connect, 'localhost', port) for single in single_clients))
+		finally:
+			listener.close()
+			await listener.wait_closed()
+
+		return server, client
+
+	server, client = run_coroutine(main())
+	assert server.tables_played == 4 and server.games_played == 8
+	assert len(agents) == 10 and not client.agents
+	assert all(len(agent.players) <= 1 for agent in agents)
+	assert 0 < client.num_decisions < server.decisions
+
+@pytest.mark.parametrize('integer_chips', [False, True])
+def test_protocol_state(integer_chips):
+	""" Test that encoded states decode to the same view """
+
+	rng = np.random.default_rng(0)
+	game = Game(num_players=4, integer_chips=integer_chips)
+	game.reset()
+
+	for _ in range(50):
+		state = game.active_state
+		decoded = decode(encode_state(7, state))
+		assert decoded.kind == MessageType.STATE and decoded.table == 7 and decoded.player == state.player
+
+		view = decoded.value
+		assert view.turn == state.turn and view.num_players == state.num_players
+		assert np.array_equal(view.valid_actions, state.valid_actions)
+		assert [card.id for card in view.player_hand] == [card.id for card in state.player_hand]
+		for name in ('credits', 'bets', 'pending_bets'):
+			assert getattr(view, name).dtype == getattr(state, name).dtype
+			assert np.array_equal(getattr(view, name), getattr(state, name))
+		assert view.minimum_raise_value == state.minimum_raise_value
+		assert view.bucket is None
+
+		valid_actions, _ = game.get_valid_actions()
+		game_over, _, _ = game.step(int(rng.choice(np.flatnonzero(valid_actions))))
+		if game_over: game.reset()
+
+def test_protocol_errors():
+	""" Test that invalid messages are rejected """
+
+	assert decode(encode_action(3, 1, PokerMoves.CALL)) == (MessageType.ACTION, 3, 1, PokerMoves.CALL)
+
+	message = encode_ready(0, 1, 4)
+	with pytest.raises(ProtocolError): decode(bytes([PROTOCOL_VERSION + 1]) + message[1:])
+	with pytest.raises(ProtocolError): decode(message[:-1])
+	with pytest.raises(ProtocolError): decode(message[:1] + bytes([MessageType.NUM_TYPES]) + message[2:])
+
+	# Actions must be moves
+	with pytest.raises(ProtocolError): decode(encode_action(3, 1, PokerMoves.NUM_MOVES))
+	with pytest.raises(ProtocolError): decode(encode_action(3, 1, 200))
+	with pytest.raises(ProtocolError): decode(encode_action_batch([(0, 0, PokerMoves.CALL), (1, 2, 200)]))
@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+from pokerl.game import Game
+from pokerl.vector_game import VectorGame
+from pokerl.agents import RandomAgent, PokerBatchAgent
+from pokerl.envs import ObservationSpec, PokerGameEnv
+from pokerl.enums import PokerMoves
+
+def test_observation_encode():
+	""" Test encoding of state views """
+
+	game = Game(num_players=3, start_credits=100)
+	game.reset()
+	game.step(PokerMoves.CALL)
+
+	spec = ObservationSpec(num_players=3, scale=300.)
+	state = game.active_state
+	obs = spec.encode(state)
+	assert obs.shape == (spec.size,) and obs.dtype == np.float32
+
+	cards = spec.slices['player_cards']
+	assert sorted(np.flatnonzero(obs[cards])) == sorted(card.id for card in state.player_cards)
+	assert np.sum(obs[spec.slices['community_cards']]) == 0
+	assert obs[spec.slices['turn']].tolist() == [1, 0, 0, 0]
+	assert np.array_equal(obs[spec.slices['valid_actions']], state.valid_actions)
+
+	# Player comes first
+	pending_bets = np.roll(state.pending_bets, -state.player) / 300.
+	assert np.allclose(obs[spec.slices['pending_bets']], pending_bets)
+
+	# Write to a row of a batch
+	batch = spec.zeros(4)
+	spec.encode(state, batch[2])
+	assert np.array_equal(batch[2], obs) and not np.any(batch[[0, 1, 3]])
+
+	# Money is scaled by the credits of the
+	# table by default
+	obs = ObservationSpec(num_players=3).encode(state)
+	assert np.allclose(obs[spec.slices['credits']], np.roll(state.credits, -state.player) / 300.)
+
+	# Integer chips
+	game = Game(num_players=3, integer_chips=True, start_credits=[50, 100, 150])
+	game.reset()
+	spec = ObservationSpec(num_players=3, start_credits=[50, 100, 150])
+	obs = spec.encode(game.active_state)
+	assert np.allclose(obs[spec.slices['credits']], np.roll(game.credits, -game.active_player) / 300.)
+
+	# Binary features only
+	spec = ObservationSpec(num_players=3, features=('player_cards', 'valid_actions'), dtype=np.uint8)
+	assert spec.encode(state).dtype == np.uint8 and spec.size == 59
+	with pytest.raises(AssertionError): ObservationSpec(num_players=3, dtype=np.uint8)
+
+def test_observation_encode_tables():
+	""" Test encoding of the tables of a vector game """
+
+	game = VectorGame(num_tables=5, num_players=4, rng=0)
+	game.reset()
+	for _ in range(10):
+		valid_actions = game.get_valid_actions()
+		game.step(np.where(valid_actions[:, PokerMoves.CHECK], PokerMoves.CHECK, PokerMoves.CALL))
+
+	spec = ObservationSpec(num_players=4, features=('player_cards', 'community_cards', 'credits', 'turn'))
+	obs = spec.encode_tables(game)
+	for table in range(5):
+		cards = np.flatnonzero(obs[table, spec.slices['community_cards']])
+		assert sorted(cards) == sorted(game.community_cards[table, :game.num_community_cards[table]])
+		assert sorted(np.flatnonzero(obs[table, spec.slices['player_cards']])) == sorted(game.get_cards_of()[table])
+		assert np.allclose(obs[table, spec.slices['credits']], np.roll(game.credits[table], -game.active_player[table]) / 400)
+		assert obs[table, spec.slices['turn']][game.turn[table]] == 1
+
+def test_observation_game_env():
+	""" Test that the env returns encoded observations """
+
+	spec = ObservationSpec(num_players=3)
+	env = PokerGameEnv([RandomAgent(), RandomAgent()], num_players=3, observation_spec=spec)
+	obs = env.reset()
+	assert isinstance(obs, np.ndarray) and obs.shape == (spec.size,)
+
+	valid_actions = obs[spec.slices['valid_actions']]
+	obs, *_ = env.step(int(np.flatnonzero(valid_actions)[0]))
+	assert obs.shape == (spec.size,)
+
+def test_observation_batch_agent():
+	""" Test that batch agents create their spec from the first batch """
+
+	class FirstActionAgent(PokerBatchAgent):
+		def predict(self, obs, valid_actions):
+			self.obs = obs
+			return np.argmax(valid_actions, axis=1)
+
+	game = Game(num_players=2, start_credits=100)
+	game.reset()
+	agent = FirstActionAgent()
+	assert agent([game.active_state]).tolist() == [PokerMoves.FOLD]
+	assert agent.spec.num_players == 2 and agent.spec.scale == 200
+	assert np.all(agent.obs[0, agent.spec.slices['credits']] <= 1)
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+from pokerl.pots import resolve_pots, resolve_pots_batch
+from pokerl.judger import compare_strengths
+
+def resolve_pots_reference(bets: np.ndarray, strengths: list, num_potential_winners: int) -> np.ndarray:
+	""" The side pots loop formerly used by `Game.end_hand` """
+
+	bets = np.array(bets, dtype=np.float64)
+	strengths = list(strengths)
+	payoffs = np.zeros_like(bets)
+
+	# Equal bets in seat order, which the
+	# default sort did not guarantee
+	sorted_players = np.argsort(bets, kind='stable')
+	showdown = (player for player in sorted_players if strengths[player] > 0)
+
+	for player in showdown:
+		if np.all(bets <= .0): break
+		if num_potential_winners == 1:
+			payoffs[player] += np.sum(bets)
+			break
+
+		max_bets = np.clip(bets, .0, bets[player])
+		onehot, winners = compare_strengths(strengths)
+
+		if len(winners) == 1: payoffs[winners] += np.sum(max_bets)
+		else: payoffs += np.sum(max_bets) * np.array(onehot) / np.sum(onehot)
+
+		strengths[player] = 0
+		bets -= max_bets
+		num_potential_winners -= 1
+
+	return payoffs
+
+def random_hand(rng: np.random.Generator, num_players: int, integer: bool=False):
+	""" Samples bets and strengths of a showdown, with ties and folded or active players """
+
+	bets = rng.choice([0, 1, 2, 5, 10, 25, 40], num_players) * rng.integers(1, 4, num_players)
+	if not integer: bets = bets * rng.choice([1., .5, .25, .1])
+
+	# Few distinct strengths to get ties;
+	# 0 for players not in the showdown
+	strengths = rng.integers(1, 4, num_players) * (rng.random(num_players) < .8)
+	if not np.any(strengths): strengths[rng.integers(num_players)] = 1
+	num_active = rng.integers(0, 2) if np.sum(strengths == 0) > 0 else 0
+	return bets, strengths.tolist(), int(np.sum(strengths > 0)) + int(num_active)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_resolve_pots_matches_reference(seed):
+	""" Test that pots are split as in the former loop """
+
+	rng = np.random.default_rng(seed)
+	for _ in range(200):
+		num_players = int(rng.integers(2, 10))
+		bets, strengths, num_potential_winners = random_hand(rng, num_players)
+		num_showdown = sum(strength > 0 for strength in strengths)
+
+		payoffs = resolve_pots(bets, strengths, num_potential_winners == num_showdown)
+		assert np.allclose(payoffs, resolve_pots_reference(bets, strengths, num_potential_winners))
+
+		if num_potential_winners == num_showdown: assert np.isclose(np.sum(payoffs), np.sum(bets))
+
+@pytest.mark.parametrize('integer', [False, True])
+def test_resolve_pots_batch(integer):
+	""" Test that batched pots match the scalar version exactly """
+
+	rng = np.random.default_rng(int(integer))
+	num_players = 6
+	hands = [random_hand(rng, num_players, integer) for _ in range(500)]
+	bets = np.array([bets for bets, _, _ in hands])
+	strengths = np.array([strengths for _, strengths, _ in hands])
+	collect_remainder = np.array([num_potential_winners == np.sum(np.array(strengths) > 0) for _, strengths, num_potential_winners in hands])
+	first_seat = rng.integers(0, num_players + 1, len(hands))
+
+	payoffs = resolve_pots_batch(bets, strengths, collect_remainder, first_seat)
+	expected = [resolve_pots(*args) for args in zip(bets, strengths.tolist(), collect_remainder, first_seat.tolist())]
+	assert payoffs.dtype == bets.dtype
+	assert np.array_equal(payoffs, np.array(expected))
+
+def test_resolve_pots_odd_chips():
+	""" Test that integer pots keep every chip and give odd chips from `first_seat` """
+
+	# Three way tie on 10 chips
+	bets = np.array([3, 3, 3, 1])
+	assert resolve_pots(bets, [5, 5, 5, 0], first_seat=0).tolist() == [4, 3, 3, 0]
+	assert resolve_pots(bets, [5, 5, 5, 0], first_seat=2).tolist() == [3, 3, 4, 0]
+	assert resolve_pots(bets, [5, 5, 5, 0], first_seat=3).tolist() == [4, 3, 3, 0]
+	assert resolve_pots(bets, [5, 5, 5, 0], first_seat=5).tolist() == [3, 4, 3, 0]
+
+	rng = np.random.default_rng(0)
+	for _ in range(500):
+		bets, strengths, _ = random_hand(rng, int(rng.integers(2, 10)), integer=True)
+		payoffs = resolve_pots(bets, strengths, first_seat=int(rng.integers(10)))
+		assert payoffs.dtype == bets.dtype
+		assert np.sum(payoffs) == np.sum(bets)
+		assert np.all(payoffs[np.array(strengths) == 0] == 0)
@@ -0,0 +1,67 @@
+import pickle
+import numpy as np
+from pokerl.game import Game
+from pokerl.agents import RandomAgent
+from pokerl.envs import PokerGameEnv
+
+def play(game: Game, seed: int=0) -> list:
+	""" Plays a game with seeded random actions, returns the results of each step """
+
+	rng = np.random.default_rng(seed)
+	game.reset(rng=seed)
+	results = []
+	while not results or not results[-1][0]:
+		valid_actions, _ = game.get_valid_actions()
+		results.append(game.step(int(rng.choice(np.flatnonzero(valid_actions)))))
+
+	return results
+
+def test_game_profiling():
+	""" Test that phases are counted without changing the game """
+
+	game = Game(num_players=4)
+	expected = play(game)
+
+	profiler = game.enable_profiling()
+	assert play(game) == expected
+
+	stats = profiler.as_dict()
+	phases = stats['phases']
+	assert phases['step']['calls'] == len(expected)
+	assert stats['hands'] == sum(hand_over for _, hand_over, _ in expected)
+	assert phases['end_hand']['calls'] == stats['hands']
+	assert all(phase['self'] <= phase['total'] for phase in phases.values())
+	assert phases['step']['total'] >= phases['next_player']['total']
+
+	histograms = profiler.histograms(bins=5)
+	assert histograms['steps'][0].sum() == stats['hands']
+
+	# Profiled games can be copied
+	copy = pickle.loads(pickle.dumps(game))
+	assert copy.profiler is None and 'step' not in vars(copy)
+
+	profiler.reset()
+	assert profiler.as_dict()['hands'] == 0 and profiler.as_dict()['phases']['step']['calls'] == 0
+
+	game.disable_profiling()
+	assert game.profiler is None and 'step' not in vars(game) and 'StateView' not in vars(game)
+	assert play(game) == expected
+	assert profiler.as_dict()['phases']['step']['calls'] == 0
+
+def test_env_profiling():
+	""" Test that environments time their opponents """
+
+	agent = RandomAgent()
+	env = PokerGameEnv([agent] * 2, num_players=3)
+	profiler = env.enable_profiling()
+
+	state = env.reset()
+	done = False
+	while not done: state, _, done, _ = env.step(agent(state))
+
+	phases = profiler.as_dict()['phases']
+	assert phases['env.reset']['calls'] == 1 and phases['env.opponents']['calls'] > 0
+	assert phases['step']['calls'] == phases['env.opponents']['calls'] + phases['env.step']['calls']
+
+	env.disable_profiling()
+	assert env.agents[1:] == [agent] * 2 and 'step' not in vars(env)
@@ -0,0 +1,69 @@
+import pytest
+import random
+import numpy as np
+from pokerl.solvers import MCCFRSolver, InfosetTable
+
+def test_infoset_table_merge():
+	""" Test merging of table updates """
+
+	base = InfosetTable(capacity=1)
+	base.regrets[base.get_index(b'a')] = 1
+
+	# Updates of a worker
+	def update(table: InfosetTable, key: bytes, value: float):
+		idx = table.get_index(key)
+		table.regrets[idx] += value
+
+	table = InfosetTable(capacity=1)
+	table.merge(base)
+
+	# Two workers starting from the same table
+	first, second = InfosetTable(capacity=1), InfosetTable(capacity=1)
+	first.merge(base)
+	second.merge(base)
+	update(first, b'a', 2)
+	update(first, b'b', 3)
+	update(second, b'c', 4)
+	update(second, b'b', 5)
+
+	table.merge(first, base)
+	table.merge(second, base)
+	assert len(table) == 3
+	assert table.regrets[table.get_index(b'a'), 0] == 3
+	assert table.regrets[table.get_index(b'b'), 0] == 8
+	assert table.regrets[table.get_index(b'c'), 0] == 4
+
+def test_mccfr_solver(tmp_path):
+	""" Test MCCFR iterations and checkpoints """
+
+	random.seed(0)
+	np.random.seed(0)
+	path = tmp_path / 'mccfr.npz'
+
+	solver = MCCFRSolver(num_players=2, start_credits=6)
+	stats = solver.solve(20, merge_every=10, checkpoint=path)
+	assert stats.iterations == 20
+	assert stats.num_infosets == len(solver.table) > 0
+	assert stats.iterations_per_second > 0 and stats.bytes_per_infoset > 0
+
+	# Average strategy is a distribution
+	# over valid actions
+	solver.game.reset()
+	probs = solver.get_strategy(solver.game, b'')
+	valid_actions, _ = solver.game.get_valid_actions()
+	assert probs.sum() == pytest.approx(1.)
+	assert np.all(probs[valid_actions == 0] == 0)
+
+	loaded = MCCFRSolver(num_players=2, start_credits=6)
+	loaded.load(path)
+	assert loaded.iterations == 20
+	assert list(loaded.table.keys) == list(solver.table.keys)
+	assert np.array_equal(loaded.table.strategy[:len(solver.table)], solver.table.strategy[:len(solver.table)])
+
+def test_mccfr_solver_parallel():
+	""" Test parallel iterations """
+
+	solver = MCCFRSolver(num_players=2, start_credits=6)
+	stats = solver.solve(8, num_workers=2, merge_every=2, seed=0)
+	assert stats.iterations == 8
+	assert len(solver.table) > 0
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+from pokerl.agents import RandomAgent
+from pokerl.envs import PokerVectorEnv
+
+def run_episodes(seed: int, num_steps: int=100) -> np.ndarray:
+	"""  """
+
+	rng = np.random.default_rng(0)
+	rewards = []
+	with PokerVectorEnv([RandomAgent()] * 2, num_envs=4, num_workers=2, seed=seed, num_players=3) as env:
+		obs, valids = env.reset()
+		assert obs.shape[0] == 4 and valids.shape == (4, 7)
+
+		for _ in range(num_steps):
+			actions = np.argmax(rng.random(valids.shape) * valids, axis=1)
+			obs, valids, rwds, dones, hands = env.step(actions)
+			assert np.all(valids[:, 0]), 'Fold is always valid'
+			rewards.append(rwds.copy())
+	
+	return np.array(rewards)
+
+def test_vector_env_seeding():
+	""" Test that workers are seeded deterministically """
+
+	rewards = run_episodes(seed=1)
+	assert np.any(rewards != 0)
+	assert np.array_equal(rewards, run_episodes(seed=1))
+
+def test_vector_env_worker_error():
+	""" Test that errors in the workers are raised in the parent """
+
+	with PokerVectorEnv([RandomAgent()] * 2, num_envs=4, num_workers=2, seed=0, num_players=3) as env:
+		env.reset()
+		actions = np.zeros(4, dtype=np.int64)
+		actions[3] = -1
+		with pytest.raises(RuntimeError, match='(?s)Environment 3 failed:.*invalid move -1'):
+			env.step(actions)
+
+		# Workers are still running
+		obs, valids = env.reset()
+		assert np.all(valids[:, 0])
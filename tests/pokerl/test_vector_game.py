@@ -0,0 +1,91 @@
+import pytest
+import numpy as np
+from pokerl import game as game_module
+from pokerl.game import Game
+from pokerl.vector_game import VectorGame
+from pokerl.cards import Card
+from pokerl.enums import PokerMoves
+
+class DeckSequence:
+	""" Deals the same sequence of decks to a `Game` and to a table of a `VectorGame` """
+
+	def __init__(self, rng: np.random.Generator):
+		"""  """
+
+		self.rng = rng
+		self.decks = []
+		self.consumed = {}
+	
+	def next(self, consumer: str) -> np.ndarray:
+		"""  """
+
+		idx = self.consumed.get(consumer, 0)
+		self.consumed[consumer] = idx + 1
+		while len(self.decks) <= idx: self.decks.append(self.rng.permutation(52))
+		return self.decks[idx]
+
+@pytest.mark.parametrize('num_players,start_credits', [(2, 20), (4, 100), (6, 10)])
+def test_vector_game_matches_game(monkeypatch, num_players, start_credits):
+	""" Test that tables of a vector game evolve exactly like games """
+
+	num_tables = 8
+	rng = np.random.default_rng(num_players)
+	sequences = [DeckSequence(np.random.default_rng((num_players, table))) for table in range(num_tables)]
+	games = [Game(num_players=num_players, start_credits=start_credits) for _ in range(num_tables)]
+	owners = {id(game.deck): table for table, game in enumerate(games)}
+
+	def shuffle_deck(game):
+		game.deck[:] = [Card((card % 13, card // 13)) for card in sequences[owners[id(game.deck)]].next('game')]
+
+	class SequenceVectorGame(VectorGame):
+		def shuffle_decks(self, tables):
+			for table in tables: self.decks[table] = sequences[table].next('vector')
+
+	monkeypatch.setattr(game_module.Game, 'shuffle_deck', shuffle_deck)
+	vector_game = SequenceVectorGame(num_tables=num_tables, num_players=num_players, start_credits=start_credits)
+
+	for game in games: game.reset()
+	vector_game.reset()
+
+	for step in range(500):
+		valid_actions = vector_game.get_valid_actions()
+		actions = np.zeros((num_tables,), dtype=np.int64)
+		for table, game in enumerate(games):
+			onehot, _ = game.get_valid_actions()
+			assert onehot.astype(bool).tolist() == valid_actions[table].tolist()
+
+			# Mostly random, sometimes passive to reach showdowns
+			if rng.random() < 0.7: actions[table] = rng.choice(np.flatnonzero(onehot))
+			else: actions[table] = np.flatnonzero(onehot[:3])[-1]
+
+		dones = [game.step(int(action)) for game, action in zip(games, actions)]
+		vector_dones = vector_game.step(actions)
+
+		for table, game in enumerate(games):
+			assert tuple(map(bool, dones[table])) == tuple(done[table] for done in vector_dones)
+			assert np.array_equal(game.credits, vector_game.credits[table])
+			assert np.array_equal(game.bets, vector_game.bets[table])
+			assert np.array_equal(game.pending_bets, vector_game.pending_bets[table])
+			assert np.array_equal(game.payoffs, vector_game.payoffs[table])
+			assert np.array_equal(game.player_states, vector_game.player_states[table])
+			assert game.active_player == vector_game.active_player[table]
+			assert game.turn == vector_game.turn[table]
+			assert game.minimum_raise_value == vector_game.minimum_raise_value[table]
+
+			if dones[table][0]:
+				game.reset()
+				vector_game.reset([table])
+
+def test_vector_game_invalid_action():
+	""" Test that invalid actions are rejected """
+
+	game = VectorGame(num_tables=4, num_players=3, rng=0)
+	game.reset()
+	
+	with pytest.raises(ValueError):
+		# Cannot check the big blind
+		game.step(np.full((4,), 1))
+
+	for action in (-1, PokerMoves.NUM_MOVES, 99):
+		with pytest.raises(ValueError, match='invalid move %d' % action):
+			game.step(np.full((4,), action))